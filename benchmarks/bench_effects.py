@@ -0,0 +1,228 @@
+"""Benchmark di tutti gli effetti a 1, 12 e 48 MP, confrontato coi valori registrati.
+
+Per ogni effetto, dimensione e caso di valori (default, tutti gli slider al
+minimo, tutti al massimo) la misura gira in un processo a se': si genera la
+foto sintetica deterministica (glitchlab.profiling.synthetic_image), si
+azzera il picco di RSS del processo (/proc/self/clear_refs, Linux) e si
+esegue l'effetto. Si registrano:
+
+- tempo: il migliore su --repeat render (default 3 a 1 e 12 MP, 1 a 48):
+  con 3 render a 12 MP anche gli effetti con tabella RGB (glitchlab.lut),
+  compilata al secondo render, vengono misurati a regime;
+- throughput in MP/s;
+- picco di memoria: RSS massima durante il primo render meno la RSS prima,
+  quindi conta tutto (array NumPy, buffer PIL, temporanei di scipy).
+
+In coda, per ogni effetto e caso, l'esponente di scala empirico: la
+pendenza di log(tempo) e log(picco) rispetto a log(megapixel). 1 = lineare;
+sopra SUPERLINEAR l'effetto viene segnalato come super-lineare.
+
+    python benchmarks/bench_effects.py                        # confronta con effects_baseline.json
+    python benchmarks/bench_effects.py --update               # registra i valori attuali
+    python benchmarks/bench_effects.py --sizes 1 12 --cases default -e vhs -e oil_paint
+
+Esce con codice 1 se una misura supera il valore registrato di oltre
+--time-tolerance (tempo, default 25%, e di almeno TIME_SLACK secondi) o
+--mem-tolerance (picco, default 10%, e di almeno MEM_SLACK MB), o se un
+render fallisce. I tempi dipendono dalla macchina: il baseline
+riporta dove e' stato registrato (_meta), confrontarlo su un'altra macchina
+da' solo un'indicazione.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "effects_baseline.json")
+
+# megapixel -> (w, h), 4:3
+SIZES = {"1": (1152, 864), "12": (4000, 3000), "48": (8000, 6000)}
+REPEATS = {"1": 3, "12": 3, "48": 1}
+CASES = ("default", "min", "max")
+# esponente di scala del tempo oltre il quale l'effetto e' super-lineare
+SUPERLINEAR = 1.25
+# differenze di tempo sotto questa soglia (secondi) non sono regressioni:
+# a 1 MP molti effetti stanno sotto i 50 ms e il rumore conta piu' del codice
+TIME_SLACK = 0.05
+# lo stesso per il picco (MB): i picchi piccoli sono rumore dell'allocatore
+# (vhs a 1 MP oscilla fra 12 e 15 MB)
+MEM_SLACK = 8
+
+
+def _rss_kb():
+    with open("/proc/self/status") as f:
+        status = dict(line.split(":", 1) for line in f)
+    return int(status["VmRSS"].split()[0]), int(status["VmHWM"].split()[0])
+
+
+def case_values(key, case):
+    """Valori slider del caso: default, tutti al minimo o tutti al massimo."""
+    from glitchlab import default_values, get_effect
+
+    if case == "default":
+        return default_values(key)
+    pos = 1 if case == "min" else 2
+    return [s[pos] for s in get_effect(key).sliders]
+
+
+def _child(key, size, case, repeat):
+    from glitchlab import apply_effect, get_effect
+    from glitchlab.profiling import synthetic_image
+
+    get_effect(key).fn.load()
+    vals = case_values(key, case)
+    w, h = SIZES[size]
+    img = synthetic_image(w, h)
+    img.load()
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    before, _ = _rss_kb()
+    best = float("inf")
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        out = apply_effect(key, img, *vals)
+        best = min(best, time.perf_counter() - t0)
+        del out
+        if i == 0:
+            _, peak = _rss_kb()
+    mp = w * h / 1e6
+    print(json.dumps({"seconds": round(best, 3), "mp_s": round(mp / best, 2),
+                      "peak_mb": round((peak - before) / 1024, 1)}))
+
+
+def measure(key, size, case, repeat):
+    """Esegue la misura in un processo nuovo; None se il processo muore
+    (errore dell'effetto o OOM killer)."""
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", key, size, case,
+                           str(repeat)], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def scaling_exponent(points):
+    """Pendenza dei minimi quadrati di log(y) su log(x) per [(x, y), ...];
+    None con meno di due punti validi."""
+    pts = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(p[0] for p in pts) / len(pts)
+    my = sum(p[1] for p in pts) / len(pts)
+    sxx = sum((p[0] - mx) ** 2 for p in pts)
+    return sum((p[0] - mx) * (p[1] - my) for p in pts) / sxx
+
+
+def _meta():
+    import numpy as np
+
+    return {"machine": platform.machine(), "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(), "python": platform.python_version(), "numpy": np.__version__}
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"serve un intero >= 1, non {text}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("-e", "--effect", dest="effects", action="append",
+                        help="solo questi effetti (ripetibile; default tutti)")
+    parser.add_argument("--repeat", type=_positive_int, default=None,
+                        help="render per misura, si tiene il piu' veloce (default 3/3/1 a 1/12/48 MP)")
+    parser.add_argument("--update", action="store_true", help="scrive i valori misurati nel baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25,
+                        help="aumento di tempo tollerato rispetto al baseline (default 0.25 = 25%%)")
+    parser.add_argument("--mem-tolerance", type=float, default=0.10,
+                        help="aumento di picco tollerato rispetto al baseline (default 0.10 = 10%%)")
+    parser.add_argument("--child", nargs=4, metavar=("KEY", "MP", "CASE", "REPEAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        key, size, case, repeat = args.child
+        _child(key, size, case, int(repeat))
+        return 0
+
+    from glitchlab import EFFECTS
+
+    keys = args.effects or [e.key for e in EFFECTS]
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    meta = _meta()
+    if baseline.get("_meta", meta) != meta:
+        print(f"attenzione: baseline registrato su {baseline['_meta']}, qui {meta}", file=sys.stderr)
+
+    regressions = []
+    scaling = []
+    print(f"{'effetto':<20}{'caso':<9}{'MP':>3}{'tempo':>9}{'MP/s':>8}{'picco MB':>10}"
+          f"{'frame':>7}{'base t':>9}{'base MB':>9}")
+    for key in keys:
+        for case in args.cases:
+            measured = {}
+            for size in args.sizes:
+                repeat = args.repeat or REPEATS[size]
+                res = measure(key, size, case, repeat)
+                ref = baseline.get(key, {}).get(case, {}).get(size)
+                if res is None:
+                    print(f"{key:<20}{case:<9}{size:>3}{'ERRORE/OOM':>11}")
+                    regressions.append(f"{key}/{case}@{size}MP (errore)")
+                    continue
+                measured[size] = res
+                w, h = SIZES[size]
+                frames = res["peak_mb"] / (w * h * 3 / 2**20)
+                flags = []
+                if ref is not None:
+                    if (res["seconds"] > ref["seconds"] * (1 + args.time_tolerance)
+                            and res["seconds"] - ref["seconds"] > TIME_SLACK):
+                        flags.append("TEMPO")
+                    if (res["peak_mb"] > ref["peak_mb"] * (1 + args.mem_tolerance)
+                            and res["peak_mb"] - ref["peak_mb"] > MEM_SLACK):
+                        flags.append("MEMORIA")
+                if flags:
+                    regressions.append(f"{key}/{case}@{size}MP ({', '.join(flags).lower()})")
+                base_t = f"{ref['seconds']:.2f}s" if ref else "-"
+                base_m = f"{ref['peak_mb']:.0f}" if ref else "-"
+                print(f"{key:<20}{case:<9}{size:>3}{res['seconds']:>8.2f}s{res['mp_s']:>8.1f}"
+                      f"{res['peak_mb']:>10.0f}{frames:>6.1f}x{base_t:>9}{base_m:>9}"
+                      + (f"  REGRESSIONE {' '.join(flags)}" if flags else ""))
+                if args.update:
+                    baseline.setdefault(key, {}).setdefault(case, {})[size] = res
+            mps = [(SIZES[s][0] * SIZES[s][1] / 1e6, r) for s, r in measured.items()]
+            scaling.append((key, case, scaling_exponent([(mp, r["seconds"]) for mp, r in mps]),
+                            scaling_exponent([(mp, r["peak_mb"]) for mp, r in mps])))
+
+    print(f"\n{'effetto':<20}{'caso':<9}{'esp. tempo':>11}{'esp. picco':>11}")
+    for key, case, t_exp, m_exp in scaling:
+        if t_exp is None:
+            continue
+        flag = "  SUPER-LINEARE" if t_exp > SUPERLINEAR else ""
+        m_str = f"{m_exp:.2f}" if m_exp is not None else "-"
+        print(f"{key:<20}{case:<9}{t_exp:>11.2f}{m_str:>11}{flag}")
+
+    if args.update:
+        baseline["_meta"] = meta
+        with open(BASELINE, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=1)
+            f.write("\n")
+        print(f"baseline aggiornato: {BASELINE}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} misure oltre il baseline: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Benchmark della codifica: preset di formato, codifica parallela, anteprima.
+
+Su risultati reali di effetti (default: vhs, rumoroso, e posterize, a zone
+piatte) sulla foto sintetica deterministica (glitchlab.profiling) misura:
+
+- per ogni preset (glitchlab.encoding.PRESETS): tempo migliore su --repeat
+  codifiche, MB del file e MP/s;
+- --batch immagini codificate una dopo l'altra contro encode_many sul pool
+  di codifica (GLITCHLAB_ENCODE_WORKERS thread): il guadagno dipende dai
+  core liberi, con un solo core resta intorno a 1x;
+- anteprima JPEG: LANCZOS diretto (il metodo precedente) contro
+  img_to_preview_bytes (reduce + LANCZOS), e la stessa da PREVIEW_CACHE.
+
+    python benchmarks/bench_encoders.py
+    python benchmarks/bench_encoders.py --size 8000x6000 -e thermal -p png_fast -p webp
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _old_preview(img, max_dim=900):
+    from PIL import Image
+
+    w, h = img.size
+    scale = max_dim / max(w, h)
+    preview = img.resize((max(1, round(w * scale)), max(1, round(h * scale))), Image.LANCZOS)
+    buf = io.BytesIO()
+    preview.save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="dimensioni LxA (default 4000x3000, 12 MP)")
+    parser.add_argument("-e", "--effect", dest="effects", action="append",
+                        help="effetti di cui codificare il risultato (ripetibile; default vhs, posterize)")
+    parser.add_argument("-p", "--preset", dest="presets", action="append",
+                        help="solo questi preset (ripetibile; default tutti quelli disponibili)")
+    parser.add_argument("--repeat", type=int, default=3, help="codifiche per misura, si tiene la piu' veloce")
+    parser.add_argument("--batch", type=int, default=4,
+                        help="immagini per il confronto in serie / encode_many (default 4)")
+    args = parser.parse_args(argv)
+
+    from glitchlab import apply_effect
+    from glitchlab.encoding import ENCODE_WORKERS, available_presets, encode, encode_many, img_to_preview_bytes
+    from glitchlab.profiling import synthetic_image
+
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    mp = w * h / 1e6
+    presets = args.presets or available_presets()
+    src = synthetic_image(w, h)
+    print(f"{w} x {h} px ({mp:.1f} MP), {ENCODE_WORKERS} thread di codifica, {os.cpu_count()} core")
+    for key in args.effects or ["vhs", "posterize"]:
+        img = apply_effect(key, src)
+        img.load()
+        print(f"\n{key}")
+        print(f"{'preset':<15}{'tempo':>9}{'MB':>8}{'MP/s':>8}")
+        for name in presets:
+            secs, data = best_of(lambda: encode(img, name), args.repeat)
+            print(f"{name:<15}{secs:>8.2f}s{len(data) / 2**20:>8.1f}{mp / secs:>8.1f}")
+
+        images = [img.copy() for _ in range(args.batch)]
+        for name in presets:
+            serial, _ = best_of(lambda: [encode(im, name) for im in images], 1)
+            parallel, _ = best_of(lambda: encode_many(images, name), 1)
+            print(f"{name:<15}{args.batch} immagini: in serie {serial:.2f}s, encode_many "
+                  f"{parallel:.2f}s ({serial / parallel:.2f}x)")
+
+        old, _ = best_of(lambda: _old_preview(img), args.repeat)
+        new, _ = best_of(lambda: img_to_preview_bytes(img), args.repeat)
+        img_to_preview_bytes(img, cache_key=("bench", key))
+        hit, _ = best_of(lambda: img_to_preview_bytes(img, cache_key=("bench", key)), args.repeat)
+        print(f"anteprima: LANCZOS {old * 1000:.0f} ms, reduce + LANCZOS {new * 1000:.0f} ms, "
+              f"da cache {hit * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
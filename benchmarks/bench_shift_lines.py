@@ -0,0 +1,125 @@
+"""Benchmark di _shift_lines contro i vecchi loop riga per riga.
+
+Confronta, a 4K e 8K, gli spostamenti di righe/colonne di VHS, Analogic,
+Wave Warp e Noise (onde) fatti come prima (np.roll / gather per riga o per
+colonna in un loop Python) e con il gather unico di _shift_lines, verificando
+che il risultato sia identico. In coda il tempo dei quattro effetti completi.
+
+    python benchmarks/bench_shift_lines.py [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from glitchlab import apply_effect  # noqa: E402
+from glitchlab.imaging import _shift_lines  # noqa: E402
+
+SIZES = {"4K": (3840, 2160), "8K": (7680, 4320)}
+
+
+def _synthetic(w, h, seed=0):
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = np.stack([xx * 255 / w, yy * 255 / h, (xx + yy) * 127 / (w + h)], -1)
+    base += rng.normal(0, 20, (h, w, 1)).astype(np.float32)
+    return np.clip(base, 0, 255).astype(np.uint8)
+
+
+# --- vecchi loop (come erano negli effetti) ---------------------------------
+
+def _roll_rows(arr, shifts):
+    arr = arr.copy()
+    for y in range(arr.shape[0]):
+        s = int(shifts[y])
+        if s:
+            arr[y] = np.roll(arr[y], s, axis=0)
+    return arr
+
+
+def _clamp_rows(arr, dx):
+    out = np.zeros_like(arr)
+    xs = np.arange(arr.shape[1])
+    for y in range(arr.shape[0]):
+        out[y] = arr[y, np.clip(xs + dx[y], 0, arr.shape[1] - 1)]
+    return out
+
+
+def _clamp_cols(arr, dy):
+    out = np.zeros_like(arr)
+    ys = np.arange(arr.shape[0])
+    for x in range(arr.shape[1]):
+        out[:, x] = arr[np.clip(ys + dy[x], 0, arr.shape[0] - 1), x]
+    return out
+
+
+def _cases(arr):
+    """(nome, vecchio, nuovo) con gli spostamenti dei valori di default."""
+    h, w, _ = arr.shape
+    ys, xs = np.arange(h), np.arange(w)
+    rng = np.random.default_rng(1)
+    vhs = (45 * np.sin(ys / 12) + 22.5 * np.sin(ys / 6)).astype(int)
+    rows = rng.choice(h, int(h * 0.35), replace=False)
+    desync = np.zeros(h, dtype=int)
+    desync[rows] = rng.normal(0, 12.5, rows.size).astype(int)
+    wave_y = np.arange(0, h, 4)
+    wave = (96 * np.sin(wave_y * 0.15)).astype(int)
+    dx = (50 * np.sin(ys * 0.055)).astype(int)
+    dy = (37 * np.sin(xs * 0.043)).astype(int)
+    f32 = arr.astype(np.float32)
+    sub = arr[wave_y].astype(np.int32)
+    return [
+        ("vhs (wrap righe, float32)", lambda: _roll_rows(f32, vhs),
+         lambda: _shift_lines(arr, vhs).astype(np.float32)),
+        ("analogic (wrap righe sparse)", lambda: _roll_rows(f32, desync),
+         lambda: _shift_lines(arr, desync).astype(np.float32)),
+        ("noise onde (wrap, 1 riga su 4)", lambda: _roll_rows(sub, wave),
+         lambda: _shift_lines(sub, wave)),
+        ("wave_warp H (clamp righe)", lambda: _clamp_rows(arr, dx),
+         lambda: _shift_lines(arr, -dx, axis=0, mode="clamp")),
+        ("wave_warp V (clamp colonne)", lambda: _clamp_cols(arr, dy),
+         lambda: _shift_lines(arr, -dy, axis=1, mode="clamp")),
+    ]
+
+
+def _best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="ripetizioni (si tiene la migliore)")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    args = parser.parse_args(argv)
+
+    for label in args.sizes:
+        w, h = SIZES[label]
+        arr = _synthetic(w, h)
+        print(f"\n{label} ({w}x{h})")
+        print(f"  {'caso':<32}{'loop':>9}{'gather':>9}{'speedup':>9}")
+        for name, old, new in _cases(arr):
+            t_old, ref = _best(old, args.repeat)
+            t_new, out = _best(new, args.repeat)
+            assert np.array_equal(ref, out), name
+            print(f"  {name:<32}{t_old:>8.3f}s{t_new:>8.3f}s{t_old / t_new:>8.1f}x")
+
+        img = Image.fromarray(arr)
+        print(f"  {'effetto completo (default)':<32}{'tempo':>9}")
+        for key in ("vhs", "analogic", "wave_warp", "noise"):
+            vals = (1.0, 1.0, 1.0) if key == "noise" else ()
+            t, _ = _best(lambda: apply_effect(key, img, *vals), args.repeat)
+            print(f"  {key:<32}{t:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark di Temporal Bands su ritratti 8K: np.roll dell'intero frame per
+banda (com'era) contro il gather modulare delle sole righe della banda.
+
+Misura tempo e picco di memoria (tracemalloc) di entrambe le versioni sugli
+stessi valori e verifica che il risultato sia identico bit per bit.
+
+    python benchmarks/bench_temporal_bands.py [--repeat 2]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from glitchlab.effects.temporal_bands import glitch_temporal_bands  # noqa: E402
+from glitchlab.seeding import make_rng  # noqa: E402
+
+# ritratto 8K (w, h) e un ritratto 4K per confronto
+SIZES = {"4K ritratto": (2160, 3840), "8K ritratto": (4320, 7680)}
+# (intensity, ampiezza_bande, spostamento): default, bande sottili e fitte
+CASES = {"default": (0.7, 0.5, 0.6), "bande fitte": (1.0, 0.0, 1.0)}
+
+
+def _roll_per_band(img, intensity, ampiezza_bande, spostamento):
+    """La versione precedente (np.roll dell'intero frame per ogni banda)."""
+    arr = np.array(img.convert("RGB"), dtype=np.uint8)
+    h, w, _ = arr.shape
+    rng = make_rng(None, default=42)
+    max_shift_x = max(10, int(w * (0.05 + 0.55 * spostamento)))
+    max_shift_y = max(6, int(h * (0.03 + 0.45 * spostamento)))
+    prob_band = float(np.clip(0.15 + 0.8 * intensity, 0.1, 0.95))
+    min_band = max(4, int(6 + 10 * (1.0 - ampiezza_bande)))
+    max_band = max(min_band + 10, int(25 + 150 * ampiezza_bande))
+    heights = []
+    remaining = h
+    while remaining > 0:
+        bh = min(int(rng.integers(min_band, max_band + 1)), remaining)
+        heights.append(bh)
+        remaining -= bh
+    out = arr.copy()
+    y = 0
+    for bh in heights:
+        y_end = min(y + bh, h)
+        if rng.random() < prob_band:
+            dx = int(rng.integers(-max_shift_x, max_shift_x + 1))
+            dy = int(rng.integers(-max_shift_y, max_shift_y + 1))
+            out[y:y_end] = np.roll(arr, (dy, dx), axis=(0, 1))[y:y_end]
+        y = y_end
+    return Image.fromarray(out)
+
+
+def _measure(fn, img, vals, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        result = fn(img, *vals)
+        best = min(best, time.perf_counter() - t0)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, np.asarray(result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2, help="ripetizioni (si tiene la migliore)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    print(f"{'immagine':<14}{'caso':<13}{'roll':>9}{'gather':>9}{'speedup':>9}"
+          f"{'picco roll':>12}{'picco gather':>14}")
+    for label, (w, h) in SIZES.items():
+        img = Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+        frame_mb = w * h * 3 / 2**20
+        for case, vals in CASES.items():
+            t_old, p_old, ref = _measure(_roll_per_band, img, vals, args.repeat)
+            t_new, p_new, out = _measure(glitch_temporal_bands, img, vals, args.repeat)
+            assert np.array_equal(ref, out), (label, case)
+            print(f"{label:<14}{case:<13}{t_old:>8.2f}s{t_new:>8.2f}s{t_old / t_new:>8.1f}x"
+                  f"{p_old / 2**20 / frame_mb:>9.1f} fr{p_new / 2**20 / frame_mb:>11.1f} fr")
+    print("(picco = memoria allocata durante il render, in frame RGB uint8)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""GlitchLab: motore degli effetti, indipendente da Streamlit.
+
+L'app (app.py) e' solo un client di questo package; lo stesso motore puo'
+girare in un worker, in un job batch o in un benchmark senza avviare la UI.
+"""
+from .encoding import img_to_bytes, img_to_preview_bytes
+from .registry import (
+    EFFECTS,
+    EFFECTS_BY_KEY,
+    Effect,
+    EffectError,
+    LazyEffect,
+    accepts_param,
+    apply_effect,
+    default_values,
+    get_effect,
+    supported_kwargs,
+)
+from .report import make_report
+
+__all__ = [
+    "EFFECTS", "EFFECTS_BY_KEY", "Effect", "EffectError", "LazyEffect",
+    "accepts_param", "apply_effect", "default_values", "get_effect",
+    "img_to_bytes", "img_to_preview_bytes", "make_report", "supported_kwargs",
+]
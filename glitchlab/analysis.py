@@ -0,0 +1,138 @@
+"""Piani di analisi condivisi fra gli effetti della stessa foto.
+
+Una ventina di effetti ricalcolava la stessa luminanza Rec.601, alcuni anche
+Sobel, blur e la copia ridotta di _downscale_for_work. ImageAnalysis li
+calcola pigramente una volta sola per immagine e li tiene finche' l'immagine
+vive: con "Genera tutti" (stesso oggetto immagine passato a tutti i job del
+pool) ogni piano viene calcolato una volta per foto, non una per effetto.
+
+    an = analysis_for(img)      # prima di img.convert(): la chiave e' l'oggetto
+    gray = an.gray()            # (r*0.299 + g*0.587 + b*0.114) / 255, float32
+    work = an.work(1400)        # ImageAnalysis della copia ridotta
+
+I piani sono calcolati con le stesse formule (stesso dtype, stesso ordine
+delle operazioni) usate prima dentro gli effetti, quindi i risultati non
+cambiano di un bit. Sono array read-only: chi deve modificarli ne fa una copia.
+"""
+import threading
+import weakref
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from .imaging import _box_blur, _downscale_for_work, _sobel
+
+
+def _frozen(arr):
+    arr.flags.writeable = False
+    return arr
+
+
+class ImageAnalysis:
+    """Memo dei piani derivati da un'immagine. Thread-safe: se due worker
+    chiedono lo stesso piano insieme, il secondo aspetta il primo invece di
+    ricalcolarlo."""
+
+    def __init__(self, img, scale=1.0, memo=None):
+        # memo = (piani, lock per piano, lock): analysis_for passa quello
+        # condiviso da tutte le analisi dello stesso oggetto immagine. L'analisi
+        # tiene in vita l'immagine finche' la si usa (l'effetto di solito fa
+        # img = img.convert(...) subito dopo analysis_for), il registro no.
+        self.image = img
+        self.scale = scale
+        self._planes, self._locks, self._lock = memo or ({}, {}, threading.Lock())
+
+    def _memo(self, key, compute):
+        hit = self._planes.get(key)
+        if hit is not None:
+            return hit
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            hit = self._planes.get(key)
+            if hit is None:
+                hit = self._planes[key] = compute()
+            return hit
+
+    def provide(self, plane, arr):
+        """Inserisce un piano gia' calcolato altrove con la stessa formula (es.
+        i pixel e la luminanza in memoria condivisa, vedi glitchlab.shm):
+        "rgb" (uint8 (h, w, 3), anche una vista non contigua), "luminance" o
+        "gray" nel dtype dell'array."""
+        self._planes.setdefault("rgb" if plane == "rgb" else (plane, arr.dtype.str), arr)
+
+    def rgb(self):
+        """Pixel RGB uint8 (h, w, 3)."""
+        return self._memo("rgb", lambda: _frozen(np.array(self.image.convert("RGB"))))
+
+    def rgb_image(self):
+        """Immagine PIL RGB (la sorgente stessa se e' gia' RGB, altrimenti
+        una copia, es. per la sorgente RGBX in memoria condivisa)."""
+        img = self.image
+        return img if img.mode == "RGB" else Image.fromarray(self.rgb())
+
+    def luminance(self, dtype=np.float32):
+        """r*0.299 + g*0.587 + b*0.114 (0-255) nel dtype dato."""
+        def compute():
+            # canale per canale e in place: stesse operazioni (e stessi bit)
+            # di f[..., 0]*0.299 + f[..., 1]*0.587 + f[..., 2]*0.114, senza
+            # la copia RGB intera nel dtype di lavoro
+            rgb = self.rgb()
+            lum = rgb[..., 0].astype(dtype)
+            lum *= 0.299
+            for ch, k in ((1, 0.587), (2, 0.114)):
+                c = rgb[..., ch].astype(dtype)
+                c *= k
+                lum += c
+            return _frozen(lum)
+        return self._memo(("luminance", np.dtype(dtype).str), compute)
+
+    def gray(self, dtype=np.float32):
+        """Luminanza normalizzata 0-1."""
+        return self._memo(("gray", np.dtype(dtype).str),
+                          lambda: _frozen(self.luminance(dtype) / 255.0))
+
+    def sobel(self):
+        """Gradienti (gx, gy) di gray()."""
+        return self._memo("sobel", lambda: tuple(_frozen(g) for g in _sobel(self.gray())))
+
+    def blur(self, plane, r):
+        """Box blur di raggio r di un piano 2D float32 ("luminance" o "gray")."""
+        source = {"luminance": self.luminance, "gray": self.gray}[plane]
+        return self._memo(("blur", plane, r), lambda: _frozen(np.asarray(_box_blur(source(), r))))
+
+    def gaussian(self, radius):
+        """GaussianBlur PIL dell'immagine RGB."""
+        return self._memo(("gaussian", radius),
+                          lambda: self.rgb_image().filter(ImageFilter.GaussianBlur(radius)))
+
+    def work(self, max_dim):
+        """Analisi della copia ridotta per l'elaborazione pesante (vedi
+        _downscale_for_work); `.scale` = dim_originale / dim_ridotta. Se
+        l'immagine sta gia' entro max_dim ritorna l'analisi stessa."""
+        img = self.image
+        if max(img.size) <= max_dim:
+            return self
+
+        def compute():
+            small, scale = _downscale_for_work(self.rgb_image(), max_dim)
+            return ImageAnalysis(small, scale)
+        return self._memo(("work", max_dim), compute)
+
+
+# id(immagine) -> (weakref immagine, memo); la voce sparisce quando
+# l'immagine viene liberata
+_ANALYSES = {}
+_ANALYSES_LOCK = threading.Lock()
+
+
+def analysis_for(img):
+    """ImageAnalysis associata a questo oggetto immagine (creata al primo
+    uso). Va chiamata sull'immagine ricevuta dall'effetto, prima di
+    convert(): ogni convert() crea un oggetto nuovo, senza i piani gia' pronti."""
+    with _ANALYSES_LOCK:
+        entry = _ANALYSES.get(id(img))
+        if entry is None or entry[0]() is not img:
+            entry = _ANALYSES[id(img)] = (weakref.ref(img), ({}, {}, threading.Lock()))
+            weakref.finalize(img, _ANALYSES.pop, id(img), None)
+    return ImageAnalysis(img, memo=entry[1])
@@ -0,0 +1,180 @@
+"""Rendering batch: job (immagine, effetto) eseguiti su un process pool.
+
+Ogni job legge l'immagine dal disco nel worker (niente array giganti
+serializzati fra processi), applica l'effetto e scrive PNG + report uno
+accanto all'altro. La cache di decodifica per-worker evita di rileggere la
+stessa foto per ogni effetto quando i job di un'immagine capitano sullo
+stesso processo.
+"""
+import glob
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from PIL import Image
+
+from .chain import apply_chain, chain_report
+from .encoding import DEFAULT_PRESET, get_preset, img_to_bytes
+from .registry import EffectError, apply_effect, get_effect
+from .report import make_report
+from .telemetry import RenderTelemetry
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# seed None = seed fisso di ogni effetto (vedi glitchlab.seeding). Con
+# `recipe` (glitchlab.chain.Recipe) il job e' l'intera catena: key = nome
+# per i file (recipe_slug), vals = valori di tutti gli stadi in fila.
+RenderJob = namedtuple("RenderJob", ["path", "key", "vals", "seed", "recipe"], defaults=(None, None))
+JobResult = namedtuple("JobResult", ["job", "out_path", "seconds", "megapixels", "error"])
+
+# errori che fanno fallire un solo job e non il batch: l'effetto, una foto
+# illeggibile o troppo grande (DecompressionBombError non e' un OSError),
+# un file di output non scrivibile
+JOB_ERRORS = (EffectError, OSError, Image.UnidentifiedImageError, Image.DecompressionBombError)
+
+
+def expand_inputs(patterns):
+    """Espande glob e cartelle in una lista ordinata e senza duplicati di
+    file immagine. Una cartella vale come tutte le sue immagini (non ricorsivo)."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(os.path.join(pattern, name) for name in os.listdir(pattern))
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+        for path in matches:
+            if not os.path.isfile(path) or not path.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            norm = os.path.abspath(path)
+            if norm not in seen:
+                seen.add(norm)
+                paths.append(path)
+    return paths
+
+
+def load_image(path):
+    """Apre un'immagine come fa l'app: le immagini con trasparenza vengono
+    appiattite su sfondo bianco (la scelta di default della UI)."""
+    raw = Image.open(path)
+    has_alpha = raw.mode in ("RGBA", "LA") or (raw.mode == "P" and "transparency" in raw.info)
+    if not has_alpha:
+        return raw.convert("RGB")
+    raw = raw.convert("RGBA")
+    background = Image.new("RGB", raw.size, (255, 255, 255))
+    background.paste(raw, mask=raw.split()[-1])
+    return background
+
+
+@lru_cache(maxsize=2)
+def _cached_source(path):
+    return load_image(path)
+
+
+def output_paths(out_dir, path, key, ext="png"):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(out_dir, f"{stem}_{key}")
+    return f"{base}_glitch.{ext}", base + "_report.txt"
+
+
+def render_job(job, out_dir, ts, preset=DEFAULT_PRESET):
+    """Esegue un singolo job e scrive i file (immagine nel formato di
+    `preset`, vedi glitchlab.encoding). Gli errori dell'effetto non
+    interrompono il batch, e nemmeno quelli di lettura della foto o di
+    scrittura dei file (JOB_ERRORS): vengono riportati nel JobResult.
+
+    Niente cache dei render (glitchlab.cache): ogni job e' una coppia
+    (immagine, effetto/valori/seed) diversa, i risultati non tornerebbero
+    mai e resterebbero solo a occupare memoria in ogni worker."""
+    t0 = time.perf_counter()
+    mpx = 0.0
+    try:
+        img = _cached_source(job.path)
+        w, h = img.size
+        mpx = w * h / 1_000_000
+        tel = RenderTelemetry(img.size)
+        img_path, rep_path = output_paths(out_dir, job.path, job.key, get_preset(preset).ext)
+        with tel.trace_memory():
+            with tel.stage("compute"):
+                if job.recipe is not None:
+                    result = apply_chain(img, job.recipe.stages, seed=job.seed)
+                else:
+                    result = apply_effect(job.key, img, *job.vals, seed=job.seed)
+            data = img_to_bytes(result, preset, telemetry=tel)
+        with open(img_path, "wb") as f:
+            f.write(data)
+        if job.recipe is not None:
+            report = chain_report(job.recipe, img.size, ts, seed=job.seed, telemetry=tel)
+        else:
+            effect = get_effect(job.key)
+            report = make_report(job.key, effect.label, img.size, job.vals,
+                                 [s[0] for s in effect.sliders], ts, seed=job.seed, telemetry=tel)
+        with open(rep_path, "wb") as f:
+            f.write(report)
+    except JOB_ERRORS as e:
+        # EffectError ha gia' "Etichetta: messaggio", gli altri il solo tipo
+        msg = str(e) if isinstance(e, EffectError) else f"{type(e).__name__}: {e}"
+        return JobResult(job, None, time.perf_counter() - t0, mpx, msg)
+    return JobResult(job, img_path, time.perf_counter() - t0, mpx, None)
+
+
+def run_batch(jobs, out_dir, ts, workers=None, on_result=None, preset=DEFAULT_PRESET):
+    """Esegue tutti i job su `workers` processi (default: tutti i core) e
+    ritorna i JobResult nell'ordine di completamento. Con workers=1 gira
+    nel processo corrente, senza pool (utile per debug e profiling).
+    `on_result(result)` viene chiamata appena ogni job termina; `preset` =
+    formato delle immagini scritte. Anche un worker morto (OOM killer,
+    BrokenProcessPool) vale come job fallito, non ferma il batch."""
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if workers == 1:
+        for job in jobs:
+            res = render_job(job, out_dir, ts, preset)
+            results.append(res)
+            if on_result:
+                on_result(res)
+        return results
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_job, job, out_dir, ts, preset): job for job in jobs}
+        for fut in as_completed(futures):
+            try:
+                res = fut.result()
+            except Exception as e:
+                res = JobResult(futures[fut], None, 0.0, 0.0,
+                                f"worker fallito: {type(e).__name__}: {e}")
+            results.append(res)
+            if on_result:
+                on_result(res)
+    return results
+
+
+def summarize(results, wall_seconds, workers):
+    """Riepilogo testuale: throughput complessivo e per effetto."""
+    ok = [r for r in results if r.error is None]
+    total_mpx = sum(r.megapixels for r in ok)
+    busy = sum(r.seconds for r in results)
+    lines = [
+        f"{len(results)} job in {wall_seconds:.2f}s su {workers} worker — "
+        f"{len(results) / max(wall_seconds, 1e-9):.2f} job/s, "
+        f"{total_mpx / max(wall_seconds, 1e-9):.2f} MP/s",
+        f"somma dei tempi dei job: {busy:.2f}s (parallelismo effettivo {busy / max(wall_seconds, 1e-9):.2f}x)",
+        "",
+        f"{'effetto':<20} {'job':>5} {'medio s':>9} {'max s':>8} {'MP/s':>8}",
+    ]
+    by_key = {}
+    for r in ok:
+        by_key.setdefault(r.job.key, []).append(r)
+    for key in sorted(by_key):
+        rs = by_key[key]
+        secs = [r.seconds for r in rs]
+        mps = sum(r.megapixels for r in rs) / max(sum(secs), 1e-9)
+        lines.append(f"{key:<20} {len(rs):>5} {sum(secs) / len(rs):>9.3f} {max(secs):>8.3f} {mps:>8.2f}")
+    failed = [r for r in results if r.error is not None]
+    lines.append("")
+    lines.append(f"errori: {len(failed)}")
+    for r in failed:
+        lines.append(f"  {r.job.path} [{r.job.key}] {r.error}")
+    return "\n".join(lines)
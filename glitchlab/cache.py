@@ -0,0 +1,142 @@
+"""Cache dei render, condivisa da tutto il processo.
+
+Spostare uno slider e riportarlo indietro, cambiare l'effetto Live o
+riaprire un expander ricalcolava effetti il cui risultato era gia' noto.
+RenderCache tiene gli ultimi risultati (immagini PIL) con chiave
+
+    (hash del contenuto della foto, effetto, valori slider arrotondati,
+     parametri keyword come seed / variation_seed / full_size, dimensioni del render)
+
+ed e' limitata in byte totali: oltre il limite vengono scartati i
+risultati usati meno di recente (LRU). E' thread-safe (il backend a thread
+del pool la usa da piu' worker insieme); ogni processo worker del backend a
+processi ha la sua.
+
+Le immagini in cache sono condivise fra i chiamanti: vanno trattate come
+read-only (reapply_alpha, gli encoder e gli effetti lavorano comunque su
+copie).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .imaging import as_image
+from .registry import accepts_param, apply_effect
+
+
+def image_digest(img):
+    """Hash del contenuto di un'immagine PIL o di un array (modo, dimensioni
+    e pixel): due upload dello stesso file danno lo stesso digest."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(img, np.ndarray):
+        arr = np.ascontiguousarray(img)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode())
+        h.update(memoryview(arr).cast("B"))
+    else:
+        h.update(f"{img.mode}{img.size}".encode())
+        h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def render_key(source_hash, key, vals, size, **kwargs):
+    """Chiave di cache di un render. I valori slider sono arrotondati (i float
+    degli slider Streamlit non sono sempre identici bit a bit)."""
+    return (source_hash, key, tuple(round(float(v), 6) for v in vals),
+            tuple(sorted(kwargs.items())), tuple(size))
+
+
+def _image_nbytes(img):
+    return img.size[0] * img.size[1] * len(img.getbands())
+
+
+class RenderCache:
+    """LRU limitata in byte: `get`/`put` per chiave, contatori in `stats()`.
+    `sizeof(valore)` = byte di un valore (default: immagini PIL)."""
+
+    def __init__(self, max_bytes, sizeof=_image_nbytes):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            img = self._items.get(key)
+            if img is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return img
+
+    def put(self, key, img):
+        nbytes = self._sizeof(img)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= self._sizeof(old)
+            self._items[key] = img
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= self._sizeof(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._items), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes}
+
+
+# Limite di default 512 MB (~40 risultati da 12 MP), regolabile con
+# GLITCHLAB_RENDER_CACHE_MB; 0 disattiva la cache.
+RENDER_CACHE = RenderCache(int(os.environ.get("GLITCHLAB_RENDER_CACHE_MB", "512")) * 1024 * 1024)
+
+
+def apply_key(key, size, vals, source_hash, **kwargs):
+    """Chiave con cui cached_apply mette in cache il render di `key` a
+    dimensioni `size` (la stessa vale per l'anteprima, vedi
+    img_to_preview_bytes); None se il render non e' cacheabile (seed
+    np.random.Generator)."""
+    seed = kwargs.get("seed")
+    if isinstance(seed, np.random.Generator):
+        return None
+    if seed is None or not accepts_param(key, "seed"):
+        kwargs.pop("seed", None)
+    return render_key(source_hash, key, vals, size, **kwargs)
+
+
+def cached_apply(key, img, vals, source_hash, cache=RENDER_CACHE, telemetry=None, **kwargs):
+    """Come apply_effect, ma consulta prima la cache. `source_hash` identifica
+    la foto originale (image_digest): anche quando `img` e' un proxy ridotto
+    la chiave resta distinta grazie alle dimensioni del render. Gli errori
+    (EffectError) non vengono mai messi in cache.
+
+    Un `seed` intero fa parte della chiave solo per gli effetti che lo usano;
+    con un np.random.Generator (stato che cambia a ogni uso) la cache viene
+    saltata. Con `telemetry` (glitchlab.telemetry.RenderTelemetry) si
+    registra in telemetry.cached se il risultato arriva dalla cache."""
+    img = as_image(img)
+    rkey = apply_key(key, img.size, vals, source_hash, **kwargs)
+    if rkey is None:
+        return apply_effect(key, img, *vals, **kwargs)
+    result = cache.get(rkey)
+    if telemetry is not None:
+        telemetry.cached = result is not None
+    if result is None:
+        result = apply_effect(key, img, *vals, **kwargs)
+        cache.put(rkey, result)
+    return result
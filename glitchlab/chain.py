@@ -0,0 +1,271 @@
+"""Catene di effetti (ricette): piu' effetti in sequenza in un solo render.
+
+Una catena thermal -> scanline_burn -> chromatic prima voleva dire tre
+render, con PNG scaricato e ricaricato fra uno e l'altro. Qui ogni stadio
+riceve il risultato del precedente cosi' com'e', in memoria, senza
+codifiche; `opacity` < 1 mescola il risultato dello stadio con il suo
+ingresso (a * (1 - t) + b * t, come _blend):
+
+    recipe = Recipe("termo-crt", [Stage("thermal", (0.0, 0.0, 0.6)),
+                                  Stage("scanline_burn", (1.0, 0.4, 0.5), 0.7),
+                                  Stage("chromatic", (0.5, 0.0, 0.3))])
+    out = apply_chain(img, recipe.stages)
+    save_recipe("termo-crt.json", recipe)
+
+Stadi per pixel consecutivi (vedi glitchlab.lut: thermal senza rumore,
+duotone, psychedelic, channel_swap senza shift, solarize e posterize senza
+spostamenti ne' dither) sono una sola funzione colore -> colore, opacita'
+comprese: si fondono in un'unica tabella e la foto viene letta e scritta
+una volta per tutto il tratto invece che una per stadio. Solo stadi per
+canale (solarize, posterize) -> tabella da 3 x 256 voci, sempre; altrimenti
+la tabella RGB completa, compilata con le regole di rgb_lut (finche' non
+conviene gli stadi girano uno dopo l'altro). Gli stadi fusi danno gli
+stessi bit di quelli in sequenza.
+
+Ricetta JSON:
+
+    {"name": "termo-crt", "seed": null,
+     "stages": [{"effect": "thermal", "values": [0.0, 0.0, 0.6], "opacity": 1.0}, ...]}
+
+`values` mancanti in coda restano al default dell'effetto, `opacity` manca = 1.
+"""
+import json
+import re
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+from .cache import RENDER_CACHE, render_key
+from .imaging import _blend, as_image
+from .lut import apply_rgb_lut, channel_lut, direct_only, rgb_lut
+from .registry import (EFFECTS_BY_KEY, accepts_param, apply_effect, complete_values,
+                       get_effect, supported_kwargs)
+from .report import make_report
+from .seeding import spawn_seeds
+from .tiling import _shift_param
+
+# vals: tupla di float, uno per slider; opacity 0-1
+Stage = namedtuple("Stage", ["key", "vals", "opacity"], defaults=(1.0,))
+# seed None = seed fisso di ogni effetto, altrimenti un seed derivato per stadio
+Recipe = namedtuple("Recipe", ["name", "stages", "seed"], defaults=(None,))
+
+# effetto -> tabella che ne da' il risultato per pixel: "channel" = ogni
+# canale d'uscita dipende solo dallo stesso canale, "rgb" = mescola i canali
+_FUSABLE = {
+    "solarize": "channel",
+    "posterize": "channel",
+    "thermal": "rgb",
+    "duotone": "rgb",
+    "psychedelic": "rgb",
+    "channel_swap": "rgb",
+}
+# effetto -> (indice dello slider, soglia) del rumore per pixel: sopra la
+# soglia il colore d'uscita dipende anche dalla posizione
+_NOISE = {"thermal": (1, 0.01), "posterize": (1, 0.02)}
+
+
+def make_stage(key, vals=None, opacity=1.0):
+    """Stage validato: effetto esistente, valori come in complete_values
+    (None = default), opacita' fra 0 e 1. ValueError altrimenti."""
+    if key not in EFFECTS_BY_KEY:
+        raise ValueError(f"effetto sconosciuto: {key!r}")
+    opacity = float(opacity)
+    if not 0.0 <= opacity <= 1.0:
+        raise ValueError(f"{key}: opacita' {opacity} fuori range [0, 1]")
+    return Stage(key, tuple(complete_values(key, vals or [])), opacity)
+
+
+def recipe_slug(name):
+    """Nome della ricetta utilizzabile nei nomi dei file."""
+    return re.sub(r"[^\w-]+", "_", name).strip("_") or "chain"
+
+
+def recipe_to_dict(recipe):
+    return {"name": recipe.name, "seed": recipe.seed,
+            "stages": [{"effect": s.key, "values": list(s.vals), "opacity": s.opacity}
+                       for s in recipe.stages]}
+
+
+def recipe_from_dict(data):
+    """Recipe da un dizionario come quello di recipe_to_dict (es. JSON
+    caricato), con gli stadi validati da make_stage. ValueError se la
+    ricetta non e' valida."""
+    if not isinstance(data, dict) or not isinstance(data.get("stages"), list):
+        raise ValueError("ricetta non valida: serve un oggetto con la lista 'stages'")
+    if not data["stages"]:
+        raise ValueError("ricetta senza stadi")
+    stages = []
+    for i, entry in enumerate(data["stages"], 1):
+        if not isinstance(entry, dict) or "effect" not in entry:
+            raise ValueError(f"stadio {i}: serve almeno 'effect'")
+        try:
+            stages.append(make_stage(entry["effect"], entry.get("values"), entry.get("opacity", 1.0)))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"stadio {i}: {e}") from None
+    seed = data.get("seed")
+    if seed is not None and not isinstance(seed, int):
+        raise ValueError(f"seed non valido: {seed!r} (intero o null)")
+    return Recipe(str(data.get("name") or "chain"), stages, seed)
+
+
+def recipe_to_json(recipe):
+    return json.dumps(recipe_to_dict(recipe), indent=1, ensure_ascii=False)
+
+
+def recipe_from_json(text):
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON non valido: {e}") from None
+    return recipe_from_dict(data)
+
+
+def save_recipe(path, recipe):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(recipe_to_json(recipe) + "\n")
+
+
+def load_recipe(path):
+    with open(path, encoding="utf-8") as f:
+        return recipe_from_json(f.read())
+
+
+def recipe_params(recipe):
+    """(valori, etichette) di tutti gli stadi in fila, per il report:
+    "2 Scanline Burn · Densità", piu' l'opacita' degli stadi che ne hanno una."""
+    vals, labels = [], []
+    for i, stage in enumerate(recipe.stages, 1):
+        effect = get_effect(stage.key)
+        for (slabel, *_), v in zip(effect.sliders, stage.vals):
+            vals.append(v)
+            labels.append(f"{i} {effect.label} · {slabel}")
+        if stage.opacity < 1.0:
+            vals.append(stage.opacity)
+            labels.append(f"{i} {effect.label} · Opacità")
+    return vals, labels
+
+
+def chain_report(recipe, img_size, ts, seed=None, telemetry=None):
+    """Report (make_report) di una catena: gli stadi in ordine, con i loro valori."""
+    vals, labels = recipe_params(recipe)
+    return make_report("chain", recipe.name, img_size, vals, labels, ts, seed=seed, telemetry=telemetry)
+
+
+def stage_seeds(stages, seed):
+    """Seed per stadio: None per tutti senza seed (ogni effetto usa il suo
+    seed fisso), altrimenti uno derivato per posizione (spawn_seeds)."""
+    return [None] * len(stages) if seed is None else spawn_seeds(seed, len(stages))
+
+
+def _fusion_kind(stage):
+    """"channel" / "rgb" se lo stadio, con questi valori, e' una funzione
+    del solo colore del pixel; None altrimenti."""
+    kind = _FUSABLE.get(stage.key)
+    if kind is None:
+        return None
+    noise = _NOISE.get(stage.key)
+    if noise is not None and stage.vals[noise[0]] > noise[1]:
+        return None
+    # gli spostamenti dei canali a piena risoluzione sono i piu' grandi:
+    # se li' sono nulli lo sono anche su un proxy ridotto
+    if _shift_param(stage.key, stage.vals) is not None:
+        return None
+    return kind
+
+
+def _runs(stages, seeds):
+    """Gruppi di stadi consecutivi [(tipo, [(stadio, seed), ...])]: tipo
+    "channel"/"rgb" per i tratti fondibili, None per gli altri stadi (uno per
+    gruppo). Gli stadi con opacita' 0 non cambiano nulla e vengono saltati."""
+    runs = []
+    for stage, seed in zip(stages, seeds):
+        if stage.opacity <= 0.0:
+            continue
+        kind = _fusion_kind(stage)
+        if kind is not None and runs and runs[-1][0] is not None:
+            prev_kind, members = runs[-1]
+            runs[-1] = ("channel" if prev_kind == kind == "channel" else "rgb", members)
+            members.append((stage, seed))
+        else:
+            runs.append((kind, [(stage, seed)]))
+    return runs
+
+
+def _apply_stage(img, stage, seed, full_size):
+    """Un solo stadio: l'effetto sul risultato precedente, poi l'opacita'."""
+    res = apply_effect(stage.key, img, *stage.vals, seed=seed,
+                       **supported_kwargs(stage.key, full_size=full_size))
+    if stage.opacity >= 1.0:
+        return res
+    prev = np.asarray(img.convert("RGB"))
+    res = np.asarray(res.convert("RGB"))
+    if res.shape != prev.shape:
+        res = np.asarray(Image.fromarray(res).resize(img.size, Image.LANCZOS))
+    return Image.fromarray(_blend(prev, res, stage.opacity))
+
+
+def _apply_run(img, members, full_size):
+    for stage, seed in members:
+        img = _apply_stage(img, stage, seed, full_size)
+    return img
+
+
+def _lut_params(members):
+    # il seed conta solo per gli effetti che lo usano (es. le inversioni di
+    # psychedelic): gli altri condividono la stessa tabella con qualunque seed
+    return tuple((stage.key, stage.vals, stage.opacity,
+                  seed if accepts_param(stage.key, "seed") else None)
+                 for stage, seed in members)
+
+
+def apply_chain(img, stages, seed=None, full_size=None):
+    """Applica gli stadi in ordine a `img` (immagine PIL o array uint8) e
+    ritorna l'immagine PIL risultato. `seed` come in apply_effect, derivato
+    per stadio (stage_seeds); `full_size` come per gli effetti, per le
+    catene sul proxy ridotto della modalita' Live. Gli errori di uno stadio
+    arrivano come EffectError con l'etichetta dell'effetto."""
+    img = as_image(img)
+    for kind, members in _runs(stages, stage_seeds(stages, seed)):
+        if kind is None or len(members) == 1:
+            img = _apply_run(img, members, full_size)
+            continue
+
+        def compute(an, members=members):
+            return np.asarray(_apply_run(an.image, members, full_size).convert("RGB"))
+
+        if kind == "channel":
+            img = img.convert("RGB").point(channel_lut("chain", _lut_params(members), compute))
+            continue
+        table = rgb_lut("chain", _lut_params(members), compute, img.size[0] * img.size[1])
+        if table is None:
+            # le tabelle dei singoli stadi non servono: ripetendo la catena
+            # arriva quella dell'intero tratto
+            with direct_only():
+                img = _apply_run(img, members, full_size)
+        else:
+            img = apply_rgb_lut(np.asarray(img.convert("RGB")), table)
+    return img
+
+
+def chain_key(size, stages, source_hash, seed=None, full_size=None):
+    """Chiave di cache di una catena (come apply_key per un effetto)."""
+    return render_key(source_hash, "chain", (), size,
+                      stages=tuple((s.key, tuple(round(float(v), 6) for v in s.vals),
+                                    round(float(s.opacity), 6)) for s in stages),
+                      seed=seed, full_size=full_size)
+
+
+def cached_chain(img, stages, source_hash, seed=None, full_size=None, cache=RENDER_CACHE,
+                 telemetry=None):
+    """Come apply_chain, passando dalla cache dei render (vedi cached_apply):
+    la chiave comprende tutti gli stadi, il seed e la risoluzione."""
+    img = as_image(img)
+    rkey = chain_key(img.size, stages, source_hash, seed=seed, full_size=full_size)
+    result = cache.get(rkey)
+    if telemetry is not None:
+        telemetry.cached = result is not None
+    if result is None:
+        result = apply_chain(img, stages, seed=seed, full_size=full_size)
+        cache.put(rkey, result)
+    return result
@@ -0,0 +1,359 @@
+"""Riga di comando: ``python -m glitchlab <comando> ...``.
+
+    python -m glitchlab render "foto/*.jpg" -e vhs -e pixel_sort=0.4,1,0.8 -o out/ -j 8
+    python -m glitchlab profile -e pixel_sort --size 4000x3000 -o prof/
+    python -m glitchlab tiled scansione.tif -e oil_paint -e duotone=0.1,0.6 -o out/
+    python -m glitchlab chain "foto/*.jpg" -c "thermal=0,0,0.6>scanline_burn@0.7>chromatic" -o out/
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from .encoding import DEFAULT_PRESET, available_presets
+from .registry import EFFECTS, EFFECTS_BY_KEY, EffectError, complete_values, default_values, get_effect
+
+
+def parse_effect_spec(spec):
+    """'vhs' / 'vhs=defaults' -> valori di default; 'vhs=1,0.5,1' -> valori
+    espliciti (uno per slider, entro i range; quelli mancanti in coda restano
+    al default, cosi' gli slider aggiunti dopo non rompono le specifiche
+    esistenti). 'all' -> tutti gli effetti."""
+    key, _, values = spec.partition("=")
+    key = key.strip()
+    if key == "all":
+        if values:
+            raise ValueError("'all' non accetta valori: usa solo i default")
+        return [(e.key, default_values(e.key)) for e in EFFECTS]
+    if key not in EFFECTS_BY_KEY:
+        raise ValueError(f"effetto sconosciuto: {key!r}")
+    values = values.strip()
+    if not values or values == "defaults":
+        return [(key, default_values(key))]
+    return [(key, complete_values(key, values.split(",")))]
+
+
+def parse_chain_spec(spec):
+    """'thermal=0,0,0.6>scanline_burn@0.7>chromatic' -> lista di Stage
+    (glitchlab.chain): stadi separati da '>', ognuno 'KEY[=V1,V2,V3][@OPACITA']'
+    con i valori come in parse_effect_spec e l'opacita' fra 0 e 1 (default 1)."""
+    from .chain import make_stage
+
+    stages = []
+    for part in spec.split(">"):
+        effect_spec, _, opacity = part.partition("@")
+        if effect_spec.strip() == "all":
+            raise ValueError("'all' non si puo' usare in una catena")
+        [(key, vals)] = parse_effect_spec(effect_spec)
+        stages.append(make_stage(key, vals, float(opacity) if opacity.strip() else 1.0))
+    return stages
+
+
+def _effect_list(specs, parser):
+    effects = []
+    for spec in specs:
+        try:
+            effects.extend(parse_effect_spec(spec))
+        except ValueError as e:
+            parser.error(str(e))
+    return effects
+
+
+def cmd_render(args, parser):
+    from .batch import RenderJob, expand_inputs, run_batch, summarize
+    from .seeding import spawn_seeds
+
+    effects = _effect_list(args.effects, parser)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("nessuna immagine trovata negli input")
+    stems = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+    dup = sorted({s for s in stems if stems.count(s) > 1})
+    if dup:
+        parser.error(f"nomi file duplicati fra gli input (i PNG si sovrascriverebbero): {', '.join(dup)}")
+
+    pairs = [(path, key, vals) for path in paths for key, vals in effects]
+    if args.seed is None:
+        jobs = [RenderJob(*pair) for pair in pairs]
+    else:
+        # un seed figlio per job, legato alla sua posizione: stesso risultato
+        # con qualunque numero di worker
+        jobs = [RenderJob(*pair, seed) for pair, seed in zip(pairs, spawn_seeds(args.seed, len(pairs)))]
+    workers = args.workers or os.cpu_count() or 1
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"{len(paths)} immagini x {len(effects)} effetti = {len(jobs)} job, {workers} worker",
+          file=sys.stderr)
+
+    done = [0]
+
+    def progress(res):
+        done[0] += 1
+        status = "ERRORE " + res.error if res.error else f"{res.seconds:.2f}s"
+        print(f"[{done[0]}/{len(jobs)}] {os.path.basename(res.job.path)} {res.job.key}: {status}",
+              file=sys.stderr)
+
+    t0 = time.perf_counter()
+    results = run_batch(jobs, args.output, ts, workers=workers,
+                        on_result=None if args.quiet else progress, preset=args.format)
+    print(summarize(results, time.perf_counter() - t0, workers))
+    return 1 if any(r.error for r in results) else 0
+
+
+def cmd_chain(args, parser):
+    from .batch import RenderJob, expand_inputs, run_batch, summarize
+    from .chain import Recipe, load_recipe, recipe_params, recipe_slug, save_recipe
+    from .seeding import spawn_seeds
+
+    try:
+        if args.recipe:
+            recipe = load_recipe(args.recipe)
+        else:
+            recipe = Recipe(args.name, parse_chain_spec(args.chain))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.recipe and args.name != "chain":
+        recipe = recipe._replace(name=args.name)
+    if args.seed is not None:
+        recipe = recipe._replace(seed=args.seed)
+    if args.save_recipe:
+        save_recipe(args.save_recipe, recipe)
+        print(f"ricetta salvata: {args.save_recipe}", file=sys.stderr)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("nessuna immagine trovata negli input")
+
+    key = recipe_slug(recipe.name)
+    vals = recipe_params(recipe)[0]
+    # come in render: con -s un seed derivato per immagine, altrimenti
+    # quello della ricetta (None = seed fisso di ogni effetto)
+    seeds = spawn_seeds(args.seed, len(paths)) if args.seed is not None else [recipe.seed] * len(paths)
+    jobs = [RenderJob(path, key, vals, seed, recipe) for path, seed in zip(paths, seeds)]
+    workers = args.workers or os.cpu_count() or 1
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"{len(paths)} immagini x catena {recipe.name!r} "
+          f"({' > '.join(s.key for s in recipe.stages)}), {workers} worker", file=sys.stderr)
+
+    done = [0]
+
+    def progress(res):
+        done[0] += 1
+        status = "ERRORE " + res.error if res.error else f"{res.seconds:.2f}s"
+        print(f"[{done[0]}/{len(jobs)}] {os.path.basename(res.job.path)}: {status}", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    results = run_batch(jobs, args.output, ts, workers=workers,
+                        on_result=None if args.quiet else progress, preset=args.format)
+    print(summarize(results, time.perf_counter() - t0, workers))
+    return 1 if any(r.error for r in results) else 0
+
+
+def _positive_int(text):
+    """Intero >= 1 (es. il numero di worker)."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"intero non valido: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"serve un intero >= 1, non {text}")
+    return value
+
+
+def _parse_size(text):
+    """'4000x3000' -> (4000, 3000)."""
+    try:
+        w, h = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"dimensione non valida: {text!r} (es. 4000x3000)") from None
+    if w < 1 or h < 1:
+        raise argparse.ArgumentTypeError(f"dimensione non valida: {text!r}")
+    return w, h
+
+
+def cmd_profile(args, parser):
+    from PIL import Image
+
+    from .profiling import profile_effect, synthetic_image, top_functions, write_profile
+
+    effects = _effect_list(args.effects, parser)
+    if args.image:
+        img = Image.open(args.image)
+        img.load()
+        if args.size:
+            img = img.resize(args.size, Image.LANCZOS)
+        source = f"{os.path.basename(args.image)} {img.size[0]}x{img.size[1]}"
+    else:
+        img = synthetic_image(*(args.size or (4000, 3000)))
+        source = f"sintetica {img.size[0]}x{img.size[1]}"
+
+    for key, vals in effects:
+        stats, seconds = profile_effect(key, img, vals, seed=args.seed)
+        pstats_path, collapsed_path = write_profile(stats, args.output, key)
+        print(f"== {key} ({', '.join(f'{v:g}' for v in vals)}) su {source}: "
+              f"{seconds:.2f}s sotto profiler")
+        print(f"   {pstats_path}\n   {collapsed_path}")
+        print(top_functions(stats, args.top, args.sort))
+    return 0
+
+
+def cmd_tiled(args, parser):
+    import numpy as np
+
+    from .encoding import write_png_rows
+    from .report import make_report
+    from .seeding import spawn_seeds
+    from .telemetry import RenderTelemetry
+    from .tiling import TILED_EFFECTS, open_source, render_tiled
+
+    effects = _effect_list(args.effects, parser)
+    unsupported = sorted({key for key, _ in effects if key not in TILED_EFFECTS})
+    if unsupported:
+        parser.error(f"effetti senza rendering a tasselli: {', '.join(unsupported)} "
+                     f"(supportati: {', '.join(TILED_EFFECTS)})")
+    if args.tile < 64:
+        parser.error("--tile deve essere almeno 64")
+    seeds = spawn_seeds(args.seed, len(effects)) if args.seed is not None else [None] * len(effects)
+    os.makedirs(args.output, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.input))[0]
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    errors = 0
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        t0 = time.perf_counter()
+        try:
+            src = open_source(args.input, tmp)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        decode_s = time.perf_counter() - t0
+        h, w = src.shape[:2]
+        print(f"{os.path.basename(args.input)}: {w}x{h} ({w * h / 1e6:.0f} MP), "
+              f"decodifica {decode_s:.2f}s", file=sys.stderr)
+        for (key, vals), seed in zip(effects, seeds):
+            base = os.path.join(args.output, f"{stem}_{key}")
+            out_path = base + "_glitch." + args.format
+            # col PNG il risultato passa da un .npy temporaneo, col npy e' gia' il file finale
+            npy_path = out_path if args.format == "npy" else os.path.join(tmp, f"{key}.npy")
+            tel = RenderTelemetry((w, h))
+            tel.seconds["decode"] = decode_s
+            try:
+                with tel.trace_memory():
+                    out = np.lib.format.open_memmap(npy_path, "w+", np.uint8, src.shape)
+                    with tel.stage("compute"):
+                        render_tiled(key, src, out, vals, seed=seed, tile=args.tile, workdir=tmp)
+                    if args.format == "png":
+                        with tel.stage("encode"):
+                            write_png_rows(out_path, out)
+                    del out
+            except EffectError as e:
+                errors += 1
+                print(f"{key}: ERRORE {e}", file=sys.stderr)
+                continue
+            finally:
+                if args.format == "png" and os.path.exists(npy_path):
+                    os.remove(npy_path)
+            effect = get_effect(key)
+            with open(base + "_report.txt", "wb") as f:
+                f.write(make_report(key, effect.label, (w, h), vals, [s[0] for s in effect.sliders],
+                                    ts, seed=seed, telemetry=tel))
+            print(f"{key}: {out_path}  ({tel.timings()})", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="glitchlab", description="GlitchLab senza interfaccia.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser(
+        "render", help="applica effetti a piu' immagini in parallelo",
+        description="Esegue ogni coppia (immagine, effetto) su un process pool e scrive "
+                    "<nome>_<effetto>_glitch.png (o l'estensione di --format) e <nome>_<effetto>_report.txt "
+                    "nella cartella di output.")
+    render.add_argument("inputs", nargs="+", help="file, cartelle o glob (es. 'foto/**/*.jpg')")
+    render.add_argument("-e", "--effect", dest="effects", action="append", required=True,
+                        metavar="KEY[=V1,V2,V3]",
+                        help="effetto da applicare (ripetibile); senza valori o con '=defaults' "
+                             "usa i default degli slider; 'all' = tutti gli effetti")
+    render.add_argument("-o", "--output", required=True, help="cartella di output")
+    render.add_argument("-j", "--workers", type=_positive_int, default=None,
+                        help="processi worker (default: numero di core)")
+    render.add_argument("-s", "--seed", type=int, default=None,
+                        help="seed di partenza: ogni job riceve un seed derivato (SeedSequence) "
+                             "e riportato nel report; senza, ogni effetto usa il suo seed fisso")
+    render.add_argument("-f", "--format", choices=available_presets(), default=DEFAULT_PRESET,
+                        help=f"formato delle immagini (preset di glitchlab.encoding, default {DEFAULT_PRESET})")
+    render.add_argument("-q", "--quiet", action="store_true", help="niente avanzamento per job")
+    render.set_defaults(func=cmd_render, parser=render)
+
+    profile = sub.add_parser(
+        "profile", help="profila effetti con cProfile",
+        description="Esegue ogni effetto sotto cProfile su una foto sintetica (o data) e scrive "
+                    "<effetto>.pstats e <effetto>.collapsed (stack compressi per i flamegraph) "
+                    "nella cartella di output, stampando le funzioni piu' costose.")
+    profile.add_argument("-e", "--effect", dest="effects", action="append", required=True,
+                         metavar="KEY[=V1,V2,V3]", help="effetto da profilare (ripetibile), come in render")
+    profile.add_argument("-i", "--image", help="foto da usare (default: foto sintetica)")
+    profile.add_argument("--size", type=_parse_size, default=None, metavar="WxH",
+                         help="dimensioni della foto sintetica (default 4000x3000) o a cui "
+                              "ridimensionare quella data")
+    profile.add_argument("-o", "--output", default="profile", help="cartella di output (default: profile/)")
+    profile.add_argument("-n", "--top", type=int, default=25, help="funzioni da stampare (default 25)")
+    profile.add_argument("--sort", default="cumulative", choices=["cumulative", "tottime", "ncalls"],
+                         help="ordinamento della tabella (default cumulative)")
+    profile.add_argument("-s", "--seed", type=int, default=None, help="seed degli effetti casuali")
+    profile.set_defaults(func=cmd_profile, parser=profile)
+
+    tiled = sub.add_parser(
+        "tiled", help="applica effetti a foto enormi, a tasselli e fuori memoria",
+        description="Rendering a tasselli per scansioni da centinaia di megapixel: sorgente e "
+                    "risultato stanno su disco (.npy mappati in memoria), la RAM usata dipende "
+                    "dal tassello e non dalla foto. Scrive <nome>_<effetto>_glitch.png (o .npy) "
+                    "e <nome>_<effetto>_report.txt. Effetti supportati: duotone, thermal, "
+                    "solarize, posterize, psychedelic, channel_swap, neon_glow, oil_paint, "
+                    "lichtenstein_comic.")
+    tiled.add_argument("input", help="foto (qualunque formato PIL) o array .npy (h, w, 3) uint8; "
+                                     "col .npy nemmeno la decodifica carica la foto in RAM")
+    tiled.add_argument("-e", "--effect", dest="effects", action="append", required=True,
+                       metavar="KEY[=V1,V2,V3]", help="effetto da applicare (ripetibile), come in render")
+    tiled.add_argument("-o", "--output", required=True, help="cartella di output")
+    tiled.add_argument("--tile", type=int, default=2048, help="lato del tassello in pixel (default 2048)")
+    tiled.add_argument("--format", choices=["png", "npy"], default="png",
+                       help="formato del risultato (default png, scritto a strisce)")
+    tiled.add_argument("--workdir", default=None,
+                       help="cartella dei file temporanei, serve spazio per ~2 volte la foto "
+                            "non compressa (default: cartella temporanea di sistema)")
+    tiled.add_argument("-s", "--seed", type=int, default=None,
+                       help="seed di partenza: ogni effetto riceve un seed derivato, come in render")
+    tiled.set_defaults(func=cmd_tiled, parser=tiled)
+
+    chain = sub.add_parser(
+        "chain", help="applica una catena di effetti (ricetta) a piu' immagini",
+        description="Applica piu' effetti in sequenza, ognuno al risultato del precedente, in un "
+                    "solo job per immagine (niente PNG intermedi; gli stadi per pixel consecutivi "
+                    "vengono fusi in una passata). Scrive <nome>_<ricetta>_glitch.png (o l'estensione di "
+                    "--format) e "
+                    "<nome>_<ricetta>_report.txt.")
+    chain.add_argument("inputs", nargs="+", help="file, cartelle o glob, come in render")
+    spec = chain.add_mutually_exclusive_group(required=True)
+    spec.add_argument("-c", "--chain", metavar="KEY[=V1,V2][@OPACITA']>KEY...",
+                      help="stadi separati da '>', es. 'thermal=0,0,0.6>scanline_burn@0.7>chromatic'")
+    spec.add_argument("-r", "--recipe", help="ricetta JSON (vedi glitchlab.chain)")
+    chain.add_argument("-o", "--output", required=True, help="cartella di output")
+    chain.add_argument("--name", default="chain",
+                       help="nome della ricetta, usato nei nomi dei file (default: 'chain' o "
+                            "quello della ricetta JSON)")
+    chain.add_argument("--save-recipe", metavar="FILE.json", help="salva la ricetta in JSON")
+    chain.add_argument("-j", "--workers", type=_positive_int, default=None,
+                       help="processi worker (default: numero di core)")
+    chain.add_argument("-s", "--seed", type=int, default=None,
+                       help="seed di partenza: ogni immagine riceve un seed derivato, ogni stadio "
+                            "uno derivato da quello; senza, vale il seed della ricetta")
+    chain.add_argument("-f", "--format", choices=available_presets(), default=DEFAULT_PRESET,
+                       help=f"formato delle immagini, come in render (default {DEFAULT_PRESET})")
+    chain.add_argument("-q", "--quiet", action="store_true", help="niente avanzamento per job")
+    chain.set_defaults(func=cmd_chain, parser=chain)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args, args.parser)
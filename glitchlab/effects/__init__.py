@@ -0,0 +1 @@
+"""Un modulo per effetto (nome = chiave in EFFECTS), importato pigramente dal registry."""
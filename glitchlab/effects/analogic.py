@@ -0,0 +1,49 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _shift_lines
+from ..seeding import make_rng
+
+
+def glitch_analogic(img, sync_loss=0.5, color_bleed=0.4, static=0.3, seed=None, full_size=None):
+    """TV analogica mal sintonizzata: righe che scivolano + static.
+
+    seed : seed (o np.random.Generator) di desync e static; None = seed fisso 0.
+    """
+    px_scale = _proxy_scale(img, full_size)
+    rng = make_rng(seed)
+    img = img.convert("RGB")
+    w, h = img.size
+
+    # Righe che scivolano lateralmente in modo irregolare
+    n_desync = int(h * (0.05 + 0.6 * sync_loss))
+    desync_rows = rng.choice(h, n_desync, replace=False)
+    shifts = np.zeros(h, dtype=int)
+    shifts[desync_rows] = rng.normal(0, 25 * sync_loss * px_scale, n_desync).astype(int)
+    arr = _shift_lines(np.asarray(img), shifts).astype(np.float32)
+
+    # Blocchi di righe che scivolano insieme (sync loss a blocchi)
+    if sync_loss > 0.3:
+        n_blocks = int(3 + 8 * sync_loss)
+        for _ in range(n_blocks):
+            y0 = int(rng.integers(0, max(0, h - 5), endpoint=True))
+            y1 = min(y0 + int(rng.integers(max(1, int(3 * px_scale)), max(1, int(20 * px_scale)),
+                                           endpoint=True)), h)
+            shift = int(rng.normal(0, 40 * sync_loss * px_scale))
+            arr[y0:y1] = np.roll(arr[y0:y1], shift, axis=1)
+
+    # Color bleed verticale
+    if color_bleed > 0.05:
+        s = int((2 + 10 * color_bleed) * px_scale)
+        for ch in range(3):
+            arr[:, :, ch] = arr[:, :, ch] * 0.75 + np.roll(arr[:, :, ch], s, axis=0) * 0.25
+
+    # Static
+    if static > 0.05:
+        n_st = int(w * h * 0.008 * static)
+        ys = rng.integers(0, h, n_st)
+        xs = rng.integers(0, w, n_st)
+        # pixel bianchi o neri, una sola scrittura scatter
+        arr[ys, xs] = (rng.integers(0, 2, n_st) * 255).astype(np.float32)[:, None]
+
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
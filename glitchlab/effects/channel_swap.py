@@ -0,0 +1,42 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _row_chunks
+
+
+def _channel_offsets(shift_px, px_scale=1.0):
+    """Spostamento (dy, dx) dei canali R, G, B nel verso di np.roll: rosso e
+    blu in orizzontale, in versi opposti."""
+    if shift_px <= 0.01:
+        return (0, 0), (0, 0), (0, 0)
+    s = int(shift_px * 40 * px_scale)
+    return (0, s), (0, 0), (0, -s)
+
+
+def glitch_channel_swap(img, modalita=0.0, blend=0.6, shift_px=0.0, full_size=None):
+    """Scambia canali RGB + shift orizzontale opzionale."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    src = np.asarray(img)
+    h, w, _ = src.shape
+    offsets = _channel_offsets(shift_px, px_scale)
+    out = np.empty_like(src)
+    # per pixel (lo shift e' orizzontale): float32 a blocchi di righe
+    for y0, y1 in _row_chunks(h, w):
+        arr = src[y0:y1].astype(np.float32)
+        r, g, b = arr[:, :, 0], arr[:, :, 1], arr[:, :, 2]
+        combos = [
+            (g, b, r),              # GBR
+            (b, r, g),              # BRG
+            (r, b, g),              # RBG
+            (b, g, r),              # BGR
+            (g, r, b),              # GRB
+            (255 - r, g, 255 - b),  # inversione parziale
+        ]
+        idx = int(modalita * (len(combos) - 0.01))
+        for ch, (c, nc) in enumerate(zip((r, g, b), combos[idx])):
+            v = c * (1 - blend) + nc * blend
+            if offsets[ch][1]:
+                v = np.roll(v, offsets[ch][1], axis=1)
+            out[y0:y1, :, ch] = np.clip(v, 0, 255, out=v)
+    return Image.fromarray(out)
@@ -0,0 +1,35 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale
+
+
+def glitch_chromatic(img, forza=1.0, angolo=0.0, zoom_aberr=0.5, full_size=None):
+    """Aberrazione cromatica: R/G/B spostati in direzioni diverse."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    out = np.zeros_like(arr)
+    max_shift = int((5 + 40 * forza) * px_scale)
+    a = angolo * 2 * np.pi
+
+    # Tre canali si spostano in direzioni a 120° tra loro
+    for ch, angle_offset in enumerate([a, a + 2.094, a + 4.189]):
+        sx = int(max_shift * np.cos(angle_offset))
+        sy = int(max_shift * np.sin(angle_offset))
+        out[:, :, ch] = np.roll(np.roll(arr[:, :, ch], sx, axis=1), sy, axis=0)
+
+    # Zoom aberrazione: i canali si zoomano leggermente (bordi scoloriti)
+    if zoom_aberr > 0.05:
+        scale = 1.0 + zoom_aberr * 0.05
+        for ch in [0, 2]:
+            ch_img = Image.fromarray(out[:, :, ch])
+            new_w = int(w * scale)
+            new_h = int(h * scale)
+            zoomed = np.array(ch_img.resize((new_w, new_h), Image.BILINEAR))
+            y0 = (new_h - h) // 2
+            x0 = (new_w - w) // 2
+            out[:, :, ch] = zoomed[y0:y0+h, x0:x0+w]
+
+    return Image.fromarray(np.clip(out, 0, 255).astype(np.uint8))
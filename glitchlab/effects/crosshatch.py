@@ -0,0 +1,40 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _grid, _proxy_scale, _row_chunks
+
+
+def glitch_crosshatch(img, densita=0.5, angolo=0.3, spessore=0.3, full_size=None):
+    """Tratteggi incrociati — intensità proporzionale alle zone scure."""
+    px_scale = _proxy_scale(img, full_size)
+    an = analysis_for(img)
+    arr = an.rgb()
+    h, w, _ = arr.shape
+    lum = an.gray()
+    spacing = max(2, int(2 + 12 * (1 - densita))) * px_scale
+    thick = max(1, int(1 + 3 * spessore)) * px_scale
+    a = angolo * np.pi * 0.5
+    out = np.full((h, w, 3), 255, dtype=np.uint8)
+    ys_all, xs = _grid(h, w)
+
+    def hatch(ys, angle, period):
+        # coefficienti come float Python: la fase resta float32
+        line = xs * float(np.cos(angle)) + ys * float(np.sin(angle))
+        return np.mod(line, period, out=line) < thick
+
+    for y0, y1 in _row_chunks(h, w):
+        ys, lb = ys_all[y0:y1], lum[y0:y1]
+        hatch1 = hatch(ys, a, spacing)
+        hatch2 = hatch(ys, a + np.pi/2, spacing)
+        hatch3 = hatch(ys, a + np.pi/4, spacing * 1.5)
+        # Zone molto scure: 3 direzioni
+        very_dark = lb < 0.25
+        dark = (lb >= 0.25) & (lb < 0.5)
+        medium = (lb >= 0.5) & (lb < 0.75)
+        src, dst = arr[y0:y1], out[y0:y1]
+        for sel, k in ((very_dark & (hatch1 | hatch2 | hatch3), 0.05),
+                       (dark & (hatch1 | hatch2), 0.1),
+                       (medium & hatch1, 0.3)):
+            dst[sel] = src[sel].astype(np.float32) * k
+    return Image.fromarray(out)
@@ -0,0 +1,28 @@
+import numpy as np
+from PIL import Image
+
+from ..seeding import make_rng
+
+
+def glitch_datamosh(img, block_size=1.0, decay=0.5, num_blocks=0.5, seed=None):
+    """Blocchi di frame congelati sovrapposti — corruzione video.
+
+    seed : seed (o np.random.Generator) della posizione dei blocchi; None = seed fisso 0.
+    """
+    rng = make_rng(seed)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.float32)
+    h, w, _ = arr.shape
+    n_blocks = int(15 + 60 * num_blocks)
+    bw = max(8, int((w // 6) * (0.3 + 1.4 * block_size)))
+    bh = max(8, int((h // 6) * (0.3 + 1.4 * block_size)))
+    alpha = 0.4 + 0.55 * decay
+
+    for _ in range(n_blocks):
+        x1, x2 = rng.integers(0, max(0, w - bw), 2, endpoint=True)
+        y1, y2 = rng.integers(0, max(0, h - bh), 2, endpoint=True)
+        src = arr[y1:y1 + bh, x1:x1 + bw]
+        dst = arr[y2:y2 + bh, x2:x2 + bw]
+        if src.shape == dst.shape:
+            arr[y2:y2 + bh, x2:x2 + bw] = alpha * src + (1 - alpha) * dst
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
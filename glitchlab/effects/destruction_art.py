@@ -0,0 +1,54 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale
+from ..seeding import make_rng
+
+
+def glitch_destruction_art(img, tagli=0.5, scatter=0.4, orientamento=0.0, seed=None,
+                           full_size=None):
+    """Taglia l'immagine in strisce e le ricompone — orientamento controllato.
+
+    seed : seed (o np.random.Generator) di tagli, ordine e scatter; None = seed fisso 0.
+    """
+    px_scale = _proxy_scale(img, full_size)
+    rng = make_rng(seed)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    out = np.zeros_like(arr)
+    n_cuts = int(5 + 40 * tagli)
+    vertical = orientamento > 0.5  # 0=orizzontale, 1=verticale
+
+    if vertical:
+        indices = sorted(rng.choice(np.arange(1, w), min(n_cuts, w - 1), replace=False).tolist())
+        boundaries = [0] + indices + [w]
+        strips = [arr[:, boundaries[i]:boundaries[i+1]].copy() for i in range(len(boundaries)-1) if boundaries[i+1] > boundaries[i]]
+        strips = [strips[i] for i in rng.permutation(len(strips))]
+        x = 0
+        for strip in strips:
+            sw = strip.shape[1]
+            if x + sw <= w:
+                if scatter > 0.1:
+                    dx = rng.integers(-int(scatter * 15 * px_scale), int(scatter * 15 * px_scale), endpoint=True)
+                    cols = np.clip(np.arange(sw) + dx, 0, sw - 1)
+                    strip = strip[:, cols]
+                out[:, x:x + sw] = strip
+                x += sw
+    else:
+        indices = sorted(rng.choice(np.arange(1, h), min(n_cuts, h - 1), replace=False).tolist())
+        boundaries = [0] + indices + [h]
+        strips = [arr[boundaries[i]:boundaries[i+1], :].copy() for i in range(len(boundaries)-1) if boundaries[i+1] > boundaries[i]]
+        strips = [strips[i] for i in rng.permutation(len(strips))]
+        y = 0
+        for strip in strips:
+            sh = strip.shape[0]
+            if y + sh <= h:
+                if scatter > 0.1:
+                    dy = rng.integers(-int(scatter * 15 * px_scale), int(scatter * 15 * px_scale), endpoint=True)
+                    rows = np.clip(np.arange(sh) + dy, 0, sh - 1)
+                    strip = strip[rows, :]
+                out[y:y + sh, :] = strip
+                y += sh
+
+    return Image.fromarray(out)
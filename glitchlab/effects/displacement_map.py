@@ -0,0 +1,43 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _proxy_scale, _row_chunks
+
+
+def glitch_displacement_map(img, forza=0.5, blur_scala=0.4, canale=0.0, full_size=None):
+    """L'immagine si sposta seguendo se stessa — effetto organico/liquido."""
+    px_scale = _proxy_scale(img, full_size)
+    an = analysis_for(img)
+    arr = an.rgb()
+    h, w, _ = arr.shape
+    blur_r = max(1, int((2 + 15 * blur_scala) * px_scale))
+    disp_map = np.asarray(an.gaussian(blur_r))
+    ch_x = int(canale * 2.99)
+    ch_y = (ch_x + 1) % 3
+    max_d = int((10 + 90 * forza) * px_scale)
+
+    def offsets(plane):
+        # (v / 255 - 0.5) * 2 * max_d in float32, troncato a int32
+        m = plane.astype(np.float32)
+        m /= 255.0
+        m -= 0.5
+        m *= 2
+        m *= max_d
+        return m.astype(np.int32)
+
+    # gather a blocchi di righe con indici int32 (niente meshgrid int64)
+    flat = arr.reshape(-1, 3)
+    xs = np.arange(w, dtype=np.int32)
+    out = np.empty_like(arr)
+    for y0, y1 in _row_chunks(h, w):
+        src_x = offsets(disp_map[y0:y1, :, ch_x])
+        src_x += xs
+        np.clip(src_x, 0, w - 1, out=src_x)
+        src_y = offsets(disp_map[y0:y1, :, ch_y])
+        src_y += np.arange(y0, y1, dtype=np.int32)[:, None]
+        np.clip(src_y, 0, h - 1, out=src_y)
+        src_y *= w
+        src_y += src_x
+        out[y0:y1] = flat[src_y]
+    return Image.fromarray(out)
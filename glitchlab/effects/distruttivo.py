@@ -0,0 +1,37 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale
+from ..seeding import make_rng
+
+
+def glitch_distruttivo(img, block_size=1.0, num_blocks=1.0, displacement=1.0, seed=None,
+                      full_size=None):
+    """Blocchi rettangolari strappati e riposizionati — collage distruttivo.
+
+    seed : seed (o np.random.Generator) di blocchi e spostamenti; None = seed fisso 0.
+    """
+    px_scale = _proxy_scale(img, full_size)
+    rng = make_rng(seed)
+    img = img.convert("RGB")
+    arr = np.array(img)
+    h, w, _ = arr.shape
+    if w < 60 or h < 60:
+        return img
+    base_blocks = min(80, w * h // 1500)
+    total_blocks = int(base_blocks * (0.5 + 1.5 * num_blocks))
+    max_bw = max(5, int(min(60 * px_scale, w // 4) * (0.3 + 1.4 * block_size)))
+    max_bh = max(5, int(min(60 * px_scale, h // 4) * (0.3 + 1.4 * block_size)))
+    max_disp = max(1, int(min(w // 4, h // 4) * displacement))
+    for _ in range(total_blocks):
+        bw = int(rng.integers(max(5, max_bw // 3), max_bw, endpoint=True))
+        bh = int(rng.integers(max(5, max_bh // 3), max_bh, endpoint=True))
+        x = int(rng.integers(0, max(0, w - bw), endpoint=True))
+        y = int(rng.integers(0, max(0, h - bh), endpoint=True))
+        if y + bh > h or x + bw > w:
+            continue
+        block = arr[y:y + bh, x:x + bw].copy()
+        x_new = int(np.clip(x + rng.integers(-max_disp, max_disp, endpoint=True), 0, w - bw))
+        y_new = int(np.clip(y + rng.integers(-max_disp, max_disp, endpoint=True), 0, h - bh))
+        arr[y_new:y_new + bh, x_new:x_new + bw] = block
+    return Image.fromarray(arr)
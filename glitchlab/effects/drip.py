@@ -0,0 +1,70 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _luminance_above, _proxy_scale
+
+# Pixel per blocco di linee: meno di 2**24 run per blocco, cosi' id del run
+# e valore (8 bit bassi) stanno insieme in un uint32.
+_CHUNK_PIXELS = 1 << 24
+
+
+def _sort_runs_values(planes, mask):
+    """Ordina in ascendente, linea per linea, i valori dentro i run contigui
+    di `mask`, per tutti i canali — un np.sort per canale e blocco sulla
+    chiave (id run << 8) | valore, invece di un np.sort per run.
+
+    planes: (c, n, L) uint8 contiguo, modificato sul posto; mask: (n, L) bool,
+    comune ai canali."""
+    n, length = mask.shape
+    lines_per_chunk = max(1, _CHUNK_PIXELS // max(1, length))
+    for r0 in range(0, n, lines_per_chunk):
+        m = mask[r0:r0 + lines_per_chunk]
+        # inizio run: pixel nella maschera col precedente (sulla stessa linea) fuori
+        start = m.copy()
+        start[:, 1:] &= ~m[:, :-1]
+        # i run sono numerati in ordine di posizione: dopo il sort ogni run
+        # occupa di nuovo esattamente le sue posizioni, coi valori in ordine
+        run = (np.cumsum(start, dtype=np.uint32).reshape(m.shape)[m] - 1) << 8
+        if run.size == 0:
+            continue
+        for p in planes[:, r0:r0 + lines_per_chunk]:
+            p[m] = np.sort(run | p[m])
+    return planes
+
+
+def glitch_drip(img, soglia=0.4, separazione_rgb=0.5, asse=0.0, full_size=None):
+    """Pixel sort a stalattiti: segmenti contigui ordinati per luminosità + color bleed."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    mask = _luminance_above(arr, soglia * 255)
+
+    # Offset cromatico per canale: crea la separazione ciano/magenta
+    # R verso sinistra, G al centro, B verso destra (o su/giù per asse V)
+    offsets = [
+        int(-separazione_rgb * 12 * px_scale),   # R
+        0,                             # G
+        int(separazione_rgb * 12 * px_scale),   # B
+    ]
+
+    vertical = asse > 0.5
+
+    if not vertical:
+        # COLONNE: ordina dall'alto verso il basso (stalattiti verticali),
+        # ascendente = scuro in cima, chiaro in basso
+        planes = np.ascontiguousarray(arr.transpose(2, 1, 0))
+        mask = np.ascontiguousarray(mask.T)
+    else:
+        # RIGHE: ordina da sinistra a destra (stalattiti orizzontali)
+        planes = np.ascontiguousarray(arr.transpose(2, 0, 1))
+    _sort_runs_values(planes, mask)
+
+    # Il run ordinato dipende solo dalla colonna (riga) sorgente: il color
+    # split e' un gather delle linee gia' ordinate, spostate per canale
+    n = planes.shape[1]
+    out = np.empty_like(arr)
+    for ch in range(3):
+        src = np.clip(np.arange(n) + offsets[ch], 0, n - 1)
+        out[:, :, ch] = planes[ch][src] if vertical else planes[ch][src].T
+    return Image.fromarray(out)
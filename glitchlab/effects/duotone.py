@@ -0,0 +1,41 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _row_chunks
+from ..lut import apply_rgb_lut, rgb_lut
+
+
+def _hue_rgb(h):
+    h = h % 1.0
+    r = np.clip(abs(h * 6 - 3) - 1, 0, 1)
+    g = np.clip(2 - abs(h * 6 - 2), 0, 1)
+    b = np.clip(2 - abs(h * 6 - 4), 0, 1)
+    return np.array([r, g, b], dtype=np.float32) * 255
+
+
+def _duotone_pixels(arr, lum, colore1, colore2, blend):
+    """Duotone di `arr` (uint8 (h, w, 3)) con luminanza 0-1 `lum`."""
+    c1 = _hue_rgb(colore1)
+    c2 = _hue_rgb(colore2)
+    out = np.empty_like(arr)
+    for y0, y1 in _row_chunks(*lum.shape):
+        # float32 a blocchi di righe: c1 * (1 - t) + c2 * t, poi il blend
+        t = lum[y0:y1, :, None]
+        res = arr[y0:y1].astype(np.float32)
+        res *= 1 - blend
+        res += (c1 + (c2 - c1) * t) * blend
+        out[y0:y1] = np.clip(res, 0, 255, out=res)
+    return out
+
+
+def glitch_duotone(img, colore1=0.1, colore2=0.6, blend=0.8):
+    """Due colori hue-based: ombre e luci mappate su due tinte.
+    Passa dalla tabella RGB compilata (glitchlab.lut) quando conviene."""
+    an = analysis_for(img)
+    table = rgb_lut("duotone", (colore1, colore2, blend),
+                    lambda a: _duotone_pixels(a.rgb(), a.gray(), colore1, colore2, blend),
+                    img.size[0] * img.size[1])
+    if table is not None:
+        return apply_rgb_lut(an.rgb(), table)
+    return Image.fromarray(_duotone_pixels(an.rgb(), an.gray(), colore1, colore2, blend))
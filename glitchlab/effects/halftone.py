@@ -0,0 +1,183 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _box_blur, _proxy_scale
+
+# Angoli classici dei retini di stampa (gradi): C, M, Y, K
+_CMYK_ANGLES = (15.0, 75.0, 0.0, 45.0)
+
+# Righe di celle per blocco nel calcolo della copertura: i temporanei
+# (distanze, maschere) restano limitati anche a 48 MP
+_BLOCK_PIXELS = 1 << 21
+
+
+class _Screen:
+    """Griglia di celle quadrate di lato `cell`, ruotata di `angle` gradi
+    rispetto all'immagine (h, w). Le celle sono numerate per righe della
+    griglia (iv * nu + iu); il punto di ogni cella e' centrato a cell // 2 dal
+    suo angolo, come nel vecchio disegno cella per cella.
+
+    Tutto il lavoro avviene su una tela allineata alla griglia: a 0 gradi e'
+    l'immagine stessa, altrimenti l'immagine ruotata con una trasformazione
+    affine PIL (in C) — stesso motore e nessun costo Python per cella a
+    qualunque angolo."""
+
+    def __init__(self, h, w, cell, angle=0.0):
+        self.h, self.w, self.cell = h, w, cell
+        self.angle = angle % 360.0
+        if self.angle == 0.0:
+            ch, cw = h, w
+        else:
+            t = np.deg2rad(self.angle)
+            cos, sin = np.cos(t), np.sin(t)
+            xs, ys = np.array([0, w, 0, w]), np.array([0, 0, h, h])
+            us, vs = xs * cos + ys * sin, ys * cos - xs * sin
+            u0, v0 = np.floor(us.min()), np.floor(vs.min())
+            cw, ch = int(np.ceil(us.max() - u0)), int(np.ceil(vs.max() - v0))
+            # tela (U, V) -> immagine (x, y) e viceversa, per Image.transform
+            self._to_canvas = (cos, -sin, u0 * cos - v0 * sin, sin, cos, u0 * sin + v0 * cos)
+            self._to_image = (cos, sin, -u0, -sin, cos, -v0)
+        self.canvas = (ch, cw)
+        self.nv, self.nu = -(-ch // cell), -(-cw // cell)
+
+    def _box_sums(self, values):
+        """Somme per cella di values (h, w, k) via reshape (celle di bordo
+        parziali riempite di zeri: aggiungere 0.0 non cambia le somme)."""
+        ch, cw, k = values.shape
+        cell = self.cell
+        padded = np.zeros((self.nv * cell, self.nu * cell, k), dtype=values.dtype)
+        padded[:ch, :cw] = values
+        return padded.reshape(self.nv, cell, self.nu, cell, k).sum(axis=(1, 3))
+
+    def means(self, values):
+        """Media per cella di `values` (h, w, k) float32 -> (nv, nu, k) float32.
+        A 0 gradi e' un box-reduce via reshape che coincide bit per bit con
+        patch.mean() cella per cella. Ruotata: box blur di lato `cell`
+        sull'immagine, campionato al centro di ogni cella (riportato
+        sull'immagine e limitato ai bordi)."""
+        h, w, k = values.shape
+        cell = self.cell
+        if self.angle == 0.0:
+            rows = np.minimum(cell, h - np.arange(self.nv) * cell)
+            cols = np.minimum(cell, w - np.arange(self.nu) * cell)
+            counts = (rows[:, None] * cols[None, :]).astype(values.dtype)
+            return self._box_sums(values) / counts[..., None]
+        blurred = _box_blur(values, cell // 2)
+        cu = np.arange(self.nu) * cell + cell / 2
+        cv = np.arange(self.nv) * cell + cell / 2
+        a, b, c0, d, e, f0 = self._to_canvas
+        xs = a * cu[None, :] + b * cv[:, None] + c0
+        ys = d * cu[None, :] + e * cv[:, None] + f0
+        xs = np.clip(xs.astype(int), 0, w - 1)
+        ys = np.clip(ys.astype(int), 0, h - 1)
+        return blurred[ys, xs].astype(np.float32)
+
+    def owner(self, radius, ids=True):
+        """Per ogni pixel dell'immagine, indice della cella (iv * nu + iu) il
+        cui punto lo copre, -1 se nessuno; radius (nv, nu) interi, < 1 =
+        nessun punto. Con ids=False solo la maschera bool dei pixel coperti
+        (piu' leggera: basta per i retini CMYK). I punti grandi sconfinano nelle celle vicine: fra le 3x3
+        candidate vince l'ultima in ordine di griglia, come quando i punti
+        venivano disegnati uno dopo l'altro.
+
+        Sulla tela ogni cella vede le stesse distanze dal centro delle vicine:
+        per ogni vicina una tabella (cell, cell) confrontata per broadcast col
+        raggio della vicina, blocco per blocco di righe di celle."""
+        cell, c = self.cell, self.cell // 2
+        nv, nu = self.nv, self.nu
+        r2 = np.pad(np.where(radius >= 1, radius.astype(np.int64) ** 2, -1), 1, constant_values=-1)
+        cell_ids = np.pad(np.arange(nv * nu, dtype=np.int32).reshape(nv, nu), 1, constant_values=-1)
+        rmax = int(radius.max(initial=0))
+        # vicini raggiungibili: il centro della cella sopra/sinistra dista
+        # almeno cell - c dai pixel di questa, quello sotto/destra piu' di c
+        near = [d for d in (-1, 0, 1) if d == 0 or (rmax >= cell - c if d < 0 else rmax > c)]
+        p = np.arange(cell)
+        ch, cw = self.canvas
+        dtype = np.int32 if ids else bool
+        out = np.empty((ch, cw), dtype=dtype)
+        step = max(1, _BLOCK_PIXELS // (nu * cell * cell))
+        for v0 in range(0, nv, step):
+            v1 = min(nv, v0 + step)
+            block = np.full((v1 - v0, cell, nu, cell), -1 if ids else False, dtype=dtype)
+            for dv in near:
+                for du in near:
+                    d2 = (p[:, None] - c - dv * cell) ** 2 + (p[None, :] - c - du * cell) ** 2
+                    rr = r2[v0 + 1 + dv:v1 + 1 + dv, 1 + du:nu + 1 + du]
+                    hit = d2[None, :, None, :] <= rr[:, None, :, None]
+                    if ids:
+                        cells = cell_ids[v0 + 1 + dv:v1 + 1 + dv, 1 + du:nu + 1 + du]
+                        np.copyto(block, cells[:, None, :, None], where=hit)
+                    else:
+                        block |= hit
+            rows = block.reshape((v1 - v0) * cell, nu * cell)
+            out[v0 * cell:v1 * cell] = rows[:ch - v0 * cell, :cw]
+        if self.angle == 0.0:
+            return out
+        if ids:
+            img, fill = Image.fromarray(out, "I"), -1
+        else:
+            img, fill = Image.fromarray(out.view(np.uint8), "L"), 0
+        back = img.transform((self.w, self.h), Image.AFFINE, self._to_image, Image.NEAREST,
+                             fillcolor=fill)
+        return np.asarray(back) if ids else np.asarray(back).astype(bool)
+
+
+def _dot_radius(cell, level):
+    """Raggio dei punti per livello d'inchiostro per cella (0-1)."""
+    return ((cell / 2) * level * 1.8).astype(int)
+
+
+def glitch_halftone(img, dim_punto=0.4, sfondo_bianco=1.0, colore=0.7, angolo=0.0, cmyk=0.0,
+                    full_size=None):
+    """Retino tipografico: punti proporzionali alla luminosità.
+
+    angolo : 0-1 = rotazione del retino 0-90 gradi
+    cmyk   : > 0.5 = quattro retini C, M, Y, K agli angoli di stampa (15/75/0/45
+        gradi, ruotati di `angolo`); su sfondo nero tre retini di luce R, G, B.
+        `colore` vale solo per il retino singolo.
+    """
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.float32)
+    h, w, _ = arr.shape
+    cell = max(3, int((3 + 17 * dim_punto) * px_scale))
+    bg_val = 255.0 * sfondo_bianco
+    rotation = 90.0 * angolo
+
+    if cmyk > 0.5:
+        rgb = arr / 255.0
+        if sfondo_bianco > 0.5:
+            k = 1.0 - rgb.max(axis=2)
+            inv = np.where(k < 1.0, 1.0 / np.maximum(1.0 - k, 1e-6), 0.0)
+            levels = [(1.0 - rgb[..., ch] - k) * inv for ch in range(3)] + [k]
+            angles = _CMYK_ANGLES
+        else:
+            levels = [rgb[..., ch] for ch in range(3)]
+            angles = _CMYK_ANGLES[:3]
+        covered = []
+        for level, base in zip(levels, angles):
+            screen = _Screen(h, w, cell, base + rotation)
+            radius = _dot_radius(cell, screen.means(level[..., None])[..., 0])
+            covered.append(screen.owner(radius, ids=False))
+        out = np.full((h, w, 3), bg_val, dtype=np.float32)
+        for ch in range(3):
+            if sfondo_bianco > 0.5:
+                # inchiostri sottrattivi: C, M, Y tolgono R, G, B; K tutto
+                out[..., ch][covered[ch] | covered[3]] = 0.0
+            else:
+                out[..., ch][covered[ch]] = 255.0
+        return Image.fromarray(out.astype(np.uint8))
+
+    screen = _Screen(h, w, cell, rotation)
+    avg = screen.means(arr)
+    lum = (avg[..., 0]*0.299 + avg[..., 1]*0.587 + avg[..., 2]*0.114) / 255.0
+    radius = _dot_radius(cell, 1.0 - lum)
+    avg = avg.reshape(-1, 3)
+    if colore > 0.5:
+        palette = avg
+    else:
+        dot = [0, 0, 0] if sfondo_bianco > 0.5 else [255, 255, 255]
+        palette = np.tile(np.array(dot, dtype=np.float32), (len(avg), 1))
+    # ultima voce = sfondo (owner -1)
+    palette = np.vstack([palette, np.full((1, 3), bg_val, dtype=np.float32)])
+    return Image.fromarray(palette[screen.owner(radius)].astype(np.uint8))
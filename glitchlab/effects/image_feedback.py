@@ -0,0 +1,33 @@
+import numpy as np
+from PIL import Image
+
+
+def glitch_image_feedback(img, zoom=0.5, iterazioni=0.4, decay=0.5):
+    """Zoom ricorsivo con dissolvenza — effetto telecamera sul monitor."""
+    img = img.convert("RGB")
+    src = np.asarray(img)
+    h, w, _ = src.shape
+    n_iters = int(2 + 8 * iterazioni)
+    zoom_factor = 1.03 + 0.1 * zoom
+    fade = 0.4 + 0.5 * decay
+    accumulated = src.astype(np.float32)
+
+    for i in range(n_iters):
+        scale = zoom_factor ** (i + 1)
+        new_h = int(h / scale)
+        new_w = int(w / scale)
+        if new_h < 4 or new_w < 4:
+            break
+        y0 = (h - new_h) // 2
+        x0 = (w - new_w) // 2
+        layer = np.array(img.crop((x0, y0, x0 + new_w, y0 + new_h)).resize((w, h), Image.BILINEAR),
+                         dtype=np.float32)
+        weight = fade ** (i + 1)
+        # accumulated * (1 - weight * 0.25) + layer * weight * 0.25, in place
+        accumulated *= 1 - weight * 0.25
+        layer *= weight
+        layer *= 0.25
+        accumulated += layer
+        del layer
+
+    return Image.fromarray(np.clip(accumulated, 0, 255, out=accumulated).astype(np.uint8))
@@ -0,0 +1,84 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _proxy_scale
+from ..seeding import make_rng
+
+
+def glitch_klimt_mosaico(img, dim_tessere=0.5, doratura=0.6, irregolarita=0.4, seed=None,
+                         full_size=None):
+    """Klimt 'fase dorata': mosaico di tessere irregolari (Voronoi su griglia
+    jittered, ricerca vettoriale sui 9 vicini di griglia -> veloce anche su
+    foto grandi) colorate col tono medio reale della zona ma spinte verso
+    una palette oro/bronzo/smeraldo; bordi scuri fra tessera e tessera;
+    luccichio metallico per-tessera per simulare la foglia oro.
+
+    dim_tessere   : 0-1, dimensione media delle tessere
+    doratura      : 0-1, quanto il colore viene spinto verso la palette oro/Klimt
+    irregolarita  : 0-1, quanto i centri delle tessere sono jitterati (organicita')
+    seed          : seed (o np.random.Generator) di jitter e luccichio; None = seed fisso 11
+    """
+    orig_w, orig_h = img.size
+    px_scale = _proxy_scale(img, full_size, max_dim=1400)
+    rgb = analysis_for(img).work(1400).rgb().astype(np.float32)
+    h, w = rgb.shape[:2]
+
+    cell = max(6, round((10 + dim_tessere * 34) * px_scale))
+    jitter_amt = irregolarita * cell * 0.42
+
+    rows = int(np.ceil(h / cell)) + 2
+    cols = int(np.ceil(w / cell)) + 2
+    rng = make_rng(seed, default=11)
+    base_gy = (np.arange(rows) - 1) * cell
+    base_gx = (np.arange(cols) - 1) * cell
+    gcy, gcx = np.meshgrid(base_gy, base_gx, indexing="ij")
+    gcy = gcy + rng.uniform(-jitter_amt, jitter_amt, size=gcy.shape)
+    gcx = gcx + rng.uniform(-jitter_amt, jitter_amt, size=gcx.shape)
+
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    row_i = np.floor(yy / cell).astype(np.int32) + 1
+    col_i = np.floor(xx / cell).astype(np.int32) + 1
+
+    best_d = np.full((h, w), 1e18, dtype=np.float32)
+    best_id = np.zeros((h, w), dtype=np.int32)
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            rr = np.clip(row_i + dr, 0, rows - 1)
+            cc = np.clip(col_i + dc, 0, cols - 1)
+            cx = gcx[rr, cc]
+            cy = gcy[rr, cc]
+            d = (xx - cx) ** 2 + (yy - cy) ** 2
+            mask = d < best_d
+            best_d = np.where(mask, d, best_d)
+            best_id = np.where(mask, rr * cols + cc, best_id)
+
+    n_ids = rows * cols
+    ids_flat = best_id.ravel()
+    counts = np.bincount(ids_flat, minlength=n_ids).astype(np.float32)
+    counts_safe = np.maximum(counts, 1)
+    mean_color = np.zeros((n_ids, 3), dtype=np.float32)
+    for c in range(3):
+        sums = np.bincount(ids_flat, weights=rgb[..., c].ravel(), minlength=n_ids)
+        mean_color[:, c] = sums / counts_safe
+
+    GOLD_PALETTE = np.array([
+        [201, 162, 39], [176, 124, 33], [222, 190, 90],
+        [120, 40, 40], [30, 90, 70], [15, 15, 18],
+    ], dtype=np.float32)
+    lum = mean_color[:, 0]*0.299 + mean_color[:, 1]*0.587 + mean_color[:, 2]*0.114
+    gold_idx = np.clip((lum/255.0 * (len(GOLD_PALETTE)-1)).astype(np.int32), 0, len(GOLD_PALETTE)-1)
+    gold = GOLD_PALETTE[gold_idx]
+    glint = rng.uniform(0.85, 1.18, size=n_ids).astype(np.float32)[:, None]
+    tess_color = (mean_color*(1-doratura) + gold*doratura) * glint
+
+    out = tess_color[best_id]
+
+    border = (np.roll(best_id, 1, axis=0) != best_id) | (np.roll(best_id, 1, axis=1) != best_id)
+    out[border] = out[border] * 0.25
+
+    out = np.clip(out, 0, 255).astype(np.uint8)
+    result = Image.fromarray(out, mode="RGB")
+    if result.size != (orig_w, orig_h):
+        result = result.resize((orig_w, orig_h), Image.LANCZOS)
+    return result
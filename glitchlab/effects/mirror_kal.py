@@ -0,0 +1,29 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _grid, _row_chunks
+
+
+def glitch_mirror_kaleidoscope(img, specchi=0.3, rotazione=0.0, zoom=0.5):
+    """4/6/8 specchi radiali — simmetria pura."""
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    n_m = 4 if specchi < 0.33 else (6 if specchi < 0.66 else 8)
+    cy, cx = h / 2, w / 2
+    ys, xs = _grid(h, w)
+    dx = xs - cx
+    seg = np.pi / n_m
+    scale = 0.4 + 0.8 * zoom
+    out = np.empty_like(arr)
+    # mappa e gather a blocchi di righe, coordinate float32 e indici int32
+    for y0, y1 in _row_chunks(h, w):
+        dy = ys[y0:y1] - cy
+        angles = np.arctan2(dy, dx) + rotazione * np.pi
+        radii = np.sqrt(dx**2 + dy**2)
+        angles_mod = angles % (2 * seg)
+        angles_mod = np.where(angles_mod > seg, 2 * seg - angles_mod, angles_mod)
+        src_x = np.clip((cx + radii * np.cos(angles_mod) * scale).astype(np.int32), 0, w - 1)
+        src_y = np.clip((cy + radii * np.sin(angles_mod) * scale).astype(np.int32), 0, h - 1)
+        out[y0:y1] = arr[src_y, src_x]
+    return Image.fromarray(out)
@@ -0,0 +1,37 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _grid, _proxy_scale, _row_chunks
+
+
+def glitch_moire(img, freq1=0.4, freq2=0.6, angolo=0.3, full_size=None):
+    """Due griglie sovrapposte: interferenza ottica vibrante."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    src = np.asarray(img)
+    h, w, _ = src.shape
+    ys, xs = _grid(h, w)
+    a = float(angolo) * np.pi
+    f1 = (0.03 + 0.2 * float(freq1)) / px_scale
+    f2 = (0.025 + 0.18 * float(freq2)) / px_scale
+    # coefficienti come float Python (np.cos ritorna un float64 NumPy, che
+    # promuoverebbe i piani a float64): le fasi restano float32
+    k1x, k1y = float(f1 * np.cos(a)), float(f1 * np.sin(a))
+    k2x, k2y = float(f2 * np.cos(a + 0.25)), float(f2 * np.sin(a + 0.25))
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    for y0, y1 in _row_chunks(h, w):
+        moire = np.sin(xs * k1x + ys[y0:y1] * k1y)
+        moire *= np.sin(xs * k2x + ys[y0:y1] * k2y)
+        moire *= 0.5
+        moire += 0.5
+        np.nan_to_num(moire, copy=False, nan=0.5, posinf=1.0, neginf=0.0)
+        for ch in range(3):
+            # arr * m + (255 - arr) * (1 - m) = 255 - arr + (2 * arr - 255) * m
+            c = src[y0:y1, :, ch].astype(np.float32)
+            v = 2 * c - 255
+            v *= moire
+            v += 255
+            v -= c
+            np.nan_to_num(v, copy=False, nan=0.0, posinf=255.0, neginf=0.0)
+            out[y0:y1, :, ch] = np.clip(v, 0, 255, out=v)
+    return Image.fromarray(out)
@@ -0,0 +1,187 @@
+import random
+
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+
+
+def glitch_mondrian(img, complessita=0.55, spessore=0.5, vivacita=0.6, variation_seed=None, full_size=None):
+    """Mondrian / De Stijl 'puro': la STRUTTURA della griglia (dove tagliare)
+    e' guidata dalla foto — partizione ricorsiva content-aware su una copia
+    ridotta e sfocata, che elimina il rumore ad alta frequenza e produce
+    composizioni diverse a seconda della foto caricata. Il COLORE di ogni
+    cella pero' non deriva mai dalla foto: viene assegnato dalla palette
+    classica De Stijl (bianco predominante, blocchi rosso/giallo/blu, rari
+    accenti neri) con probabilita' pesate, come in un vero Mondrian — non un
+    tentativo di 'tradurre' i colori reali della foto.
+
+    complessita     : 0-1, profondita' massima di ricorsione (piu' celle)
+    spessore        : 0-1, spessore delle linee nere
+    vivacita        : 0-1, quanta parte della composizione resta bianca (basso)
+        o si riempie di rosso/giallo/blu (alto)
+    variation_seed  : opzionale. Se None (default, uso normale) la scelta del
+        taglio e la palette sono deterministiche per la stessa foto/parametri.
+        Se specificato (usato dal generatore di varianti) sceglie fra i tagli
+        migliori con probabilita' pesata sulla loro forza, e usa un'assegnazione
+        colore diversa — cosi' ogni variante ha sia composizione che palette
+        genuinamente diverse, non solo lievi sfumature.
+    full_size       : opzionale, dimensioni della foto originale quando si
+        lavora su un proxy ridotto (anteprima Live): il seed colore usa
+        quelle, cosi' anteprima e download hanno la stessa palette.
+    """
+    w, h = img.size
+
+    # analisi su versione ridotta + sfocata: elimina il rumore fotografico
+    # che altrimenti farebbe scegliere tagli a caso pixel-per-pixel
+    analysis = analysis_for(img).work(500)
+    ah, aw = analysis.rgb().shape[:2]
+    blur_r = max(1, round(min(ah, aw) * 0.015))
+    lum_a = analysis.blur("luminance", blur_r)
+
+    max_depth = 2 + round(complessita * 5)
+    line_px = max(1, int(round(1 + spessore * (min(w, h) * 0.02))))
+
+    WHITE = np.array([246, 244, 238])
+    RED = np.array([196, 30, 30])
+    YELLOW = np.array([232, 190, 20])
+    BLUE = np.array([25, 55, 150])
+    BLACK = np.array([18, 18, 18])
+
+    # palette dei colori assegnati per probabilita', NON dal contenuto
+    # della foto: vivacita' bassa -> per lo piu' bianco (De Stijl classico,
+    # pochi accenti colorati); vivacita' alta -> composizione piu' densa
+    # di rosso/giallo/blu. Rosso/giallo/blu hanno sempre la STESSA
+    # probabilita' fra loro, cosi' nessuno dei tre e' strutturalmente
+    # sfavorito.
+    p_white = max(0.15, 0.75 - 0.55 * vivacita)
+    p_black = 0.08
+    p_each_color = max(0.0, (1.0 - p_white - p_black) / 3.0)
+
+    # seed per l'assegnazione colore: se non specificato un variation_seed
+    # (uso normale), lo derivo dai parametri stessi -> stessa foto e stessi
+    # parametri producono sempre la stessa identica composizione colore,
+    # deterministica. Con un variation_seed esplicito (varianti) i colori
+    # cambiano assieme alla struttura.
+    if variation_seed is not None:
+        color_seed = variation_seed
+    else:
+        color_seed = hash((round(complessita, 4), round(spessore, 4),
+                            round(vivacita, 4), *(full_size or (w, h)))) & 0xFFFFFFFF
+    color_rng = random.Random(color_seed)
+
+    def pick_color():
+        r = color_rng.random()
+        if r < p_white:
+            return WHITE
+        r -= p_white
+        if r < p_black:
+            return BLACK
+        r -= p_black
+        if r < p_each_color:
+            return RED
+        r -= p_each_color
+        if r < p_each_color:
+            return YELLOW
+        return BLUE
+
+    variation_rng = random.Random(variation_seed) if variation_seed is not None else None
+
+    cuts_a = []   # tagli in coordinate dell'immagine di analisi (ridotta)
+    leaves_a = []  # rettangoli foglia in coordinate di analisi
+
+    def best_split(x0, y0, x1, y1, parent_axis=None):
+        sub = lum_a[y0:y1, x0:x1]
+        sh, sw = sub.shape
+        candidates = []  # (axis, pos, strength)
+        margin_w = max(5, round(sw * 0.10))
+        margin_h = max(5, round(sh * 0.10))
+        if sw > 10:
+            col_mean = sub.mean(axis=0)
+            grad = np.abs(np.diff(col_mean))
+            if grad.size > 0:
+                k = min(3, grad.size)
+                for idx in np.argpartition(grad, -k)[-k:]:
+                    pos = x0 + max(margin_w, min(sw - margin_w, int(idx) + 1))
+                    candidates.append(("v", pos, float(grad[idx])))
+        if sh > 10:
+            row_mean = sub.mean(axis=1)
+            gradr = np.abs(np.diff(row_mean))
+            if gradr.size > 0:
+                k = min(3, gradr.size)
+                for idx in np.argpartition(gradr, -k)[-k:]:
+                    pos = y0 + max(margin_h, min(sh - margin_h, int(idx) + 1))
+                    candidates.append(("h", pos, float(gradr[idx])))
+        if not candidates:
+            return ("v", x0 + sw // 2) if sw >= sh else ("h", y0 + sh // 2)
+        # penalita' se il taglio e' nella STESSA direzione del genitore:
+        # senza questo, la ricorsione tende a tagliare sempre nello stesso
+        # verso (es. solo orizzontale) producendo tante strisce sottili
+        # impilate invece di una vera griglia di rettangoli come nel
+        # Mondrian classico. La penalita' scoraggia ma non vieta — se una
+        # direzione e' nettamente piu' forte vince comunque.
+        if parent_axis is not None:
+            candidates = [(a, p, s * (0.5 if a == parent_axis else 1.0)) for a, p, s in candidates]
+        if variation_rng is None:
+            axis, pos, _ = max(candidates, key=lambda c: c[2])
+            return axis, pos
+        # scelta pesata sulla forza del gradiente: i tagli piu' netti
+        # restano i piu' probabili, ma non vince sempre lo stesso identico
+        # taglio -> varianti con composizioni geometriche diverse.
+        weights = [c[2] ** 2 + 1e-6 for c in candidates]
+        r = variation_rng.random() * sum(weights)
+        acc = 0.0
+        for c, wgt in zip(candidates, weights):
+            acc += wgt
+            if r <= acc:
+                return c[0], c[1]
+        return candidates[-1][0], candidates[-1][1]
+
+    def recurse(x0, y0, x1, y1, depth, parent_axis=None):
+        w_, h_ = x1 - x0, y1 - y0
+        min_size = min(aw, ah) * 0.09
+        if depth >= max_depth or w_ < min_size or h_ < min_size:
+            leaves_a.append((x0, y0, x1, y1))
+            return
+        axis, pos = best_split(x0, y0, x1, y1, parent_axis)
+        if axis == "v":
+            cuts_a.append((pos, y0, pos, y1))
+            recurse(x0, y0, pos, y1, depth + 1, axis)
+            recurse(pos, y0, x1, y1, depth + 1, axis)
+        else:
+            cuts_a.append((x0, pos, x1, pos))
+            recurse(x0, y0, x1, pos, depth + 1, axis)
+            recurse(x0, pos, x1, y1, depth + 1, axis)
+
+    recurse(0, 0, aw, ah, 0)
+
+    # riscalo tagli e foglie sulla risoluzione piena
+    sx, sy = w / aw, h / ah
+
+    out = np.full((h, w, 3), 250, dtype=np.float32)
+    for (x0, y0, x1, y1) in leaves_a:
+        X0, Y0 = int(round(x0*sx)), int(round(y0*sy))
+        X1, Y1 = int(round(x1*sx)), int(round(y1*sy))
+        X0, Y0 = min(X0, w - 1), min(Y0, h - 1)      # mai oltre l'ultimo pixel valido
+        X1, Y1 = max(X1, X0 + 1), max(Y1, Y0 + 1)    # cella sempre non-vuota
+        X1, Y1 = min(X1, w), min(Y1, h)               # mai oltre il bordo immagine
+        out[Y0:Y1, X0:X1] = pick_color()
+
+    result = out.astype(np.uint8).copy()
+    for (x0, y0, x1, y1) in cuts_a:
+        if x0 == x1:
+            X = int(round(x0*sx))
+            Y0, Y1 = int(round(y0*sy)), int(round(y1*sy))
+            xs = slice(max(0, X - line_px // 2), min(w, X + line_px - line_px // 2))
+            result[Y0:Y1, xs] = 15
+        else:
+            Y = int(round(y0*sy))
+            X0, X1 = int(round(x0*sx)), int(round(x1*sx))
+            ys = slice(max(0, Y - line_px // 2), min(h, Y + line_px - line_px // 2))
+            result[ys, X0:X1] = 15
+    result[0:line_px, :] = 15
+    result[-line_px:, :] = 15
+    result[:, 0:line_px] = 15
+    result[:, -line_px:] = 15
+
+    return Image.fromarray(result, mode="RGB")
@@ -0,0 +1,62 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _proxy_scale
+
+
+def glitch_munch_onde(img, ampiezza_onde=0.5, frequenza=0.5, intensita_colore=0.5, full_size=None):
+    """Munch 'L'Urlo': campo di flusso concentrico (onde multi-ottava attorno
+    a un centro fuori quadro) che deforma i pixel lungo linee curve tangenti;
+    remap colore verso la palette espressionista (blu/nero profondi nelle
+    ombre, arancio/rosso bruciato nelle luci); banding di luminosita'
+    visibile anche sui fondali piatti per le pennellate concentriche.
+
+    ampiezza_onde     : 0-1, intensita' della deformazione a onde concentriche
+    frequenza         : 0-1, quante onde (frequenza spaziale delle bande)
+    intensita_colore  : 0-1, quanto il colore viene spinto verso la palette Munch
+    """
+    orig_w, orig_h = img.size
+    px_scale = _proxy_scale(img, full_size, max_dim=1400)
+    rgb = analysis_for(img).work(1400).rgb().astype(np.float32)
+    h, w = rgb.shape[:2]
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+
+    ccx, ccy = w * 0.5, -h * 0.35
+    dx, dy = xx - ccx, yy - ccy
+    r = np.sqrt(dx*dx + dy*dy) + 1e-6
+    base_angle = np.arctan2(dy, dx)
+    tx, ty = -dy / r, dx / r
+
+    freq = (0.015 + frequenza * 0.05) / px_scale
+    amp = ampiezza_onde * (8 + frequenza * 10) * px_scale
+    wave = (np.sin(r * freq) * 1.0
+            + np.sin(r * freq * 2.3 + 1.7) * 0.5
+            + np.sin(base_angle * 6.0 + r * freq * 0.5) * 0.35)
+    disp = wave * amp
+
+    src_x = np.clip(np.round(xx + tx * disp).astype(np.int32), 0, w - 1)
+    src_y = np.clip(np.round(yy + ty * disp).astype(np.int32), 0, h - 1)
+    warped = rgb[src_y, src_x]
+
+    lum = (warped[..., 0]*0.299 + warped[..., 1]*0.587 + warped[..., 2]*0.114) / 255.0
+    DEEP = np.array([15, 25, 60], dtype=np.float32)
+    MID = np.array([140, 60, 40], dtype=np.float32)
+    HOT = np.array([235, 110, 30], dtype=np.float32)
+    t = lum[..., None]
+    munch_col = np.where(t < 0.5,
+                          DEEP*(1-t*2) + MID*(t*2),
+                          MID*(1-(t-0.5)*2) + HOT*((t-0.5)*2))
+
+    mean = warped.mean(axis=-1, keepdims=True)
+    desat = mean + (warped - mean) * 0.4
+    out = desat * (1 - intensita_colore) + munch_col * intensita_colore
+
+    wave_norm = wave / 1.85
+    out = out * (1 + 0.14 * ampiezza_onde * wave_norm[..., None])
+
+    out = np.clip(out, 0, 255).astype(np.uint8)
+    result = Image.fromarray(out, mode="RGB")
+    if result.size != (orig_w, orig_h):
+        result = result.resize((orig_w, orig_h), Image.LANCZOS)
+    return result
@@ -0,0 +1,64 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _proxy_scale, _row_chunks
+
+
+# colore del neon (slider "Colore")
+_NEON_PALETTES = [
+    [0, 255, 255],    # ciano
+    [255, 0, 255],    # magenta
+    [0, 255, 0],      # verde
+    [255, 200, 0],    # giallo
+    [255, 80, 0],     # arancio
+]
+
+
+def _glow_radius(ampiezza, px_scale=1.0):
+    """Raggio del blur grande: anche il raggio di vicinato dell'effetto."""
+    return max(2, int((1 + 8 * ampiezza) * px_scale))
+
+
+def _neon_edges(an, px_scale, gw):
+    """|blur piccolo - blur grande| medio sui canali, float32 (h, w), non
+    normalizzato: va diviso per il massimo sull'intera foto."""
+    blur_s = np.asarray(an.gaussian(px_scale))
+    blur_l = np.asarray(an.gaussian(gw))
+    h, w = blur_s.shape[:2]
+    # a blocchi di righe
+    edges = np.empty((h, w), dtype=np.float32)
+    for y0, y1 in _row_chunks(h, w):
+        diff = blur_s[y0:y1].astype(np.float32)
+        diff -= blur_l[y0:y1]
+        np.abs(diff, out=diff)
+        edges[y0:y1] = diff.mean(axis=2)
+    return edges
+
+
+def _neon_compose(arr, edges, edges_max, soglia, colore):
+    """Sfondo scuro + bordi neon: `edges` (modificato sul posto) normalizzato
+    con `edges_max`, il massimo dei bordi sull'intera foto."""
+    edges /= edges_max + 1e-8
+    edges -= soglia * 0.1
+    edges *= 5
+    intensity = np.clip(edges, 0, 1, out=edges)
+    neon = np.array(_NEON_PALETTES[int(colore * (len(_NEON_PALETTES) - 0.01))], dtype=np.float32)
+    h, w = intensity.shape
+    out = np.empty_like(arr)
+    for y0, y1 in _row_chunks(h, w):
+        t = intensity[y0:y1, :, None]
+        res = arr[y0:y1].astype(np.float32)
+        res *= 0.15
+        res *= 1 - t
+        res += neon * t
+        out[y0:y1] = np.clip(res, 0, 255, out=res)
+    return out
+
+
+def glitch_neon_glow(img, soglia=0.5, ampiezza=0.5, colore=0.2, full_size=None):
+    """Bordi luminosi neon su sfondo scuro — estetica cyberpunk."""
+    px_scale = _proxy_scale(img, full_size)
+    an = analysis_for(img)
+    edges = _neon_edges(an, px_scale, _glow_radius(ampiezza, px_scale))
+    return Image.fromarray(_neon_compose(an.rgb(), edges, edges.max(), soglia, colore))
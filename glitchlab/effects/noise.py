@@ -0,0 +1,43 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _shift_lines
+from ..seeding import make_rng
+
+
+def glitch_noise(img, intensita=1.0, copertura=1.0, tipo=0.0, seed=None, full_size=None):
+    """Rumore digitale: 0=bande, 0.5=pixel sparsi, 1=onde.
+
+    seed : seed (o np.random.Generator) del rumore; None = seed fisso 0, stessi
+        valori -> stesso risultato.
+    """
+    px_scale = _proxy_scale(img, full_size)
+    rng = make_rng(seed)
+    img = img.convert("RGB")
+    # int16 basta: base arriva a 210 (intensita' 2), quindi anche 25 bande
+    # sovrapposte restano nel range: 255 + 25 x 210 < 32767
+    arr = np.array(img).astype(np.int16)
+    h, w, _ = arr.shape
+    base = int(30 + 90 * intensita)
+
+    if tipo < 0.33:
+        # Bande orizzontali: rumore solo per le righe della banda
+        n_bands = int(5 + 20 * copertura)
+        for _ in range(n_bands):
+            sy = int(rng.integers(0, h))
+            ey = min(sy + max(1, int((2 + 20 * intensita) * px_scale)), h)
+            arr[sy:ey] += rng.integers(-base, base, (ey - sy, w, 3), dtype=np.int16)
+    elif tipo < 0.66:
+        # Pixel sparsi: una sola scrittura scatter
+        num_pix = int(w * h * 0.05 * copertura)
+        ys = rng.integers(0, h, num_pix)
+        xs = rng.integers(0, w, num_pix)
+        arr[ys, xs] = rng.integers(0, 256, (num_pix, 3), dtype=np.int16)
+    else:
+        # Onde di rumore
+        ys = np.arange(0, h, max(1, int(h * (1 - copertura) * 0.5 + 1)))
+        ws = (base * 0.8 * np.sin(ys * 0.15 / px_scale) * px_scale).astype(int)
+        arr[ys] += rng.integers(-base // 2, base // 2, (len(ys), w, 3), dtype=np.int16)
+        arr[ys] = _shift_lines(arr[ys], ws)
+
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
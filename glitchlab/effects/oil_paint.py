@@ -0,0 +1,68 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _proxy_scale
+
+
+def glitch_oil_paint(img, raggio=0.4, livelli=0.5, blend=0.7, full_size=None):
+    """Pennellate Kuwahara vettoriale: ogni pixel prende il colore del quadrante più omogeneo.
+    Le finestre scorrevoli (sliding_window_view) sono pesanti su foto reali ad
+    alta risoluzione: l'elaborazione avviene su una copia ridotta e il
+    risultato viene poi riportato alla dimensione originale (da 30s+ a
+    pochi secondi su una foto da alcuni megapixel, senza perdita percepibile
+    dato che l'effetto pittorico e' comunque a bassa frequenza)."""
+    orig_w, orig_h = img.size
+    px_scale = _proxy_scale(img, full_size, max_dim=1200)
+    arr = analysis_for(img).work(1200).rgb().astype(np.float32)
+    h, w, _ = arr.shape
+    r = max(2, int((2 + 8 * raggio) * px_scale))
+
+    # Kuwahara vettoriale via summed-area table (SAT): mean/var di ogni
+    # quadrante calcolati con 4 sottrazioni per pixel, O(h*w) totale.
+    # Molto piu' veloce di sliding_window_view + var/mean (che iterano
+    # su memoria non contigua ed erano il vero collo di bottiglia).
+    pad = r
+    padded = np.pad(arr, ((pad, pad), (pad, pad), (0, 0)), mode='edge')
+    lum_pad = (padded[:, :, 0]*0.299 + padded[:, :, 1]*0.587 + padded[:, :, 2]*0.114)
+
+    def sat(a):
+        c = np.cumsum(np.cumsum(a, axis=0), axis=1)
+        pad_shape = [(1, 0), (1, 0)] + [(0, 0)] * (a.ndim - 2)
+        return np.pad(c, pad_shape, mode="constant")
+
+    I_lum = sat(lum_pad)
+    I_lum_sq = sat(lum_pad * lum_pad)
+    I_col = sat(padded)   # (Hpad+1, Wpad+1, 3)
+
+    def box_sum(I, soy, sox):
+        t1 = I[soy + r:soy + r + h, sox + r:sox + r + w]
+        t2 = I[soy:soy + h, sox + r:sox + r + w]
+        t3 = I[soy + r:soy + r + h, sox:sox + w]
+        t4 = I[soy:soy + h, sox:sox + w]
+        return t1 - t2 - t3 + t4
+
+    best_var = np.full((h, w), np.inf, dtype=np.float32)
+    out = np.zeros_like(arr)
+    area = float(r * r)
+
+    for (soy, sox) in [(0, 0), (0, r), (r, 0), (r, r)]:   # TL, TR, BL, BR
+        s_lum = box_sum(I_lum, soy, sox)
+        s_lum_sq = box_sum(I_lum_sq, soy, sox)
+        mean_lum = s_lum / area
+        var = s_lum_sq / area - mean_lum * mean_lum
+        mean_col = box_sum(I_col, soy, sox) / area   # (h, w, 3)
+
+        mask = var < best_var
+        best_var[mask] = var[mask]
+        out[mask] = mean_col[mask]
+
+    # Posterizzazione finale per accentuare l'effetto pittorico
+    lev = max(2, int(2 + 6 * livelli))
+    step = 256.0 / lev
+    out_post = (np.floor(out / step) * step).clip(0, 255)
+    result = arr * (1 - blend) + out_post * blend
+    result_img = Image.fromarray(result.astype(np.uint8))
+    if result_img.size != (orig_w, orig_h):
+        result_img = result_img.resize((orig_w, orig_h), Image.LANCZOS)
+    return result_img
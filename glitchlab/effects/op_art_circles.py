@@ -0,0 +1,35 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _grid, _proxy_scale
+
+
+def glitch_op_art_circles(img, frequenza=0.5, contrasto=0.6, blend=0.5, full_size=None):
+    """Cerchi concentrici che invertono l'immagine — Op Art ipnotica."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.float32)
+    h, w, _ = arr.shape
+    cy, cx = h / 2, w / 2
+    ys, xs = _grid(h, w)
+    # onda e blend in float32, in place: un solo piano oltre alla foto
+    wave = np.hypot(xs - cx, ys - cy)
+    wave *= (0.03 + 0.2 * frequenza) / px_scale
+    np.sin(wave, out=wave)
+    wave *= 0.5 * blend
+    wave += 0.5 * blend
+    for ch in range(3):
+        # arr * (1 - bw) + (255 - arr) * bw = arr + bw * (255 - 2 * arr)
+        c = arr[..., ch]
+        inv = 255 - 2 * c
+        inv *= wave
+        c += inv
+    del wave, inv
+    # Boost contrasto
+    mean = arr.mean()
+    arr -= mean
+    arr *= 1 + contrasto
+    arr += mean
+    np.clip(arr, 0, 255, out=arr)
+    np.nan_to_num(arr, copy=False, nan=0.0, posinf=255.0, neginf=0.0)
+    return Image.fromarray(arr.astype(np.uint8))
@@ -0,0 +1,121 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _luminance_above
+
+# Chiavi di ordinamento selezionabili (slider "Chiave"), nell'ordine dello slider
+SORT_KEYS = ("lum", "hue", "sat", "r", "g", "b")
+
+# Righe elaborate per blocco: gli array di indici (int64 per pixel) restano
+# contenuti anche su foto da decine di megapixel.
+_CHUNK_PIXELS = 1 << 22
+
+
+def _luminance64(pix):
+    """Luminanza float64 di pixel (n, 3) uint8, con le stesse operazioni di
+    ImageAnalysis.luminance(np.float64)."""
+    f = pix.astype(np.float64)
+    return f[:, 0]*0.299 + f[:, 1]*0.587 + f[:, 2]*0.114
+
+
+def _sort_runs(pix, key, mask, max_span, key_bits, tie_lum=False):
+    """Ordina per `key`, riga per riga, i run contigui di `mask` spezzati ogni
+    max_span pixel — tutti i segmenti insieme con un unico argsort sulla
+    chiave composta (id segmento << key_bits) | key invece di un argsort
+    per segmento.
+
+    pix: (n, L, 3) uint8; key: (n, L) interi in [0, 2**key_bits); mask: (n, L)
+    bool. Ritorna un nuovo array come pix. Con tie_lum (key ha lo stesso
+    ordine della luminanza) i segmenti che contengono pari merito su pixel
+    diversi vengono riordinati con np.argsort della luminanza float come
+    faceva il vecchio loop: l'ordine dei pari merito di argsort non e'
+    stabile (dipende dall'implementazione), cosi' il risultato resta identico
+    bit per bit. La luminanza si calcola solo sui pixel di quei segmenti.
+    Senza tie_lum i pari merito restano nell'ordine originale (sort stabile)."""
+    n, length = mask.shape
+    out = pix.copy()
+    rows_per_chunk = max(1, _CHUNK_PIXELS // max(1, length))
+    for r0 in range(0, n, rows_per_chunk):
+        r1 = min(n, r0 + rows_per_chunk)
+        # colonna False in coda: i run non attraversano mai il bordo di riga
+        m = np.zeros((r1 - r0, length + 1), dtype=bool)
+        m[:, :length] = mask[r0:r1]
+        flat = m.ravel()
+        pos = np.flatnonzero(flat)
+        if pos.size == 0:
+            continue
+        run_start = np.flatnonzero(np.diff(flat, prepend=False) & flat)
+        run_id = np.searchsorted(run_start, pos, side="right") - 1
+        seg_start = (pos - run_start[run_id]) % max_span == 0
+        seg = np.cumsum(seg_start) - 1
+
+        idx = (pos // (length + 1)) * length + pos % (length + 1)
+        src = pix[r0:r1].reshape(-1, 3)
+        k = key[r0:r1].ravel()[idx].astype(np.int64)
+        composite = (seg << key_bits) | k
+        order = np.argsort(composite, kind=None if tie_lum else "stable")
+        dst = out[r0:r1].reshape(-1, 3)
+        dst[idx] = src[idx[order]]
+
+        if tie_lum:
+            sc, sp = composite[order], src[idx[order]]
+            tie = (sc[1:] == sc[:-1]) & (sp[1:] != sp[:-1]).any(axis=1)
+            if tie.any():
+                bounds = np.append(np.flatnonzero(seg_start), pos.size)
+                for s in np.unique(seg[order][1:][tie]):
+                    a, b = bounds[s], bounds[s + 1]
+                    seg_pix = src[idx[a:b]]
+                    dst[idx[a:b]] = seg_pix[np.argsort(_luminance64(seg_pix))]
+    return out
+
+
+def glitch_pixel_sort(img, soglia=0.5, asse=0.0, span_max=1.0, chiave=0.0, intervalli=0.0):
+    """Ordina pixel per luminosità in segmenti contigui — colature nette.
+
+    chiave     : 0-1, cosa ordina i segmenti: luminosita', tonalita', saturazione, R, G o B
+    intervalli : 0 = segmenti dove la luminosita' supera la soglia; 1 = segmenti
+        fra un bordo e l'altro (mappa Sobel), soglia alta = meno pixel ordinati
+    """
+    an = analysis_for(img)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    max_span = max(4, int(span_max * max(h, w) * 0.8))
+
+    if intervalli > 0.5:
+        gx, gy = an.sobel()
+        edge = np.hypot(gx, gy) / (4 * np.sqrt(2))
+        mask = edge < (1.0 - soglia) * 0.5
+    else:
+        mask = _luminance_above(arr, soglia * 255)
+
+    sort_key = SORT_KEYS[int(chiave * (len(SORT_KEYS) - 0.01))]
+    tie_lum = sort_key == "lum"
+    if tie_lum:
+        # 299r + 587g + 114b: stesso ordine della luminanza float (somme intere
+        # diverse distano almeno 0.001), ma ordinabile come intero; i pari
+        # merito vengono risolti sulla luminanza float come faceva argsort.
+        # Costruita canale per canale in int32, senza la copia RGB int32
+        key, key_bits = arr[..., 0].astype(np.int32), 18
+        key *= 299
+        for ch, k in ((1, 587), (2, 114)):
+            c = arr[..., ch].astype(np.int32)
+            c *= k
+            key += c
+        del c
+    elif sort_key in ("hue", "sat"):
+        key, key_bits = np.asarray(img.convert("HSV"))[..., 0 if sort_key == "hue" else 1], 8
+    else:
+        key, key_bits = arr[..., "rgb".index(sort_key)], 8
+
+    if asse < 0.5:
+        # Sort orizzontale per righe
+        out = _sort_runs(arr, key, mask, max_span, key_bits, tie_lum)
+    else:
+        # Sort verticale per colonne
+        def cols(a):
+            return np.ascontiguousarray(np.swapaxes(a, 0, 1))
+        out = np.swapaxes(_sort_runs(cols(arr), cols(key), cols(mask), max_span, key_bits,
+                                     tie_lum), 0, 1)
+    return Image.fromarray(np.ascontiguousarray(out))
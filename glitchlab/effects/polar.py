@@ -0,0 +1,24 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _grid, _row_chunks
+
+
+def glitch_polar(img, forza=0.6, rotazione=0.0, zoom=0.5):
+    """Coordinate polari — immagine avvolta su se stessa."""
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    ys, xs = _grid(h, w)
+    nx = (xs / w - 0.5) * 2
+    ny_all = (ys / h - 0.5) * 2
+    out = np.empty_like(arr)
+    # mappa e gather a blocchi di righe, coordinate float32 e indici int32
+    for y0, y1 in _row_chunks(h, w):
+        ny = ny_all[y0:y1]
+        r = np.sqrt(nx**2 + ny**2) * (0.5 + zoom)
+        angle = np.arctan2(ny, nx) + rotazione * np.pi
+        px = np.clip(((angle / (2 * np.pi) + 0.5) * w * forza + w * (1 - forza) * 0.5).astype(np.int32), 0, w - 1)
+        py = np.clip((r * h * 0.8).astype(np.int32), 0, h - 1)
+        out[y0:y1] = arr[py, px]
+    return Image.fromarray(out)
@@ -0,0 +1,52 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _proxy_scale
+
+
+def glitch_pop_art_warhol(img, contrasto=0.6, palette=0.0, misregistrazione=0.4, full_size=None):
+    """Pop Art stile serigrafia Warhol: l'immagine viene posterizzata in poche
+    fasce tonali e ricolorata con una palette acida — come nelle stampe
+    serigrafiche (Marilyn, Flowers). Foto singola, dimensione originale
+    invariata (utile per poi affiancare piu' versioni con palette diverse
+    in un collage/griglia fatto manualmente). Aggiunge una leggera
+    mis-registrazione dei canali per l'effetto "fuori registro" tipico
+    della serigrafia manuale.
+
+    contrasto         : 0-1, quante fasce tonali (piu' alto = meno fasce, look piu' netto/pop)
+    palette           : 0-1, seleziona una delle combinazioni di colori acidi
+    misregistrazione  : 0-1, quanto i canali R/B sono disallineati
+    """
+    px_scale = _proxy_scale(img, full_size)
+    an = analysis_for(img)
+    img = img.convert("RGB")
+    lum = an.gray()
+
+    n_levels = max(2, min(4, int(round(4 - 2 * contrasto))))
+    # lum e' in [0, 1]: basta il limite superiore, e la fascia sta in un uint8
+    band = np.minimum((lum * n_levels).astype(np.uint8), n_levels - 1)
+
+    PALETTES = [
+        [(10, 10, 10), (230, 0, 122), (255, 210, 0), (0, 180, 190)],
+        [(35, 0, 55), (255, 90, 0), (0, 200, 120), (255, 240, 190)],
+        [(15, 15, 15), (0, 140, 255), (255, 0, 90), (255, 245, 0)],
+        [(55, 0, 30), (255, 150, 0), (150, 230, 0), (255, 255, 255)],
+        [(0, 25, 55), (255, 0, 150), (0, 235, 200), (255, 235, 0)],
+        [(45, 0, 0), (255, 200, 0), (0, 175, 255), (255, 255, 255)],
+        [(25, 25, 0), (0, 210, 130), (255, 60, 160), (255, 255, 255)],
+    ]
+
+    pal_idx = int(np.clip(palette, 0, 0.999) * len(PALETTES))
+    pal_full = PALETTES[pal_idx]
+    idxs = np.linspace(0, 3, n_levels).round().astype(int)
+    colors = np.array([pal_full[k] for k in idxs], dtype=np.uint8)
+    out_arr = colors[band]
+    del band
+
+    if misregistrazione > 0.02:
+        shift = int((2 + 14 * misregistrazione) * px_scale)
+        out_arr[:, :, 0] = np.roll(out_arr[:, :, 0], shift, axis=1)
+        out_arr[:, :, 2] = np.roll(out_arr[:, :, 2], -shift, axis=0)
+
+    return Image.fromarray(out_arr)
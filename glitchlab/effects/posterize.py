@@ -0,0 +1,62 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _roll_channels, _row_chunks
+from ..lut import channel_lut
+from ..seeding import make_rng
+
+
+def _channel_offsets(color_shift, px_scale=1.0):
+    """Spostamento (dy, dx) dei canali R, G, B nel verso di np.roll: rosso e
+    blu in orizzontale, in versi opposti."""
+    if color_shift <= 0.02:
+        return (0, 0), (0, 0), (0, 0)
+    s = int(color_shift * 25 * px_scale)
+    return (0, s), (0, 0), (0, -s)
+
+
+def _posterize_pixels(arr, livelli, dither=0.0, rng=None):
+    """Quantizza `arr` (uint8 (h, w, 3)) a fasce piatte, con il dither di
+    `rng` se dither > 0.02."""
+    h, w, _ = arr.shape
+    lev = max(2, int(2 + 6 * livelli))
+    step = 256.0 / lev
+    amp = step * dither * 0.6
+    out = np.empty_like(arr)
+    # a blocchi di righe, tutto in float32
+    for y0, y1 in _row_chunks(h, w):
+        block = arr[y0:y1].astype(np.float32)
+        if dither > 0.02:
+            noise = rng.random(block.shape, dtype=np.float32)
+            noise -= 0.5
+            noise *= 2 * amp
+            block += noise
+            np.clip(block, 0, 255, out=block)
+        block /= step
+        np.floor(block, out=block)
+        block *= step
+        np.clip(block, 0, 255, out=block)
+        out[y0:y1] = block
+    return out
+
+
+def glitch_posterize(img, livelli=0.4, dither=0.4, color_shift=0.3, seed=None, full_size=None):
+    """Riduce i colori a fasce piatte — estetica serigrafica.
+
+    seed : seed (o np.random.Generator) del dither; None = seed fisso 0.
+    Senza dither ogni canale dipende solo da se stesso: si applica come
+    tabella per canale (glitchlab.lut).
+    """
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    offsets = _channel_offsets(color_shift, px_scale)
+    shifted = any(dy or dx for dy, dx in offsets)
+    if dither > 0.02:
+        out = _posterize_pixels(np.asarray(img), livelli, dither, make_rng(seed))
+    else:
+        res = img.point(channel_lut("posterize", (livelli,),
+                                    lambda a: _posterize_pixels(a.rgb(), livelli)))
+        if not shifted:
+            return res
+        out = np.array(res)
+    return Image.fromarray(_roll_channels(out, offsets) if shifted else out)
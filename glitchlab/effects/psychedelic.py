@@ -0,0 +1,60 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _row_chunks
+from ..lut import apply_rgb_lut, rgb_lut
+from ..seeding import make_rng
+
+
+def _psychedelic_pixels(src, hue_shift, saturazione, flip):
+    """Rotazione hue + saturazione di `src` (uint8 (h, w, 3)), poi inversione
+    dei canali con flip[ch] True."""
+    h, w, _ = src.shape
+    shift = hue_shift * 2 * np.pi
+    cos_h, sin_h = np.cos(shift), np.sin(shift)
+    hue_matrix = np.array([
+        [0.213 + cos_h * 0.787 - sin_h * 0.213,
+         0.213 - cos_h * 0.213 - sin_h * 0.143,
+         0.213 - cos_h * 0.213 + sin_h * 0.140],
+        [0.715 - cos_h * 0.715 - sin_h * 0.715,
+         0.715 + cos_h * 0.285 + sin_h * 0.140,
+         0.715 - cos_h * 0.715 + sin_h * 0.140],
+        [0.072 - cos_h * 0.072 + sin_h * 0.928,
+         0.072 - cos_h * 0.072 - sin_h * 0.283,
+         0.072 + cos_h * 0.928 + sin_h * 0.283],
+    ], dtype=np.float32).T
+    out = np.empty_like(src)
+    # tutto per pixel: float32 a blocchi di righe
+    for y0, y1 in _row_chunks(h, w):
+        arr = src[y0:y1].astype(np.float32)
+        arr /= 255.0
+        arr = arr @ hue_matrix
+        np.clip(arr, 0, 1, out=arr)
+        gray = arr.mean(axis=2, keepdims=True)
+        arr -= gray
+        arr *= 1.0 + saturazione * 4.0
+        arr += gray
+        np.clip(arr, 0, 1, out=arr)
+        for ch in np.flatnonzero(flip):
+            np.subtract(1.0, arr[..., ch], out=arr[..., ch])
+        arr *= 255
+        out[y0:y1] = arr
+    return out
+
+
+def glitch_psychedelic(img, hue_shift=0.3, saturazione=0.5, inversione=0.0, seed=None):
+    """Rotazione hue + saturazione estrema + inversione canale.
+
+    seed : seed (o np.random.Generator) dei canali invertiti; None = seed fisso 0.
+    Estratti i canali da invertire l'effetto e' una funzione del colore:
+    passa dalla tabella RGB compilata (glitchlab.lut) quando conviene.
+    """
+    flip = make_rng(seed).random(3) < inversione if inversione > 0.05 else np.zeros(3, bool)
+    flip = tuple(bool(f) for f in flip)
+    table = rgb_lut("psychedelic", (hue_shift, saturazione, flip),
+                    lambda a: _psychedelic_pixels(a.rgb(), hue_shift, saturazione, flip),
+                    img.size[0] * img.size[1])
+    src = np.asarray(img.convert("RGB"))
+    if table is not None:
+        return apply_rgb_lut(src, table)
+    return Image.fromarray(_psychedelic_pixels(src, hue_shift, saturazione, flip))
@@ -0,0 +1,50 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _blend, _proxy_scale
+
+
+# Palette Commodore 64 (16 colori, valori RGB misurati da Philip "Pepto" Timmermann —
+# dati tecnici di riferimento standard, non contenuto creativo)
+RETRO_PALETTE_16 = np.array([
+    [0,0,0],[255,255,255],[104,55,43],[112,164,178],
+    [111,61,134],[88,141,67],[53,40,121],[184,199,111],
+    [111,79,37],[67,57,0],[154,103,89],[68,68,68],
+    [108,108,108],[154,210,132],[108,94,181],[149,149,149]
+], dtype=np.float32)
+
+_BAYER4 = np.array([
+    [ 0, 8, 2,10],
+    [12, 4,14, 6],
+    [ 3,11, 1, 9],
+    [15, 7,13, 5]
+], dtype=np.float32) / 16.0 - 0.5
+
+
+def glitch_retro_palette(img, intensity=1.0, dither=0.5, pixel_size=1.0, full_size=None):
+    """Retro Palette 16: pixelizzazione + quantizzazione sulla palette fissa a 16 colori del
+    Commodore 64, con dithering ordinato (Bayer) opzionale. Il quantizing avviene
+    sull'immagine già pixelizzata (bassa risoluzione) per performance."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    block = max(1, int((2 + 14 * (pixel_size / 3.0)) * px_scale))
+    sw, sh = max(1, w // block), max(1, h // block)
+    small = np.array(Image.fromarray(arr).resize((sw, sh), Image.BOX), dtype=np.float32)
+
+    rgb = small.copy()
+    if dither > 0.5:
+        tile = np.tile(_BAYER4, (sh // 4 + 1, sw // 4 + 1))[:sh, :sw]
+        spread = 40.0 * (dither - 0.5) * 2
+        rgb = rgb + tile[..., None] * spread
+
+    flat = rgb.reshape(-1, 3)
+    dists = np.sum((flat[:, None, :] - RETRO_PALETTE_16[None, :, :]) ** 2, axis=2)
+    nearest = np.argmin(dists, axis=1)
+    quantized_small = RETRO_PALETTE_16[nearest].reshape(sh, sw, 3).astype(np.uint8)
+
+    pixelated = np.asarray(Image.fromarray(quantized_small).resize((w, h), Image.NEAREST))
+
+    blend = float(np.clip((intensity / 3.0) ** 0.4, 0.02, 1.0))
+    return Image.fromarray(_blend(arr, pixelated, blend))
@@ -0,0 +1,133 @@
+import random
+
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _box_blur, _work_size
+from ..seeding import make_rng
+
+
+def glitch_rothko(img, bande=0.4, sfumatura=0.5, grana=0.4, variation_seed=None, seed=None,
+                  full_size=None):
+    """Color field alla Rothko: la STRUTTURA (dove cadono i confini fra le
+    bande orizzontali) e' guidata dalla foto — individuata nei punti di
+    massima variazione di luminanza, non su una griglia fissa, cosi' foto
+    diverse producono partiture di bande diverse. Il COLORE di ogni banda
+    pero' non deriva mai dalla foto (niente media dei pixel reali): viene
+    scelto da una palette curata di toni densi e vellutati ispirati alle
+    serie Seagram/Multiform di Rothko — come in Mondrian, e' la palette a
+    decidere le sfumature, non il contenuto dell'immagine. Feathering
+    gaussiano ai bordi (bleed morbido tipico) e grana di tela sovrapposta
+    completano l'effetto. L'elaborazione pesante (blur, feathering, grana)
+    avviene su una copia ridotta dell'immagine e viene poi riportata alla
+    risoluzione originale: sulle foto vere (alcuni megapixel) questo taglia
+    i tempi da decine di secondi a meno di un secondo, senza perdita
+    percepibile (le bande Rothko sono comunque campi di colore piatto, non
+    serve dettaglio pixel-per-pixel).
+
+    bande          : 0-1, numero di bande di colore (2-5)
+    sfumatura      : 0-1, quanto le bande sfumano l'una nell'altra
+    grana          : 0-1, intensita' della grana di tela
+    variation_seed : opzionale. Se None (default) l'assegnazione colore e'
+        deterministica per la stessa foto/parametri. Se specificato (usato
+        dal generatore di varianti) rimescola la scelta della palette per
+        banda, cosi' ogni variante ha una combinazione di colori diversa.
+    seed           : opzionale, seed (o np.random.Generator) della grana di
+        tela; None = variation_seed se dato, altrimenti seed fisso 7.
+    full_size      : opzionale, dimensioni della foto originale quando si
+        lavora su un proxy ridotto (anteprima Live): il seed colore usa la
+        copia di lavoro che avrebbe la foto intera, cosi' anteprima e
+        download hanno gli stessi colori.
+    """
+    orig_w, orig_h = img.size
+    work = analysis_for(img).work(1000)
+    rgb = work.rgb().astype(np.float32)
+    h, w = rgb.shape[:2]
+    lum = work.luminance()
+    row_mean = lum.mean(axis=1)
+    row_mean_s = _box_blur(row_mean.reshape(-1, 1), max(2, h // 40)).ravel()
+
+    n_bands = 2 + round(bande * 3)
+    grad = np.abs(np.diff(row_mean_s))
+    min_gap = h // (n_bands * 2)
+    cuts = []
+    grad_work = grad.copy()
+    for _ in range(n_bands - 1):
+        if grad_work.size == 0:
+            break
+        idx = int(np.argmax(grad_work))
+        if grad_work[idx] <= 0:
+            break
+        cuts.append(idx + 1)
+        lo, hi = max(0, idx - min_gap), min(len(grad_work), idx + min_gap)
+        grad_work[lo:hi] = -1
+    cuts = sorted(cuts)
+    bounds = [0] + cuts + [h]
+
+    # Palette Rothko: toni densi e vellutati ispirati alle serie
+    # Seagram/Multiform — assegnata per PROBABILITA', mai letta dai
+    # pixel della foto (quella decide solo dove cadono i confini,
+    # sopra). Stessa logica di Mondrian: e' la palette a scegliere le
+    # sfumature, non il contenuto dell'immagine.
+    ROTHKO_PALETTE = [
+        (176, 34, 28),    # rosso cadmio
+        (94, 24, 24),     # bordeaux profondo
+        (198, 93, 30),    # arancio bruciato
+        (200, 148, 40),   # ocra dorata
+        (210, 170, 90),   # giallo caldo/sabbia
+        (25, 22, 20),     # nero/carbone
+        (20, 35, 70),     # blu notte
+        (70, 30, 60),     # viola prugna
+        (176, 100, 90),   # rosa sbiadito
+        (110, 20, 35),    # bordeaux acceso
+    ]
+
+    # seed per l'assegnazione colore: se non specificato un
+    # variation_seed (uso normale), lo derivo dai parametri stessi ->
+    # stessa foto e stessi parametri producono sempre la stessa
+    # identica combinazione di colori, deterministica.
+    seed_size = _work_size(full_size, 1000) if full_size else (w, h)
+    if variation_seed is not None:
+        color_seed = variation_seed
+    else:
+        color_seed = hash((round(bande, 4), round(sfumatura, 4),
+                            round(grana, 4), *seed_size)) & 0xFFFFFFFF
+    color_rng = random.Random(color_seed)
+
+    def pick_band_color(prev_color):
+        # evita (quando possibile) che due bande adiacenti prendano
+        # esattamente lo stesso colore
+        choices = [c for c in ROTHKO_PALETTE if c != prev_color] or ROTHKO_PALETTE
+        return color_rng.choice(choices)
+
+    field = np.zeros_like(rgb)
+    prev_color = None
+    for i in range(len(bounds) - 1):
+        y0, y1 = bounds[i], bounds[i + 1]
+        if y1 <= y0:
+            continue
+        color = pick_band_color(prev_color)
+        prev_color = color
+        field[y0:y1, :] = np.array(color, dtype=np.float32)
+
+    feather_r = int(2 + sfumatura * (h * 0.06))
+    soft = np.stack([_box_blur(field[..., c], feather_r) for c in range(3)], axis=-1)
+    mix = 0.25 + sfumatura * 0.6
+    out = field * (1 - mix) + soft * mix
+
+    # seed grana: legato a variation_seed quando presente, cosi' anche
+    # la texture di tela cambia fra una variante e l'altra (prima era
+    # fisso a 7 e restava identico su tutte le varianti generate).
+    grain_seed = variation_seed if variation_seed is not None else 7
+    rng = make_rng(seed, default=grain_seed)
+    noise = rng.normal(0, 1, (h, w))
+    noise = _box_blur(noise, 1)
+    noise = (noise - noise.mean()) / (noise.std() + 1e-6)
+    out = out * (1 + noise[..., None] * grana * 0.10)
+
+    out = np.clip(out, 0, 255).astype(np.uint8)
+    result = Image.fromarray(out, mode="RGB")
+    if result.size != (orig_w, orig_h):
+        result = result.resize((orig_w, orig_h), Image.LANCZOS)
+    return result
@@ -0,0 +1,42 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _roll_channels
+from ..lut import channel_lut
+
+
+def _channel_offsets(channel_split, px_scale=1.0):
+    """Spostamento (dy, dx) dei canali R, G, B nel verso di np.roll: il rosso
+    scorre in orizzontale, il blu in verticale."""
+    if channel_split <= 0.02:
+        return (0, 0), (0, 0), (0, 0)
+    s = int(channel_split * 25 * px_scale)
+    return (0, s), (0, 0), (-s, 0)
+
+
+def _solarize_pixels(arr, soglia, forza):
+    """Inversione parziale sopra soglia, canale per canale: uint8 (h, w, 3)."""
+    thresh = soglia * 255
+    # ogni canale uint8 -> float32 -> uint8, un piano alla volta
+    out = np.empty_like(arr)
+    for ch in range(3):
+        c = arr[..., ch].astype(np.float32)
+        inverted = np.where(c > thresh, 255 - c, c)
+        c *= 1 - forza
+        inverted *= forza
+        c += inverted
+        out[..., ch] = np.clip(c, 0, 255, out=c)
+    return out
+
+
+def glitch_solarize(img, soglia=0.5, forza=0.8, channel_split=0.3, full_size=None):
+    """Inverte i pixel sopra soglia — estetica camera oscura.
+    Ogni canale dipende solo da se stesso: si applica come tabella per
+    canale (glitchlab.lut), poi gli spostamenti dei canali."""
+    px_scale = _proxy_scale(img, full_size)
+    table = channel_lut("solarize", (soglia, forza), lambda a: _solarize_pixels(a.rgb(), soglia, forza))
+    res = img.convert("RGB").point(table)
+    offsets = _channel_offsets(channel_split, px_scale)
+    if not any(dy or dx for dy, dx in offsets):
+        return res
+    return Image.fromarray(_roll_channels(np.array(res), offsets))
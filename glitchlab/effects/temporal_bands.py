@@ -0,0 +1,62 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale
+from ..seeding import make_rng
+
+
+def glitch_temporal_bands(img, intensity=0.7, ampiezza_bande=0.5, spostamento=0.6, seed=None,
+                          full_size=None):
+    """Temporal Band Slicer: la foto viene tagliata in bande orizzontali di altezza
+    variabile; ciascuna banda viene ricollocata da una diversa posizione spaziale
+    della stessa immagine (spostamento orizzontale E verticale ampio, come nel
+    riferimento Snorpey/Rosa Menkman), senza alterare colori, luminosita' o
+    contrasto — puro displacement geometrico, nessun blend, nessuna ricompressione.
+
+    intensity        : 0-1, probabilita' che una banda venga spostata (piu' alto = piu' bande "rotte")
+    ampiezza_bande   : 0-1, quanto sono grandi/irregolari le bande (0 = sottili e uniformi, 1 = larghe e caotiche)
+    spostamento      : 0-1, quanto lontano (in % di larghezza/altezza) puo' saltare una banda
+    seed             : seed (o np.random.Generator) di bande e salti; None = seed fisso 42
+    """
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+
+    rng = make_rng(seed, default=42)
+
+    # ampiezza massima dello spostamento, come frazione di w/h (arriva a coprire
+    # gran parte dell'immagine, cosi' una banda puo' "pescare" da una zona
+    # completamente diversa della foto, come nel riferimento)
+    max_shift_x = max(10, int(w * (0.05 + 0.55 * spostamento)))
+    max_shift_y = max(6, int(h * (0.03 + 0.45 * spostamento)))
+
+    prob_band = float(np.clip(0.15 + 0.8 * intensity, 0.1, 0.95))
+
+    # altezze bande variabili (non uniformi)
+    min_band = max(4, int((6 + 10 * (1.0 - ampiezza_bande)) * px_scale))
+    max_band = max(min_band + 10, int((25 + 150 * ampiezza_bande) * px_scale))
+    heights = []
+    remaining = h
+    while remaining > 0:
+        bh = int(rng.integers(min_band, max_band + 1))
+        bh = min(bh, remaining)
+        heights.append(bh)
+        remaining -= bh
+
+    out = arr.copy()
+    cols = np.arange(w)
+    y = 0
+    for bh in heights:
+        y_end = min(y + bh, h)
+        if rng.random() < prob_band:
+            dx = int(rng.integers(-max_shift_x, max_shift_x + 1))
+            dy = int(rng.integers(-max_shift_y, max_shift_y + 1))
+            # le righe della banda di np.roll(arr, (dy, dx)), prese direttamente
+            # con indici modulari: solo traslazione, nessun cambio colore, e
+            # nessuna copia dell'intero frame per banda
+            src_rows = (np.arange(y, y_end) - dy) % h
+            out[y:y_end] = arr[src_rows][:, (cols - dx) % w]
+        y = y_end
+
+    return Image.fromarray(out)
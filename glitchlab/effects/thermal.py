@@ -0,0 +1,62 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..lut import apply_rgb_lut, rgb_lut
+from ..seeding import make_rng
+
+
+def _thermal_colors(t, palette, contrasto):
+    """Contrasto + palette termica del piano di luminanza `t` (float32 0-1,
+    modificato sul posto): array uint8 (h, w, 3)."""
+    t -= 0.5
+    t *= 1 + contrasto * 1.5
+    t += 0.5
+    np.clip(t, 0, 1, out=t)
+
+    palettes = [
+        # Classica termica: nero→blu→ciano→verde→giallo→rosso→bianco
+        [(0,0,0),(0,0,1),(0,1,1),(0,1,0),(1,1,0),(1,0,0),(1,1,1)],
+        # Infrarosso: viola→blu→verde→giallo→bianco
+        [(0.2,0,0.4),(0,0,1),(0,0.8,0.2),(1,1,0),(1,1,1)],
+        # Calore: nero→rosso→arancio→giallo→bianco
+        [(0,0,0),(0.6,0,0),(1,0.3,0),(1,1,0),(1,1,1)],
+    ]
+    pal = np.array(palettes[int(palette * (len(palettes) - 0.01))], dtype=np.float32) * 255
+    n = len(pal) - 1
+    t *= n
+    idx = np.minimum(t.astype(np.uint8), n - 1)
+    t -= idx   # frazione fra i due colori
+    step = pal[1:] - pal[:-1]
+    out = np.empty(t.shape + (3,), dtype=np.uint8)
+    for ch in range(3):
+        # interpolazione lineare fra colore basso e alto, canale per canale
+        c = step[idx, ch]
+        c *= t
+        c += pal[idx, ch]
+        out[..., ch] = np.nan_to_num(c, copy=False, nan=0.0, posinf=255.0, neginf=0.0)
+    return out
+
+
+def glitch_thermal(img, palette=0.0, rumore=0.2, contrasto=0.6, seed=None):
+    """Falsi colori termografici: freddo→caldo mappato in colori.
+
+    seed : seed (o np.random.Generator) del rumore; None = seed fisso 0.
+    Senza rumore l'effetto e' una funzione del colore: passa dalla tabella
+    RGB compilata (glitchlab.lut) quando conviene.
+    """
+    an = analysis_for(img)
+    if rumore > 0.01:
+        # un solo piano float32 di lavoro, modificato in place
+        t = make_rng(seed).random(an.image.size[::-1], dtype=np.float32)
+        t -= 0.5
+        t *= rumore * 0.3
+        t += an.gray()
+        np.clip(t, 0, 1, out=t)
+        return Image.fromarray(_thermal_colors(t, palette, contrasto))
+    table = rgb_lut("thermal", (palette, contrasto),
+                    lambda a: _thermal_colors(a.gray().copy(), palette, contrasto),
+                    img.size[0] * img.size[1])
+    if table is not None:
+        return apply_rgb_lut(an.rgb(), table)
+    return Image.fromarray(_thermal_colors(an.gray().copy(), palette, contrasto))
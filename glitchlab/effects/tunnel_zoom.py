@@ -0,0 +1,35 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale
+
+
+def glitch_tunnel_zoom(img, strati=0.5, velocita=0.5, color_shift=0.3, full_size=None):
+    """Zoom a tunnel: strati concentrici con color shift progressivo."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    w, h = img.size
+    n = int(3 + 7 * strati)
+    accumulated = np.zeros((h, w, 3), dtype=np.float32)
+    total_w = 0.0
+
+    for i in range(n):
+        scale = 1.0 / (1.2 + i * 0.5 * velocita)
+        nw = max(1, min(w, int(w * scale)))
+        nh = max(1, min(h, int(h * scale)))
+        small = np.asarray(img.resize((nw, nh), Image.BILINEAR))
+        py = (h - nh) // 2
+        px = (w - nw) // 2
+        s = int(i * color_shift * 6 * px_scale) if color_shift > 0.02 else 0
+        wt = 1.0 / (i + 1)
+        # lo strato e' nero fuori dal riquadro: si somma solo il riquadro,
+        # canale per canale, nelle colonne dove lo porta lo shift (circolare)
+        for ch, shift in ((0, s), (1, 0), (2, -s)):
+            cols = (np.arange(px, px + nw) + shift) % w
+            layer = small[:, :, ch].astype(np.float32)
+            layer *= wt
+            accumulated[py:py+nh, cols, ch] += layer
+        total_w += wt
+
+    accumulated /= total_w
+    return Image.fromarray(np.clip(accumulated, 0, 255, out=accumulated).astype(np.uint8))
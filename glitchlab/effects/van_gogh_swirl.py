@@ -0,0 +1,72 @@
+import numpy as np
+from PIL import Image
+
+from ..analysis import analysis_for
+from ..imaging import _box_blur, _proxy_scale, _sobel
+
+
+def glitch_van_gogh(img, turbolenza=0.6, pennellata=0.5, saturazione=0.5, full_size=None):
+    """Pittura ad olio 'Notte Stellata': tensore di struttura (Sobel + blur)
+    per trovare l'orientamento locale dei contorni -> pennellate direzionali
+    (smear lungo la tangente, non a caso). Vortice gaussiano centrato sul
+    punto piu' luminoso dell'immagine, rotazione che decade con la distanza.
+    Quantizzazione + boost colore finale per l'effetto materico. Come Rothko,
+    l'elaborazione (la piu' pesante del pacchetto, per via delle pennellate
+    campionate piu' volte) avviene su una copia ridotta e viene poi
+    riportata alla risoluzione originale: su una foto vera passa da
+    30-40 secondi a pochi secondi, e l'effetto pittorico non perde nulla
+    (anzi la leggera morbidezza dell'upscale aiuta l'aspetto materico).
+
+    turbolenza  : 0-1, forza del vortice attorno al punto piu' luminoso
+    pennellata  : 0-1, lunghezza dello smear direzionale (pennellata)
+    saturazione : 0-1, boost colore + posterizzazione materica
+    """
+    orig_w, orig_h = img.size
+    px_scale = _proxy_scale(img, full_size, max_dim=1100)
+    work = analysis_for(img).work(1100)
+    rgb = work.rgb().astype(np.float32)
+    h, w = rgb.shape[:2]
+
+    blurred_lum = work.blur("gray", max(2, min(h, w) // 20))
+    cy, cx = np.unravel_index(np.argmax(blurred_lum), blurred_lum.shape)
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    dx, dy = xx - cx, yy - cy
+    r = np.sqrt(dx*dx + dy*dy)
+    R = min(h, w) * 0.55
+    k = turbolenza * 2.8
+    angle = k * np.exp(-(r / R) ** 2)
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    src_x = cx + dx*cos_a - dy*sin_a
+    src_y = cy + dx*sin_a + dy*cos_a
+    ix = np.clip(np.round(src_x).astype(np.int32), 0, w - 1)
+    iy = np.clip(np.round(src_y).astype(np.int32), 0, h - 1)
+    swirled = rgb[iy, ix]
+
+    sw_gray = (swirled[..., 0]*0.299 + swirled[..., 1]*0.587 + swirled[..., 2]*0.114) / 255.0
+    gx, gy = _sobel(sw_gray)
+    tensor_r = max(1, round(2 * px_scale))
+    Jxx = _box_blur(gx * gx, tensor_r)
+    Jyy = _box_blur(gy * gy, tensor_r)
+    Jxy = _box_blur(gx * gy, tensor_r)
+    theta = 0.5 * np.arctan2(2 * Jxy, (Jxx - Jyy) + 1e-6)
+
+    L = (2.0 + pennellata * 16.0) * px_scale
+    N = 7
+    acc = np.zeros_like(swirled)
+    ct, st_ = np.cos(theta), np.sin(theta)
+    for t in np.linspace(-L / 2, L / 2, N):
+        sx = np.clip(np.round(xx + t * ct).astype(np.int32), 0, w - 1)
+        sy = np.clip(np.round(yy + t * st_).astype(np.int32), 0, h - 1)
+        acc += swirled[sy, sx]
+    painted = acc / N
+
+    mean = painted.mean(axis=-1, keepdims=True)
+    painted = mean + (painted - mean) * (1.0 + saturazione * 1.4)
+    levels = 18 - saturazione * 8
+    painted = np.round(painted / levels) * levels
+
+    out = np.clip(painted, 0, 255).astype(np.uint8)
+    result = Image.fromarray(out, mode="RGB")
+    if result.size != (orig_w, orig_h):
+        result = result.resize((orig_w, orig_h), Image.LANCZOS)
+    return result
@@ -0,0 +1,39 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _shift_lines
+from ..seeding import make_rng
+
+
+def glitch_vhs(img, intensity=1.0, scanline_freq=1.0, color_shift=1.0, seed=None, full_size=None):
+    """Sbavatura nastro VHS: righe orizzontali che scivolano + color split.
+
+    seed : seed (o np.random.Generator) del rumore di nastro; None = seed fisso 0.
+    """
+    px_scale = _proxy_scale(img, full_size)
+    rng = make_rng(seed)
+    img = img.convert("RGB")
+    w, h = img.size
+    base_intensity = (15 + 30 * intensity) * px_scale
+    freq1 = (3 + 9 * scanline_freq) * px_scale
+    freq2 = (1 + 5 * scanline_freq) * px_scale
+    ys = np.arange(h)
+    shifts = (base_intensity * np.sin(ys / freq1) + (base_intensity / 2) * np.sin(ys / freq2)).astype(int)
+    # spostamento righe sui pixel uint8 (valori interi: identico a farlo in float)
+    arr = _shift_lines(np.asarray(img), shifts)
+    noise_prob = 0.1 + 0.3 * intensity
+    noise_mask = rng.random(h) < noise_prob
+    noise_int = int(10 + 20 * intensity)
+    # rumore solo sulle righe colpite, in int16
+    rows = arr[noise_mask].astype(np.int16)
+    rows += rng.integers(-noise_int, noise_int, rows.shape, dtype=np.int16)
+    arr[noise_mask] = np.clip(rows, 0, 255, out=rows)
+    del rows
+    sm = color_shift
+    r_shift = int((8 * sm + 12 * sm) * px_scale)
+    b_shift = int((-8 * sm - 12 * sm) * px_scale)
+    out = np.empty_like(arr)
+    out[:, :, 0] = np.roll(arr[:, :, 0], r_shift, axis=1)
+    out[:, :, 1] = arr[:, :, 1]
+    out[:, :, 2] = np.roll(arr[:, :, 2], b_shift, axis=1)
+    return Image.fromarray(out)
@@ -0,0 +1,55 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _row_chunks
+
+
+def glitch_wave_interference(img, freq=0.55, warp=0.65, chroma=0.5, full_size=None):
+    """Griglia sinusoidale verticale la cui fase e' deformata dalla luminanza
+    locale (le zone chiare piegano le righe, il nero resta piatto/vuoto).
+    Canali RGB separati leggermente in X -> frangia cromatica sui bordi.
+    Ricostruisce il look 'scan line portrait' / interferenza ottica a righe
+    ondulate con aberrazione cromatica.
+
+    freq   : 0-1, spaziatura delle righe (piu' alto = righe piu' fitte)
+    warp   : 0-1, quanto la luminanza deforma la fase della griglia
+    chroma : 0-1, sfasamento R/G/B (aberrazione cromatica)
+    """
+    px_scale = _proxy_scale(img, full_size)
+    src = np.asarray(img.convert("RGB"))
+    h, w, _ = src.shape
+
+    xs = np.arange(w, dtype=np.float32)
+
+    period = (18.0 - freq * 14.0) * px_scale
+    base_k = 2.0 * np.pi / period
+    phase_amp = warp * 6.0
+    shift = chroma * 3.0 * px_scale
+    # fase della griglia per canale: dipende solo dalla colonna
+    cols = [(xs + s) * base_k for s in (-shift, 0.0, shift)]
+
+    # ogni pixel dipende solo da se stesso: blocchi di righe, float32
+    out = np.empty((h, w, 3), dtype=np.uint8)
+    for y0, y1 in _row_chunks(h, w):
+        block = src[y0:y1]
+        lum = block[..., 0].astype(np.float32)
+        lum /= 255.0
+        lum *= 0.299
+        for ch, k in ((1, 0.587), (2, 0.114)):
+            c = block[..., ch].astype(np.float32)
+            c /= 255.0
+            c *= k
+            lum += c
+        phase = lum * phase_amp
+        phase *= 2.0
+        phase *= np.pi
+        lum **= 0.8
+        for ch, col in enumerate(cols):
+            g = np.sin(col + phase)
+            g *= 0.5
+            g += 0.5
+            g *= lum
+            np.clip(g, 0, 1, out=g)
+            g *= 255
+            out[y0:y1, :, ch] = g
+    return Image.fromarray(out, mode="RGB")
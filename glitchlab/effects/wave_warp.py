@@ -0,0 +1,31 @@
+import numpy as np
+from PIL import Image
+
+from ..imaging import _proxy_scale, _shift_lines
+
+
+def glitch_wave_warp(img, ampiezza=1.0, frequenza=1.0, asse=0.5, full_size=None):
+    """Deformazione sinusoidale — effetto liquido/jello."""
+    px_scale = _proxy_scale(img, full_size)
+    img = img.convert("RGB")
+    arr = np.array(img, dtype=np.uint8)
+    h, w, _ = arr.shape
+    amp_x = int((20 + 60 * ampiezza) * px_scale)
+    amp_y = int((15 + 45 * ampiezza) * px_scale)
+    freq_x = (0.01 + 0.09 * frequenza) / px_scale
+    freq_y = (0.008 + 0.07 * frequenza) / px_scale
+    xs = np.arange(w)
+    ys = np.arange(h)
+
+    if asse <= 0.5:
+        # Warp orizzontale (righe che oscillano)
+        # out[y, x] = arr[y, clip(x + dx[y])]
+        dx = (amp_x * np.sin(ys * freq_x)).astype(int)
+        out = _shift_lines(arr, -dx, axis=0, mode="clamp")
+    else:
+        # Warp verticale (colonne che oscillano)
+        # out[y, x] = arr[clip(y + dy[x]), x]
+        dy = (amp_y * np.sin(xs * freq_y)).astype(int)
+        out = _shift_lines(arr, -dy, axis=1, mode="clamp")
+
+    return Image.fromarray(out)
@@ -0,0 +1,186 @@
+"""Codifica delle immagini risultato: file a piena risoluzione secondo un
+preset di formato, JPEG leggero per l'anteprima.
+
+    data = encode(img, "webp")                  # bytes nel formato del preset
+    fut = encode_async(img, "png_small")        # Future sul pool di codifica
+    datas = encode_many(images, "jpeg")         # piu' immagini insieme
+
+Preset (PRESETS): png_fast (PNG livello 1, il default, come sempre),
+png_small (PNG livello 6: fino al 25% piu' piccolo, fino a 4-5 volte piu'
+lento), webp_lossless (WebP senza perdita alla velocita' massima), webp
+(WebP con perdita, q90), jpeg (q92, senza trasparenza) e tiff (non
+compresso, il piu' veloce). I preset
+WebP ci sono solo se PIL e' compilato con libwebp (available_presets).
+
+La codifica gira in C dentro PIL senza il GIL: sul pool di thread di codifica
+(GLITCHLAB_ENCODE_WORKERS, default un thread per core) piu' immagini si
+codificano insieme, anche mentre il thread chiamante prepara l'anteprima.
+Con `telemetry` tempo e byte di ogni codifica finiscono nel render (fase
+"encode" e RenderTelemetry.encodings, riportati per preset nel report).
+"""
+import io
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, features
+
+from .cache import RenderCache
+
+# format/options = argomenti di Image.save; ext/mime per nomi file e download
+Preset = namedtuple("Preset", ["label", "format", "ext", "mime", "options"])
+
+PRESETS = {
+    "png_fast": Preset("PNG veloce", "PNG", "png", "image/png", {"compress_level": 1}),
+    # livello 6 e non 9: sulle zone piatte (posterize a 12 MP) il 9 costa
+    # 113 s contro 6 per un file solo l'8% piu' piccolo
+    "png_small": Preset("PNG compatto", "PNG", "png", "image/png", {"compress_level": 6}),
+    "webp_lossless": Preset("WebP lossless", "WEBP", "webp", "image/webp",
+                            {"lossless": True, "quality": 0, "method": 0}),
+    "webp": Preset("WebP", "WEBP", "webp", "image/webp", {"quality": 90, "method": 2}),
+    "jpeg": Preset("JPEG", "JPEG", "jpg", "image/jpeg", {"quality": 92}),
+    "tiff": Preset("TIFF", "TIFF", "tif", "image/tiff", {}),
+}
+DEFAULT_PRESET = "png_fast"
+
+ENCODE_WORKERS = int(os.environ.get("GLITCHLAB_ENCODE_WORKERS", "0")) or os.cpu_count() or 1
+
+# anteprime JPEG gia' codificate, per chiave di render (vedi img_to_preview_bytes)
+PREVIEW_CACHE = RenderCache(int(os.environ.get("GLITCHLAB_PREVIEW_CACHE_MB", "64")) * 1024 * 1024,
+                            sizeof=len)
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def available_presets():
+    """Nomi dei preset utilizzabili con questo PIL, nell'ordine di PRESETS."""
+    webp = features.check("webp")
+    return [name for name, p in PRESETS.items() if p.format != "WEBP" or webp]
+
+
+def get_preset(name):
+    """Preset di nome `name`; ValueError se non esiste o se questo PIL non
+    sa scriverne il formato."""
+    if name not in available_presets():
+        raise ValueError(f"formato sconosciuto o non disponibile: {name!r} "
+                         f"(disponibili: {', '.join(available_presets())})")
+    return PRESETS[name]
+
+
+def encode(img, preset=DEFAULT_PRESET, telemetry=None):
+    """Codifica `img` col preset dato e ritorna i bytes del file. JPEG non ha
+    canale alpha: l'immagine viene convertita in RGB."""
+    p = get_preset(preset)
+    if p.format == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    t0 = time.perf_counter()
+    buf = io.BytesIO()
+    img.save(buf, format=p.format, **p.options)
+    data = buf.getvalue()
+    if telemetry is not None:
+        telemetry.add_encoding(preset, time.perf_counter() - t0, len(data))
+    return data
+
+
+def _encode_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=ENCODE_WORKERS,
+                                       thread_name_prefix="glitchlab-encode")
+        return _POOL
+
+
+def encode_async(img, preset=DEFAULT_PRESET, telemetry=None):
+    """Come encode, sul pool di codifica: ritorna un Future con i bytes.
+    L'immagine non va modificata finche' il Future non e' completato."""
+    return _encode_pool().submit(encode, img, preset, telemetry)
+
+
+def encode_many(images, preset=DEFAULT_PRESET, telemetries=None):
+    """Codifica tutte le immagini in parallelo sul pool di codifica e ritorna
+    i bytes nello stesso ordine. `telemetries`: una telemetria (o None) per
+    immagine."""
+    telemetries = telemetries or [None] * len(images)
+    futures = [encode_async(img, preset, tel) for img, tel in zip(images, telemetries)]
+    return [fut.result() for fut in futures]
+
+
+def img_to_bytes(img: Image.Image, preset: str = DEFAULT_PRESET, telemetry=None) -> bytes:
+    # png_fast: su immagini glitch/rumorose il guadagno di dimensione del
+    # livello massimo e' minimo, ma il costo in tempo e' alto — livello 1 e'
+    # quasi il doppio piu' veloce a parita' di peso. Gli altri formati
+    # restano a scelta (PRESETS).
+    return encode(img, preset, telemetry)
+
+
+def img_to_preview_bytes(img: Image.Image, max_dim: int = 900, cache_key=None) -> bytes:
+    """Genera un'anteprima leggera (JPEG, lato lungo max_dim) da mostrare a
+    schermo con st.image(). Streamlit ritrasmette al browser TUTTE le
+    immagini di TUTTI gli effetti gia' generati a ogni singola interazione
+    (ogni slider, ogni click, ovunque nella pagina causa un rerun completo):
+    usare qui il PNG a piena risoluzione — anche solo su una decina di
+    effetti generati su una foto da alcuni megapixel — significa spedire
+    decine di MB ad ogni interazione, rendendo l'interfaccia lentissima o
+    apparentemente bloccata. Il file a piena risoluzione resta comunque
+    disponibile per il download e lo ZIP (vedi img_to_bytes).
+
+    La riduzione passa prima da Image.reduce (media a blocchi interi, fino a
+    due volte la dimensione finale, reducing_gap) e solo l'ultimo tratto da
+    LANCZOS: a 12 MP circa 2.5 volte piu' veloce, con differenze di pochi
+    livelli per pixel (media 1-3 su 255) rispetto al solo LANCZOS. Con
+    `cache_key` (es. la chiave di render, vedi glitchlab.cache) l'anteprima
+    viene presa da PREVIEW_CACHE se gia' codificata."""
+    if cache_key is not None:
+        hit = PREVIEW_CACHE.get((cache_key, max_dim))
+        if hit is not None:
+            return hit
+    preview = img.convert("RGB") if img.mode == "RGBA" else img
+    w, h = preview.size
+    if max(w, h) > max_dim:
+        scale = max_dim / max(w, h)
+        preview = preview.resize((max(1, round(w*scale)), max(1, round(h*scale))), Image.LANCZOS,
+                                 reducing_gap=2.0)
+    buf = io.BytesIO()
+    preview.save(buf, format="JPEG", quality=85)
+    data = buf.getvalue()
+    if cache_key is not None:
+        PREVIEW_CACHE.put((cache_key, max_dim), data)
+    return data
+
+
+def _png_chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)) + kind + data)
+    f.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def write_png_rows(path, arr, compress_level=1, block_pixels=1 << 20):
+    """Scrive un array (h, w, 3) uint8 come PNG RGB a blocchi di righe, senza
+    mai tenerlo tutto in memoria: `arr` puo' essere un memmap da centinaia di
+    megapixel (vedi glitchlab.tiling), che PIL invece vorrebbe intero.
+    Ogni riga usa il filtro PNG "Sub" (differenza col pixel a sinistra),
+    calcolato con numpy: sulle foto comprime molto meglio di nessun filtro."""
+    h, w = arr.shape[:2]
+    row = w * 3
+    step = max(1, block_pixels // max(1, w))
+    comp = zlib.compressobj(compress_level)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+        for y0 in range(0, h, step):
+            block = np.asarray(arr[y0:y0 + step]).reshape(-1, row)
+            lines = np.empty((len(block), row + 1), dtype=np.uint8)
+            lines[:, 0] = 1   # filtro Sub
+            lines[:, 1:4] = block[:, :3]
+            np.subtract(block[:, 3:], block[:, :-3], out=lines[:, 4:])
+            data = comp.compress(lines)
+            if data:
+                _png_chunk(f, b"IDAT", data)
+        _png_chunk(f, b"IDAT", comp.flush())
+        _png_chunk(f, b"IEND", b"")
@@ -0,0 +1,229 @@
+"""Helper numerici condivisi dagli effetti (blur, gradienti, riduzione di lavoro)."""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image
+try:
+    from scipy.ndimage import uniform_filter as _scipy_uniform_filter
+    _HAS_SCIPY = True
+except ImportError:
+    _HAS_SCIPY = False
+
+
+def _box_blur_numpy(a, r):
+    """Box blur via cumsum, pura numpy (fallback se scipy non e' installato)."""
+    size = 2 * r + 1
+    pad = [(r, r), (r, r)] + [(0, 0)] * (a.ndim - 2)
+    ap = np.pad(a, pad, mode="reflect")
+    c = np.cumsum(np.cumsum(ap, axis=0), axis=1)
+    c = np.pad(c, [(1, 0), (1, 0)] + [(0, 0)] * (a.ndim - 2), mode="constant")
+    h, w = a.shape[0], a.shape[1]
+    return (c[size:size+h, size:size+w] - c[0:h, size:size+w]
+            - c[size:size+h, 0:w] + c[0:h, 0:w]) / (size * size)
+
+
+def _box_blur(a, r):
+    """Box blur veloce via scipy.ndimage.uniform_filter (C-ottimizzato); se
+    scipy non e' disponibile (es. manca dal requirements.txt su Streamlit
+    Cloud) ricade automaticamente sulla versione pura numpy, piu' lenta ma
+    sempre funzionante — l'app non si rompe mai per questa dipendenza."""
+    if r < 1:
+        return a
+    if _HAS_SCIPY:
+        size = 2 * r + 1
+        if a.ndim == 2:
+            return _scipy_uniform_filter(a, size=size, mode="reflect")
+        axes_size = [size, size] + [1] * (a.ndim - 2)
+        return _scipy_uniform_filter(a, size=axes_size, mode="reflect")
+    return _box_blur_numpy(a, r)
+
+
+def _downscale_for_work(img, max_dim):
+    """Riduce l'immagine per l'elaborazione pesante se supera max_dim sul lato
+    lungo; ritorna (immagine_ridotta, scala) dove scala = dim_originale/dim_ridotta.
+    La riduzione agisce anche da filtro passa-basso: elimina il rumore ad alta
+    frequenza che altrimenti guiderebbe tagli/decisioni casuali sull'immagine."""
+    w, h = img.size
+    long_side = max(w, h)
+    if long_side <= max_dim:
+        return img, 1.0
+    scale = long_side / max_dim
+    small = img.resize(_work_size(img.size, max_dim), Image.LANCZOS)
+    return small, scale
+
+
+def make_proxy(img, max_dim=900):
+    """Copia ridotta della foto (lato lungo max_dim) per le anteprime
+    veloci; la foto stessa se e' gia' piu' piccola. Gli effetti che girano
+    sul proxy ricevono ``full_size=img.size`` (vedi _proxy_scale)."""
+    return _downscale_for_work(img, max_dim)[0]
+
+
+def _work_size(size, max_dim):
+    """Dimensioni della copia di lavoro che _downscale_for_work produrrebbe
+    per un'immagine di dimensioni `size`."""
+    w, h = size
+    long_side = max(w, h)
+    if long_side <= max_dim:
+        return w, h
+    scale = long_side / max_dim
+    return max(1, round(w / scale)), max(1, round(h / scale))
+
+
+def _proxy_scale(img, full_size, max_dim=None):
+    """Fattore per le grandezze espresse in pixel (spostamenti, celle, raggi,
+    periodi) quando l'effetto gira su un proxy ridotto della foto, es.
+    l'anteprima Live: `full_size` sono le dimensioni della foto originale.
+    Con max_dim il rapporto e' fra le copie di lavoro di _downscale_for_work,
+    per gli effetti che elaborano comunque a risoluzione limitata.
+    Vale esattamente 1.0 quando full_size e' None (render a piena risoluzione),
+    cosi' moltiplicare per questo fattore non cambia mai l'output finale."""
+    if full_size is None:
+        return 1.0
+    cur, full = max(img.size), max(full_size)
+    if max_dim is not None:
+        cur, full = min(cur, max_dim), min(full, max_dim)
+    return cur / full
+
+
+# Pixel per blocco di righe negli effetti per-pixel (vedi _row_chunks): i
+# temporanei float32 di un blocco RGB restano sui 12 MB a qualunque risoluzione
+_BLOCK_PIXELS = 1 << 20
+
+
+def _row_chunks(h, w, pixels=_BLOCK_PIXELS):
+    """Intervalli di righe (y0, y1) da circa `pixels` pixel ciascuno. Gli
+    effetti in cui ogni pixel di uscita dipende solo dalla sua riga lavorano
+    blocco per blocco: i temporanei float32 occupano un blocco, non frame
+    interi."""
+    step = max(1, pixels // max(1, w))
+    for y0 in range(0, h, step):
+        yield y0, min(h, y0 + step)
+
+
+def _grid(h, w):
+    """Coordinate float32 ys (h, 1) e xs (1, w): combinate per broadcast danno
+    gli stessi valori di np.mgrid[0:h, 0:w].astype(np.float32), senza
+    allocare i due piani interi."""
+    return np.arange(h, dtype=np.float32)[:, None], np.arange(w, dtype=np.float32)[None, :]
+
+
+def _blend(a, b, t):
+    """a * (1 - t) + b * t fra due immagini uint8 della stessa forma,
+    troncato a uint8: stessi valori dell'espressione in float32 su frame
+    interi, calcolata a blocchi di righe."""
+    out = np.empty_like(a)
+    for y0, y1 in _row_chunks(*a.shape[:2]):
+        fa = a[y0:y1].astype(np.float32)
+        fa *= 1 - t
+        fb = b[y0:y1].astype(np.float32)
+        fb *= t
+        fa += fb
+        out[y0:y1] = np.clip(fa, 0, 255, out=fa)
+    return out
+
+
+def _luminance_above(arr, thresh):
+    """Maschera r*0.299 + g*0.587 + b*0.114 > thresh di un'immagine uint8,
+    con la luminanza in float64 come ImageAnalysis.luminance(np.float64) ma a
+    blocchi di righe: stessa maschera senza il piano float64 intero."""
+    mask = np.empty(arr.shape[:2], dtype=bool)
+    for y0, y1 in _row_chunks(*arr.shape[:2]):
+        f = arr[y0:y1].astype(np.float64)
+        np.greater(f[..., 0]*0.299 + f[..., 1]*0.587 + f[..., 2]*0.114, thresh, out=mask[y0:y1])
+    return mask
+
+
+def _roll_channels(arr, offsets):
+    """Sposta sul posto ogni canale c di arr (h, w, c), scrivibile, come
+    np.roll(arr[..., c], offsets[c], axis=(0, 1)) con offsets[c] = (dy, dx);
+    ritorna arr."""
+    for ch, (dy, dx) in enumerate(offsets):
+        if dy or dx:
+            arr[..., ch] = np.roll(arr[..., ch], (dy, dx), axis=(0, 1))
+    return arr
+
+
+def _sobel(gray):
+    """Gradienti Sobel Gx, Gy vettorizzati via padding (no scipy)."""
+    gp = np.pad(gray, 1, mode="reflect")
+    gx = (gp[0:-2, 2:] + 2*gp[1:-1, 2:] + gp[2:, 2:]) - (gp[0:-2, 0:-2] + 2*gp[1:-1, 0:-2] + gp[2:, 0:-2])
+    gy = (gp[2:, 0:-2] + 2*gp[2:, 1:-1] + gp[2:, 2:]) - (gp[0:-2, 0:-2] + 2*gp[0:-2, 1:-1] + gp[0:-2, 2:])
+    return gx, gy
+
+
+def _shift_lines(arr, shifts, axis=0, mode="wrap"):
+    """Sposta ogni riga (axis=0) o colonna (axis=1) di `shifts[i]` pixel, con
+    lo stesso verso di np.roll: out[y, x] = arr[y, x - shifts[y]] per righe,
+    out[y, x] = arr[y - shifts[x], x] per colonne. mode "wrap" = cio' che esce
+    da un lato rientra dall'altro (come np.roll); "clamp" = fuori bordo si
+    ripete il pixel di bordo (come np.clip sugli indici sorgente).
+
+    Un solo gather su tutto il frame invece di un np.roll per riga: l'immagine
+    viene allungata di max|shift| pixel per lato lungo la direzione dello
+    spostamento (copia circolare o bordo), poi ogni riga di uscita e' una
+    finestra della riga allungata (righe) o un np.take con un indice per
+    colonna (colonne). arr: (h, w) o (h, w, c); ritorna un nuovo array
+    contiguo dello stesso dtype."""
+    arr = np.asarray(arr)
+    shifts = np.asarray(shifts, dtype=np.intp)
+    if mode not in ("wrap", "clamp"):
+        raise ValueError(f"mode sconosciuto: {mode!r} (wrap o clamp)")
+    h, w = arr.shape[:2]
+    length = w if axis == 0 else h
+    if mode == "wrap":
+        shifts = (shifts + length // 2) % length - length // 2   # equivalente, in [-L/2, L/2)
+    # in clamp oltre `length` il risultato e' comunque tutto bordo
+    pad = min(int(np.abs(shifts).max(initial=0)), length)
+    if pad == 0:
+        return arr.copy()
+    shifts = np.clip(shifts, -pad, pad)
+    pads = [(0, 0)] * arr.ndim
+    pads[1 - axis] = (pad, pad)   # si allunga lungo la direzione dello spostamento
+    padded = np.pad(arr, pads, mode="wrap" if mode == "wrap" else "edge")
+    c = arr[0, 0].size
+
+    if axis == 0:
+        lines = padded.reshape(h, (w + 2 * pad) * c)
+        windows = sliding_window_view(lines, w * c, axis=1)
+        return windows[np.arange(h), (pad - shifts) * c].reshape(arr.shape)
+
+    # colonne: l'elemento (y, x, ch) viene da (y + pad - shifts[x], x, ch)
+    row = w * c
+    flat = padded.reshape(-1)
+    base = ((pad - shifts) * row)[:, None] + np.arange(row).reshape(w, c)
+    base = base.reshape(-1)
+    out = np.empty_like(arr)
+    out_rows = out.reshape(h, row)
+    step = max(1, (1 << 20) // row)   # blocchi di righe: indice limitato a ~8 MB
+    for y0 in range(0, h, step):
+        y1 = min(h, y0 + step)
+        np.take(flat, np.arange(y0, y1)[:, None] * row + base, out=out_rows[y0:y1])
+    return out
+
+
+def as_image(src):
+    """Accetta un'immagine PIL oppure un array HxWx3 / HxW uint8 (anche una
+    vista read-only) e ritorna un'immagine PIL. Gli array HxWx3 vengono
+    copiati: PIL non sa appoggiarsi a pixel RGB da 3 byte (vedi rgbx_image)."""
+    if isinstance(src, Image.Image):
+        return src
+    return Image.fromarray(np.ascontiguousarray(src))
+
+
+def rgbx_image(arr):
+    """Immagine PIL in modo "RGBX" che si appoggia al buffer di `arr` (array
+    HxWx4 uint8 contiguo, es. una vista in memoria condivisa) senza copiarlo:
+    Image.frombuffer mappa solo i modi con pixel da 1 o 4 byte, non RGB.
+    L'immagine e' read-only; convert("RGB") ne fa la solita copia RGB."""
+    h, w = arr.shape[:2]
+    return Image.frombuffer("RGBX", (w, h), arr, "raw", "RGBX", 0, 1)
+
+
+def reapply_alpha(result_img, alpha):
+    """Rimette la trasparenza originale sul risultato di un effetto (ridimensionando
+    il canale alpha se l'effetto ha cambiato dimensione)."""
+    result_img = result_img.convert("RGBA")
+    if result_img.size != alpha.size:
+        alpha = alpha.resize(result_img.size)
+    result_img.putalpha(alpha)
+    return result_img
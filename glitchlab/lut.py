@@ -0,0 +1,158 @@
+"""Effetti per pixel compilati in tabelle di colore (LUT).
+
+Thermal, duotone, solarize, posterize (senza dither) e psychedelic danno a
+ogni pixel un colore che dipende solo dal suo colore, non dalla posizione:
+una volta fissati i parametri l'effetto e' una funzione colore -> colore, e
+la si puo' calcolare una volta sola per tutti i colori invece che per ogni
+pixel di ogni foto. Le tabelle si ottengono facendo girare il codice
+dell'effetto stesso su un'immagine "identita'" che contiene ogni colore una
+volta, quindi applicarle da' gli stessi bit del calcolo diretto.
+
+- Tabella per canale (channel_lut, 3 x 256 voci): per gli effetti in cui
+  ogni canale d'uscita dipende solo dallo stesso canale d'ingresso
+  (solarize, posterize). Si compila in microsecondi e si applica con
+  Image.point di PIL.
+- Tabella RGB completa (rgb_lut, 256^3 colori in uint32 RGBX = 64 MB): per
+  gli effetti che mescolano i canali (thermal, duotone, psychedelic). Si
+  applica con un gather NumPy (indice r<<16 | g<<8 | b) e PIL decodifica
+  i pixel RGBX in un'immagine RGB. Compilarla costa quanto
+  l'effetto diretto su 16.7 MP, quindi la si compila solo quando i pixel
+  elaborati con gli stessi parametri arrivano a tanto (una foto grande, o
+  piu' foto / tasselli / job batch con gli stessi valori); prima l'effetto
+  gira diretto.
+
+Le tabelle restano in una cache LRU di processo limitata a
+GLITCHLAB_LUT_CACHE_MB (default 256, 4 tabelle RGB); 0 disattiva le
+tabelle RGB (quelle per canale sono sempre attive).
+"""
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import Image
+
+from .analysis import ImageAnalysis
+from .cache import RenderCache
+from .imaging import _row_chunks
+
+# colori RGB a 8 bit: voci di una tabella completa e pixel da elaborare
+# perche' compilarla convenga
+RGB_LUT_SIZE = 1 << 24
+
+LUT_CACHE = RenderCache(int(os.environ.get("GLITCHLAB_LUT_CACHE_MB", "256")) * 1024 * 1024,
+                        sizeof=lambda table: np.asarray(table).nbytes)
+
+# (effetto, parametri) -> pixel gia' elaborati senza tabella; le voci piu'
+# vecchie oltre _SEEN_MAX vengono dimenticate
+_SEEN = OrderedDict()
+_SEEN_MAX = 256
+_LOCK = threading.Lock()
+_COMPILE_LOCKS = {}
+# thread dentro direct_only() (vedi sotto)
+_DIRECT = threading.local()
+
+
+@contextmanager
+def direct_only():
+    """Dentro il blocco, su questo thread, rgb_lut ritorna sempre None senza
+    contare i pixel: gli effetti calcolano diretto. Serve a chi sta gia'
+    compilando o usando una tabella che comprende l'effetto (la compilazione
+    stessa, gli stadi fusi di glitchlab.chain), che altrimenti ne
+    compilerebbe una seconda solo per se'."""
+    prev = getattr(_DIRECT, "active", False)
+    _DIRECT.active = True
+    try:
+        yield
+    finally:
+        _DIRECT.active = prev
+
+
+def _identity(y0, y1):
+    """Righe y0:y1 dell'immagine identita' 4096 x 4096: il pixel i ha colore
+    (i >> 16, i >> 8 & 255, i & 255), quindi ogni colore compare una volta."""
+    i = np.arange(y0 * 4096, y1 * 4096, dtype=np.uint32)
+    rgb = np.empty((len(i), 3), dtype=np.uint8)
+    rgb[:, 0] = i >> 16
+    rgb[:, 1] = (i >> 8) & 255
+    rgb[:, 2] = i & 255
+    return rgb.reshape(y1 - y0, 4096, 3)
+
+
+def _compile_locked(key, compile_fn):
+    """compile_fn() una volta sola per chiave anche con piu' thread insieme
+    (come ImageAnalysis._memo); il risultato va in LUT_CACHE."""
+    with _LOCK:
+        lock = _COMPILE_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        table = LUT_CACHE.get(key)
+        if table is None:
+            table = compile_fn()
+            LUT_CACHE.put(key, table)
+        return table
+
+
+def channel_lut(name, params, compute):
+    """Tabella per canale di un effetto: lista di 768 voci (R, G, B) per
+    Image.point. `compute(an)` e' il calcolo diretto dell'effetto su
+    un'ImageAnalysis e ritorna l'array uint8 (h, w, 3) risultato; qui gira
+    sulla rampa 1 x 256 grigia (r = g = b = i). Vale solo per effetti in cui
+    ogni canale dipende solo da se stesso."""
+    def compile_fn():
+        ramp = np.repeat(np.arange(256, dtype=np.uint8)[None, :, None], 3, axis=2)
+        out = compute(ImageAnalysis(Image.fromarray(ramp)))
+        return [int(v) for ch in range(3) for v in out[0, :, ch]]
+    return _compile_locked(("channel", name, tuple(params)), compile_fn)
+
+
+def rgb_lut(name, params, compute, pixels):
+    """Tabella RGB completa di un effetto (256^3 uint32, byte R, G, B, 0 in
+    memoria: il colore r<<16 | g<<8 | b e' la voce (r, g, b)), oppure None se
+    per ora conviene il calcolo diretto. `compute(an)` come in channel_lut;
+    `pixels` = pixel della foto che si sta per elaborare. La tabella viene
+    presa dalla cache o compilata quando, con questi pixel, i parametri
+    hanno elaborato almeno RGB_LUT_SIZE pixel."""
+    if LUT_CACHE.max_bytes < RGB_LUT_SIZE * 4 or getattr(_DIRECT, "active", False):
+        return None
+    key = ("rgb", name, tuple(params))
+    table = LUT_CACHE.get(key)
+    if table is not None:
+        return table
+    with _LOCK:
+        seen = _SEEN.pop(key, 0) + pixels
+        _SEEN[key] = seen
+        while len(_SEEN) > _SEEN_MAX:
+            _SEEN.popitem(last=False)
+    if seen < RGB_LUT_SIZE:
+        return None
+
+    def compile_fn():
+        rgbx = np.zeros((RGB_LUT_SIZE, 4), dtype=np.uint8)
+        # a blocchi di 256 righe dell'identita' (1 M colori): i temporanei
+        # dell'effetto restano quelli di una foto da 1 MP
+        with direct_only():
+            for y0 in range(0, 4096, 256):
+                block = Image.fromarray(_identity(y0, y0 + 256))
+                rgbx[y0 * 4096:(y0 + 256) * 4096, :3] = compute(ImageAnalysis(block)).reshape(-1, 3)
+        table = rgbx.view("<u4").reshape(-1)
+        table.flags.writeable = False
+        return table
+    return _compile_locked(key, compile_fn)
+
+
+def apply_rgb_lut(arr, table):
+    """Applica una tabella di rgb_lut a un array (h, w, 3) uint8 e ritorna
+    l'immagine PIL RGB. Gather a blocchi di righe (l'indice uint32 occupa un
+    blocco, non un frame)."""
+    h, w = arr.shape[:2]
+    out = np.empty((h, w), dtype=table.dtype)
+    for y0, y1 in _row_chunks(h, w):
+        block = arr[y0:y1]
+        idx = block[..., 0].astype(np.uint32)
+        idx <<= 8
+        idx |= block[..., 1]
+        idx <<= 8
+        idx |= block[..., 2]
+        np.take(table, idx, out=out[y0:y1])
+    return Image.frombytes("RGB", (w, h), out, "raw", "RGBX")
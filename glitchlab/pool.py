@@ -0,0 +1,162 @@
+"""Pool di worker persistente per generare piu' effetti in parallelo.
+
+Due backend: "thread" per gli effetti NumPy-heavy (le operazioni vettoriali
+rilasciano il GIL, nessun costo di copia dell'immagine) e "process" per
+quelli dominati da loop Python (pixel sort, drip, halftone...). Il pool e'
+pensato per vivere a lungo (es. st.cache_resource nell'app): i worker
+vengono "scaldati" all'avvio importando tutti i moduli effetto, cosi' il
+primo click non paga import di numpy/scipy.
+"""
+import multiprocessing
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import Image
+
+from .analysis import analysis_for
+from .cache import apply_key, cached_apply
+from .chain import apply_chain, cached_chain, chain_key, recipe_params
+from .encoding import DEFAULT_PRESET, encode_async, img_to_preview_bytes
+from .imaging import as_image, reapply_alpha, rgbx_image
+from .registry import EFFECTS, EffectError, apply_effect
+from .shm import SharedImageHandle, attach
+from .telemetry import RenderTelemetry
+
+BACKENDS = ("thread", "process")
+
+# error e' None se l'effetto e' andato a buon fine; altrimenti contiene il
+# messaggio "Etichetta: errore" e image e' l'originale (come nell'app).
+# data: file a piena risoluzione nel formato del preset (None se non chiesto).
+# telemetry: RenderTelemetry del job (tempi per fase, picco, cache, codifica).
+RenderOutput = namedtuple("RenderOutput", ["key", "vals", "image", "preview", "data", "error",
+                                           "telemetry"], defaults=(None,))
+
+
+def _warm_worker():
+    for effect in EFFECTS:
+        effect.fn.load()
+
+
+# Lato worker: l'immagine costruita sulla vista condivisa viene riusata fra
+# i job della stessa foto, cosi' anche i piani di analysis_for (luminanza,
+# copie ridotte, blur) si calcolano una volta per worker e non una per job.
+_SHARED_SOURCES = OrderedDict()
+_MAX_SHARED_SOURCES = 2
+
+
+def _shared_source(handle):
+    hit = _SHARED_SOURCES.get(handle.name)
+    if hit is not None:
+        _SHARED_SOURCES.move_to_end(handle.name)
+        return hit
+    planes = attach(handle)
+    # niente copie della foto nel worker: l'immagine PIL e il piano "rgb"
+    # dell'analisi sono viste sullo stesso blocco condiviso
+    img = rgbx_image(planes["rgbx"])
+    an = analysis_for(img)
+    an.provide("rgb", planes["rgbx"][..., :3])
+    if "luminance" in planes:
+        an.provide("luminance", planes["luminance"])
+    alpha = Image.fromarray(planes["alpha"]) if "alpha" in planes else None
+    hit = _SHARED_SOURCES[handle.name] = (img, alpha)
+    while len(_SHARED_SOURCES) > _MAX_SHARED_SOURCES:
+        _SHARED_SOURCES.popitem(last=False)
+    return hit
+
+
+def make_executor(backend="thread", workers=None):
+    """Crea l'executor per il backend scelto (default: un worker per core).
+    I processi usano il contesto "spawn": fare fork di un server con molti
+    thread attivi (come Streamlit) puo' lasciare lock acquisiti nel figlio."""
+    workers = workers or os.cpu_count() or 1
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="glitchlab",
+                                  initializer=_warm_worker)
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_warm_worker)
+    raise ValueError(f"backend sconosciuto: {backend!r} (attesi: {', '.join(BACKENDS)})")
+
+
+def render_outputs(key, img, vals, alpha=None, encode=True, preview_dim=900, source_hash=None,
+                   preset=DEFAULT_PRESET, **kwargs):
+    """Job completo lato worker: effetto, reinserimento alpha, anteprima JPEG
+    (lato lungo preview_dim) e, se encode=True, il file a piena risoluzione
+    nel formato di `preset` (glitchlab.encoding.PRESETS) — anche la
+    codifica, spesso costosa quanto l'effetto, gira cosi' in parallelo, sul
+    pool di codifica mentre il worker prepara l'anteprima.
+
+    `img` puo' essere un'immagine PIL oppure uno SharedImageHandle (vedi
+    glitchlab.shm): in quel caso l'effetto lavora sulla vista condivisa e,
+    se il blocco contiene un piano "alpha" e `alpha` non e' dato, la
+    trasparenza viene presa da li'. Con `source_hash` (image_digest della
+    foto) il risultato passa dalla cache dei render del processo worker e
+    l'anteprima dalla cache delle anteprime (PREVIEW_CACHE). `seed` e gli
+    altri kwargs arrivano all'effetto come in apply_effect.
+    Tempi di ogni fase e picco di memoria finiscono in RenderOutput.telemetry."""
+    def compute(img, tel):
+        if source_hash is not None:
+            return cached_apply(key, img, vals, source_hash, telemetry=tel, **kwargs)
+        return apply_effect(key, img, *vals, **kwargs)
+
+    def cache_key(size):
+        return apply_key(key, size, vals, source_hash, **kwargs) if source_hash is not None else None
+    return _render_job(key, vals, compute, cache_key, img, alpha, encode, preview_dim, preset)
+
+
+def render_chain_outputs(recipe, img, alpha=None, encode=True, preview_dim=900, source_hash=None,
+                         seed=None, full_size=None, preset=DEFAULT_PRESET):
+    """Come render_outputs per una catena di effetti (glitchlab.chain.Recipe):
+    tutti gli stadi nello stesso job, senza codifiche fra uno e l'altro.
+    `seed` None = quello della ricetta. RenderOutput.key = nome della
+    ricetta, vals = valori di tutti gli stadi in fila (recipe_params)."""
+    seed = recipe.seed if seed is None else seed
+
+    def compute(img, tel):
+        if source_hash is not None:
+            return cached_chain(img, recipe.stages, source_hash, seed=seed, full_size=full_size,
+                                telemetry=tel)
+        return apply_chain(img, recipe.stages, seed=seed, full_size=full_size)
+
+    def cache_key(size):
+        if source_hash is None:
+            return None
+        return chain_key(size, recipe.stages, source_hash, seed=seed, full_size=full_size)
+    return _render_job(recipe.name, recipe_params(recipe)[0], compute, cache_key, img, alpha,
+                       encode, preview_dim, preset)
+
+
+def _render_job(key, vals, compute, cache_key, img, alpha, encode, preview_dim, preset):
+    """Parte comune dei job: sorgente (anche condivisa), compute(img, tel),
+    alpha, anteprima (in cache con la chiave cache_key(dimensioni), se non
+    None) e file codificato, con la telemetria di ogni fase."""
+    if isinstance(img, SharedImageHandle):
+        img, shared_alpha = _shared_source(img)
+        if alpha is None:
+            alpha = shared_alpha
+    img = as_image(img)
+    error = None
+    tel = RenderTelemetry(img.size)
+    with tel.trace_memory():
+        with tel.stage("compute"):
+            try:
+                result = compute(img, tel)
+            except EffectError as e:
+                result, error = img, str(e)
+        if result.mode == "RGBX":
+            # la sorgente condivisa tornata tale e quale (errore, catena
+            # senza stadi attivi): PNG e JPEG non scrivono RGBX
+            result = result.convert("RGB")
+        if alpha is not None:
+            with tel.stage("alpha"):
+                result = reapply_alpha(result, alpha)
+        pending = encode_async(result, preset, tel) if encode else None
+        # l'anteprima ignora l'alpha (JPEG): basta la chiave del render, mai
+        # quella di un render fallito (result e' l'originale)
+        ckey = cache_key(img.size) if error is None else None
+        with tel.stage("preview"):
+            preview = img_to_preview_bytes(result, max_dim=preview_dim, cache_key=ckey)
+        data = pending.result() if pending is not None else None
+    return RenderOutput(key, vals, result, preview, data, error, tel)
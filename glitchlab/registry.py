@@ -0,0 +1,337 @@
+"""Catalogo degli effetti con caricamento pigro.
+
+Ogni effetto vive in un modulo a se' in ``glitchlab.effects``; il catalogo
+qui sotto contiene solo i metadati (etichette, slider) e un riferimento
+pigro alla funzione, cosi' importare il registry non costa nulla: numpy,
+PIL e scipy vengono importati solo quando un effetto viene davvero
+eseguito la prima volta (nel processo che lo esegue).
+"""
+import importlib
+import inspect
+from collections import namedtuple
+
+
+class EffectError(Exception):
+    """Errore sollevato durante l'esecuzione di un effetto. ``str(e)`` ha la
+    forma "Etichetta: messaggio", pronta da mostrare all'utente; l'eccezione
+    originale resta disponibile in ``__cause__``."""
+
+    def __init__(self, key, label, error):
+        super().__init__(f"{label}: {error}")
+        self.key = key
+        self.label = label
+        self.error = error
+
+
+class LazyEffect:
+    """Riferimento a ``glitchlab.effects.<module>.<name>``: il modulo viene
+    importato alla prima chiamata. E' picklabile per nome (non porta con se'
+    la funzione), quindi puo' essere spedito a un worker di un process pool."""
+
+    __slots__ = ("module", "name", "_fn")
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+        self._fn = None
+
+    def load(self):
+        if self._fn is None:
+            mod = importlib.import_module(f"glitchlab.effects.{self.module}")
+            self._fn = getattr(mod, self.name)
+        return self._fn
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    @property
+    def __wrapped__(self):
+        # inspect.signature() segue __wrapped__: la firma e' quella vera
+        return self.load()
+
+    def __reduce__(self):
+        return (LazyEffect, (self.module, self.name))
+
+    def __repr__(self):
+        return f"LazyEffect({self.module!r}, {self.name!r})"
+
+
+# (key, label, emoji, fn, sliders) — stessa forma a 5 elementi usata da
+# sempre dall'app, quindi `for key, label, emoji, fn, sliders in EFFECTS`
+# continua a funzionare. Ogni slider e' (label, min, max, default, step, key).
+Effect = namedtuple("Effect", ["key", "label", "emoji", "fn", "sliders"])
+
+
+EFFECTS = [
+    Effect("ascii_art", "ASCII Art", "🔤", LazyEffect("ascii_art", "glitch_ascii_art"), [
+        ("Intensità",      0.0, 2.0, 1.0, 0.1, "as_int"),
+        ("Colore",         0.0, 1.0, 0.5, 0.05, "as_col"),
+        ("Dim. Cella",     0.2, 3.0, 1.0, 0.1, "as_cel"),
+    ]),
+    Effect("channel_swap", "Channel Swap", "🔁", LazyEffect("channel_swap", "glitch_channel_swap"), [
+        ("Modalità (0-5)", 0.0, 1.0, 0.0, 0.2,  "cs_mode"),
+        ("Blend",          0.0, 1.0, 0.6, 0.05, "cs_blend"),
+        ("Shift px",       0.0, 1.0, 0.0, 0.05, "cs_shift"),
+    ]),
+    Effect("chromatic", "Chromatic Ab.", "🌈", LazyEffect("chromatic", "glitch_chromatic"), [
+        ("Forza",          0.0, 1.0, 0.5, 0.05, "chr_forza"),
+        ("Angolo",         0.0, 1.0, 0.0, 0.05, "chr_ang"),
+        ("Zoom aberr.",    0.0, 1.0, 0.3, 0.05, "chr_zoom"),
+    ]),
+    Effect("crosshatch", "Crosshatch", "✏️", LazyEffect("crosshatch", "glitch_crosshatch"), [
+        ("Densità",        0.0, 1.0, 0.5, 0.05, "ch_den"),
+        ("Angolo",         0.0, 1.0, 0.3, 0.05, "ch_ang"),
+        ("Spessore",       0.0, 1.0, 0.3, 0.05, "ch_thick"),
+    ]),
+    Effect("datamosh", "Datamosh", "📼", LazyEffect("datamosh", "glitch_datamosh"), [
+        ("Dim. Blocchi",   0.0, 2.0, 1.0, 0.1,  "dm_block"),
+        ("Decay",          0.0, 1.0, 0.5, 0.05, "dm_decay"),
+        ("N. Blocchi",     0.0, 1.0, 0.5, 0.05, "dm_num"),
+    ]),
+    Effect("destruction_art", "Destruction Art", "✂️", LazyEffect("destruction_art", "glitch_destruction_art"), [
+        ("Tagli",          0.0, 1.0, 0.5, 0.05, "da_cuts"),
+        ("Scatter",        0.0, 1.0, 0.4, 0.05, "da_scatter"),
+        ("Asse (0=H 1=V)", 0.0, 1.0, 0.0, 0.5,  "da_asse"),
+    ]),
+    Effect("displacement_map", "Displacement Map", "🌊", LazyEffect("displacement_map", "glitch_displacement_map"), [
+        ("Forza",          0.0, 1.0, 0.5, 0.05, "dsp_forza"),
+        ("Blur Scala",     0.0, 1.0, 0.4, 0.05, "dsp_blur"),
+        ("Canale (R/G/B)", 0.0, 1.0, 0.0, 0.5,  "dsp_canale"),
+    ]),
+    Effect("distruttivo", "Distruttivo", "💥", LazyEffect("distruttivo", "glitch_distruttivo"), [
+        ("Dim. Blocchi",   0.0, 2.0, 1.0, 0.1,  "dest_size"),
+        ("Num. Blocchi",   0.0, 2.0, 1.0, 0.1,  "dest_num"),
+        ("Spostamento",    0.0, 2.0, 1.0, 0.1,  "dest_disp"),
+    ]),
+    Effect("drip", "Drip Sort", "🌊💧", LazyEffect("drip", "glitch_drip"), [
+        ("Soglia lum.",    0.0, 1.0, 0.3, 0.05, "drip_soglia"),
+        ("Sep. RGB",       0.0, 1.0, 0.5, 0.05, "drip_rgb"),
+        ("Asse (0=V 1=H)", 0.0, 1.0, 0.0, 0.5,  "drip_asse"),
+    ]),
+    Effect("duotone", "Duotone", "🎭", LazyEffect("duotone", "glitch_duotone"), [
+        ("Colore 1 (hue)", 0.0, 1.0, 0.1, 0.05, "dt_c1"),
+        ("Colore 2 (hue)", 0.0, 1.0, 0.6, 0.05, "dt_c2"),
+        ("Blend",          0.0, 1.0, 0.8, 0.05, "dt_blend"),
+    ]),
+    Effect("analogic", "Glitch Analogic", "📻", LazyEffect("analogic", "glitch_analogic"), [
+        ("Sync Loss",      0.0, 1.0, 0.5, 0.05, "ag_sync"),
+        ("Color Bleed",    0.0, 1.0, 0.4, 0.05, "ag_bleed"),
+        ("Static",         0.0, 1.0, 0.3, 0.05, "ag_static"),
+    ]),
+    Effect("halftone", "Halftone", "🔵", LazyEffect("halftone", "glitch_halftone"), [
+        ("Dim. Punto",     0.0, 1.0, 0.4, 0.05, "ht_size"),
+        ("Sfondo bianco",  0.0, 1.0, 1.0, 0.5,  "ht_sfondo"),
+        ("Colore",         0.0, 1.0, 0.7, 0.05, "ht_color"),
+        ("Angolo retino (0-90°)", 0.0, 1.0, 0.0, 0.05, "ht_angle"),
+        ("CMYK (0=mono 1=CMYK)",  0.0, 1.0, 0.0, 1.0,  "ht_cmyk"),
+    ]),
+    Effect("image_feedback", "Image Feedback", "📡🔁", LazyEffect("image_feedback", "glitch_image_feedback"), [
+        ("Zoom",           0.0, 1.0, 0.5, 0.05, "fb_zoom"),
+        ("Iterazioni",     0.0, 1.0, 0.4, 0.05, "fb_iter"),
+        ("Decay",          0.0, 1.0, 0.5, 0.05, "fb_decay"),
+    ]),
+    Effect("klimt_mosaico", "Klimt Mosaico", "🟨", LazyEffect("klimt_mosaico", "glitch_klimt_mosaico"), [
+        ("Dim. Tessere",   0.0, 1.0, 0.5, 0.05, "kl_size"),
+        ("Doratura",       0.0, 1.0, 0.6, 0.05, "kl_gold"),
+        ("Irregolarità",   0.0, 1.0, 0.4, 0.05, "kl_irreg"),
+    ]),
+    Effect("lichtenstein_comic", "Lichtenstein Comic", "💬", LazyEffect("lichtenstein_comic", "glitch_lichtenstein_comic"), [
+        ("Contrasto Colori",   0.0, 1.0, 0.5, 0.05, "li_contrast"),
+        ("Dimensione Puntini", 0.0, 1.0, 0.5, 0.05, "li_dots"),
+        ("Spessore Contorno",  0.0, 1.0, 0.4, 0.05, "li_outline"),
+    ]),
+    Effect("mirror_kal", "Mirror Kaleido.", "🪞", LazyEffect("mirror_kal", "glitch_mirror_kaleidoscope"), [
+        ("Specchi (4/6/8)", 0.0, 1.0, 0.3, 0.1,  "mk_mirrors"),
+        ("Rotazione",       0.0, 1.0, 0.0, 0.05, "mk_rot"),
+        ("Zoom",            0.0, 1.0, 0.5, 0.05, "mk_zoom"),
+    ]),
+    Effect("moire", "Moire Pattern", "🔲", LazyEffect("moire", "glitch_moire"), [
+        ("Frequenza 1",    0.0, 1.0, 0.4, 0.05, "mo_f1"),
+        ("Frequenza 2",    0.0, 1.0, 0.6, 0.05, "mo_f2"),
+        ("Angolo",         0.0, 1.0, 0.3, 0.05, "mo_ang"),
+    ]),
+    Effect("mondrian", "Mondrian", "🟦", LazyEffect("mondrian", "glitch_mondrian"), [
+        ("Complessità",     0.0, 1.0, 0.55, 0.05, "mn_complex"),
+        ("Spessore Linee",  0.0, 1.0, 0.5,  0.05, "mn_lines"),
+        ("Vivacità Colori", 0.0, 1.0, 0.6,  0.05, "mn_vivid"),
+    ]),
+    Effect("munch_onde", "Munch Onde", "🌊😱", LazyEffect("munch_onde", "glitch_munch_onde"), [
+        ("Ampiezza Onde",     0.0, 1.0, 0.5,  0.05, "mu_amp"),
+        ("Frequenza",         0.0, 1.0, 0.5,  0.05, "mu_freq"),
+        ("Intensità Colore",  0.0, 1.0, 0.55, 0.05, "mu_col"),
+    ]),
+    Effect("neon_glow", "Neon Glow", "💡", LazyEffect("neon_glow", "glitch_neon_glow"), [
+        ("Soglia bordi",   0.0, 1.0, 0.3, 0.05, "ng_thresh"),
+        ("Ampiezza glow",  0.0, 1.0, 0.5, 0.05, "ng_width"),
+        ("Colore (0-4)",   0.0, 1.0, 0.0, 0.25, "ng_color"),
+    ]),
+    Effect("noise", "Noise", "🌀", LazyEffect("noise", "glitch_noise"), [
+        ("Intensità",      0.0, 2.0, 1.0, 0.1,  "noise_int"),
+        ("Copertura",      0.0, 1.0, 0.7, 0.05, "noise_cov"),
+        ("Tipo (0=bande 0.5=pixel 1=onde)", 0.0, 1.0, 0.0, 0.01, "noise_tipo"),
+    ]),
+    Effect("oil_paint", "Oil Paint", "🖌️", LazyEffect("oil_paint", "glitch_oil_paint"), [
+        ("Raggio",         0.0, 1.0, 0.3, 0.05, "op_rad"),
+        ("Livelli",        0.0, 1.0, 0.5, 0.05, "op_lev"),
+        ("Blend",          0.0, 1.0, 0.7, 0.05, "op_blend"),
+    ]),
+    Effect("op_art_circles", "Op Art Circles", "⭕", LazyEffect("op_art_circles", "glitch_op_art_circles"), [
+        ("Frequenza",      0.0, 1.0, 0.5, 0.05, "oa_freq"),
+        ("Contrasto",      0.0, 1.0, 0.6, 0.05, "oa_cont"),
+        ("Blend",          0.0, 1.0, 0.5, 0.05, "oa_blend"),
+    ]),
+    Effect("pixel_sort", "Pixel Sort", "🔀", LazyEffect("pixel_sort", "glitch_pixel_sort"), [
+        ("Soglia lum.",    0.0, 1.0, 0.4, 0.05, "ps_thresh"),
+        ("Asse (0=H 1=V)", 0.0, 1.0, 1.0, 0.5,  "ps_asse"),
+        ("Span max",       0.0, 1.0, 0.8, 0.05, "ps_span"),
+        ("Chiave (lum/hue/sat/R/G/B)", 0.0, 1.0, 0.0, 0.2, "ps_key"),
+        ("Intervalli (0=soglia 1=bordi)", 0.0, 1.0, 0.0, 1.0, "ps_mask"),
+    ]),
+    Effect("polar", "Polar Coords", "🌀", LazyEffect("polar", "glitch_polar"), [
+        ("Forza",          0.0, 1.0, 0.6, 0.05, "pol_str"),
+        ("Rotazione",      0.0, 1.0, 0.0, 0.05, "pol_rot"),
+        ("Zoom",           0.0, 1.0, 0.5, 0.05, "pol_zoom"),
+    ]),
+    Effect("pop_art_warhol", "Pop Art Warhol", "🍅", LazyEffect("pop_art_warhol", "glitch_pop_art_warhol"), [
+        ("Contrasto",        0.0, 1.0, 0.6, 0.05, "pa_cont"),
+        ("Palette (0-6)",    0.0, 1.0, 0.0, 0.143, "pa_pal"),
+        ("Misregistrazione", 0.0, 1.0, 0.4, 0.05, "pa_mis"),
+    ]),
+    Effect("posterize", "Posterize", "🎨", LazyEffect("posterize", "glitch_posterize"), [
+        ("Livelli",        0.0, 1.0, 0.4, 0.05, "po_lev"),
+        ("Dither",         0.0, 1.0, 0.4, 0.05, "po_dith"),
+        ("Color Shift",    0.0, 1.0, 0.3, 0.05, "po_col"),
+    ]),
+    Effect("psychedelic", "Psychedelic", "🔮", LazyEffect("psychedelic", "glitch_psychedelic"), [
+        ("Hue Shift",      0.0, 1.0, 0.3, 0.05, "psy_hue"),
+        ("Saturazione",    0.0, 1.0, 0.5, 0.05, "psy_sat"),
+        ("Inversione",     0.0, 1.0, 0.0, 0.05, "psy_inv"),
+    ]),
+    Effect("retro_palette", "Retro Palette C64", "🕹️", LazyEffect("retro_palette", "glitch_retro_palette"), [
+        ("Intensità",      0.0, 2.0, 1.0, 0.1, "rp_int"),
+        ("Dithering",      0.0, 1.0, 0.5, 0.05, "rp_dit"),
+        ("Dim. Pixel",     0.2, 3.0, 1.0, 0.1, "rp_pix"),
+    ]),
+    Effect("rothko", "Rothko", "🟪", LazyEffect("rothko", "glitch_rothko"), [
+        ("Bande",       0.0, 1.0, 0.4, 0.05, "rk_bands"),
+        ("Sfumatura",   0.0, 1.0, 0.5, 0.05, "rk_feather"),
+        ("Grana Tela",  0.0, 1.0, 0.4, 0.05, "rk_grain"),
+    ]),
+    Effect("rutt_etra", "Rutt-Etra", "📺⚡", LazyEffect("rutt_etra", "glitch_rutt_etra"), [
+        ("Intensità",      0.0, 2.0, 1.0, 0.1, "re_int"),
+        ("Densità Linee",  0.2, 2.0, 1.0, 0.1, "re_spc"),
+        ("Spostamento",    0.0, 2.0, 1.0, 0.1, "re_dsp"),
+    ]),
+    Effect("scanline_burn", "Scanline Burn", "📟", LazyEffect("scanline_burn", "glitch_scanline_burn"), [
+        ("Intensità",      0.0, 2.0, 1.0, 0.1,  "sb_int"),
+        ("Densità",        0.0, 1.0, 0.4, 0.05, "sb_den"),
+        ("Color Bleed",    0.0, 1.0, 0.5, 0.05, "sb_bleed"),
+    ]),
+    Effect("solarize", "Solarize", "☀️", LazyEffect("solarize", "glitch_solarize"), [
+        ("Soglia",         0.0, 1.0, 0.5, 0.05, "sol_thresh"),
+        ("Forza",          0.0, 1.0, 0.8, 0.05, "sol_str"),
+        ("Channel Split",  0.0, 1.0, 0.3, 0.05, "sol_ch"),
+    ]),
+    Effect("stippling", "Stippling", "🔴", LazyEffect("stippling", "glitch_stippling"), [
+        ("Densità",        0.0, 1.0, 0.5, 0.05, "st_den"),
+        ("Dim. Punto",     0.0, 1.0, 0.4, 0.05, "st_dot"),
+        ("Colore",         0.0, 1.0, 0.6, 0.05, "st_col"),
+    ]),
+    Effect("temporal_bands", "Temporal Bands", "⏳🎞️", LazyEffect("temporal_bands", "glitch_temporal_bands"), [
+        ("Intensità",       0.0, 1.0, 0.7, 0.05, "tbs_int"),
+        ("Ampiezza Bande",  0.0, 1.0, 0.5, 0.05, "tbs_amp"),
+        ("Spostamento",     0.0, 1.0, 0.6, 0.05, "tbs_spo"),
+    ]),
+    Effect("thermal", "Thermal Camera", "🌡️", LazyEffect("thermal", "glitch_thermal"), [
+        ("Palette (0-2)",  0.0, 1.0, 0.0, 0.5,  "th_pal"),
+        ("Rumore",         0.0, 1.0, 0.2, 0.05, "th_noise"),
+        ("Contrasto",      0.0, 1.0, 0.6, 0.05, "th_cont"),
+    ]),
+    Effect("tunnel_zoom", "Tunnel Zoom", "🔭", LazyEffect("tunnel_zoom", "glitch_tunnel_zoom"), [
+        ("Strati",         0.0, 1.0, 0.5, 0.05, "tz_layers"),
+        ("Velocità",       0.0, 1.0, 0.5, 0.05, "tz_speed"),
+        ("Color Shift",    0.0, 1.0, 0.3, 0.05, "tz_col"),
+    ]),
+    Effect("van_gogh_swirl", "Van Gogh Swirl", "🌌", LazyEffect("van_gogh_swirl", "glitch_van_gogh"), [
+        ("Turbolenza",  0.0, 1.0, 0.6, 0.05, "vg_turb"),
+        ("Pennellata",  0.0, 1.0, 0.5, 0.05, "vg_brush"),
+        ("Saturazione", 0.0, 1.0, 0.5, 0.05, "vg_sat"),
+    ]),
+    Effect("vhs", "VHS", "📺", LazyEffect("vhs", "glitch_vhs"), [
+        ("Intensità",      0.0, 2.0, 1.0, 0.1,  "vhs_int"),
+        ("Scanlines",      0.0, 2.0, 1.0, 0.1,  "vhs_scan"),
+        ("Color Split",    0.0, 2.0, 1.0, 0.1,  "vhs_col"),
+    ]),
+    Effect("wave_interference", "Wave Interference", "📶", LazyEffect("wave_interference", "glitch_wave_interference"), [
+        ("Frequenza",         0.0, 1.0, 0.55, 0.05, "wi_freq"),
+        ("Deformazione",      0.0, 1.0, 0.65, 0.05, "wi_warp"),
+        ("Aberr. Cromatica",  0.0, 1.0, 0.5,  0.05, "wi_chroma"),
+    ]),
+    Effect("wave_warp", "Wave Warp", "〰️", LazyEffect("wave_warp", "glitch_wave_warp"), [
+        ("Ampiezza",       0.0, 2.0, 1.0, 0.1,  "ww_amp"),
+        ("Frequenza",      0.0, 2.0, 1.0, 0.1,  "ww_freq"),
+        ("Asse (0=H 1=V)", 0.0, 1.0, 0.0, 0.5,  "ww_asse"),
+    ]),
+]
+
+EFFECTS_BY_KEY = {e.key: e for e in EFFECTS}
+
+
+def get_effect(key):
+    """Ritorna l'Effect con la chiave data (KeyError se non esiste)."""
+    return EFFECTS_BY_KEY[key]
+
+
+def default_values(key):
+    """Valori di default degli slider dell'effetto, nell'ordine della firma."""
+    return [s[3] for s in get_effect(key).sliders]
+
+
+def complete_values(key, vals):
+    """Valori slider espliciti di un effetto, validati: uno per slider ed
+    entro i range; quelli mancanti in coda restano al default, cosi' gli
+    slider aggiunti dopo non rompono specifiche e ricette esistenti.
+    ValueError se sono troppi o fuori range."""
+    sliders = get_effect(key).sliders
+    vals = [float(v) for v in vals]
+    if len(vals) > len(sliders):
+        raise ValueError(f"{key}: al massimo {len(sliders)} valori "
+                         f"({', '.join(s[0] for s in sliders)}), ricevuti {len(vals)}")
+    vals += default_values(key)[len(vals):]
+    for (slabel, smin, smax, *_), v in zip(sliders, vals):
+        if not smin <= v <= smax:
+            raise ValueError(f"{key}: {slabel}={v} fuori range [{smin}, {smax}]")
+    return vals
+
+
+def accepts_param(key, name):
+    """True se la funzione dell'effetto accetta il parametro keyword `name`
+    (es. 'variation_seed'). Importa il modulo dell'effetto se serve."""
+    return name in inspect.signature(get_effect(key).fn).parameters
+
+
+def supported_kwargs(key, **kwargs):
+    """Filtra i parametri keyword opzionali (es. seed, variation_seed, full_size)
+    tenendo solo quelli che l'effetto accetta e che non sono None."""
+    return {name: v for name, v in kwargs.items()
+            if v is not None and accepts_param(key, name)}
+
+
+def apply_effect(key, img, *vals, seed=None, **kwargs):
+    """Esegue l'effetto `key` su `img` (immagine PIL o array uint8) con i
+    valori slider `vals`. Qualunque errore interno viene rilanciato come
+    EffectError (mai inghiottito): sta al chiamante decidere se mostrarlo,
+    loggarlo o ricadere sull'originale.
+
+    `seed` (intero, SeedSequence o np.random.Generator, vedi
+    glitchlab.seeding) si puo' passare a qualunque effetto: arriva a quelli
+    con una componente casuale, gli effetti deterministici lo ignorano."""
+    from .imaging import as_image
+
+    effect = get_effect(key)
+    if seed is not None and accepts_param(key, "seed"):
+        kwargs["seed"] = seed
+    try:
+        return effect.fn(as_image(img), *vals, **kwargs)
+    except Exception as e:
+        raise EffectError(key, effect.label, e) from e
@@ -0,0 +1,186 @@
+"""Report testuale (TECHNICAL LOG SHEET) allegato a ogni immagine generata."""
+
+
+EFFECT_QUOTES = {
+    "analogic":         "Il segnale ha perso il sincronismo. L'antenna non risponde.",
+    "ascii_art":        "L'immagine e' diventata testo. Il carattere ha sostituito il colore.",
+    "chain":            "Ogni strato corrompe quello sotto. Il glitch si somma al glitch.",
+    "channel_swap":     "I canali si sono scambiati. Il colore non riconosce se stesso.",
+    "chromatic":        "Il prisma ha spezzato la luce. I colori non tornano piu'.",
+    "crosshatch":       "Il tratteggio ha sostituito il colore. L'incisione non mente.",
+    "datamosh":         "Il frame e' rimasto bloccato. Il tempo non scorre piu'.",
+    "destruction_art":  "L'immagine e' stata tagliata. Il collage e' l'unica verita'.",
+    "displacement_map": "Il pixel si e' spostato seguendo se stesso. Lo spazio e' curvo.",
+    "distruttivo":      "I blocchi si sono spostati. La struttura non esiste piu'.",
+    "drip":             "La gravita' ha scelto i colori. Il pixel ha obbedito alla caduta.",
+    "duotone":          "Due colori soltanto. La sintesi e' la forma piu' alta.",
+    "halftone":         "La stampa ha dissolto l'immagine. Il punto e' tutto cio' che resta.",
+    "image_feedback":   "Lo schermo si e' guardato allo specchio. L'infinito e' iniziato.",
+    "klimt_mosaico":    "L'oro non decora la superficie, la sostituisce. Ogni tessera e' un frammento di eternita'.",
+    "lichtenstein_comic": "Il punto e' l'unita' minima dell'emozione stampata. Whaam.",
+    "mirror_kal":       "Gli specchi si sono moltiplicati. La simmetria e' diventata religione.",
+    "moire":            "Le griglie si sono scontrate. Il pattern e' nato dal conflitto.",
+    "mondrian":         "Linee nere, campi di colore puro. L'ordine e' geometria, non decorazione.",
+    "munch_onde":       "Il cielo urla in cerchi concentrici. Il colore non descrive, grida.",
+    "neon_glow":        "I bordi si sono accesi. Il buio esalta la luce.",
+    "noise":            "Il segnale e' collassato. Il rumore ha preso il controllo.",
+    "oil_paint":        "Il pennello ha ridisegnato la realta'. La texture ha vinto sul pixel.",
+    "op_art_circles":   "I cerchi hanno ipnotizzato la forma. L'occhio non trova pace.",
+    "pixel_sort":       "La luce ha scelto il suo ordine. Il pixel ha obbedito.",
+    "polar":            "Lo spazio si e' avvolto su se stesso. Il centro non esiste piu'.",
+    "pop_art_warhol":   "Quindici minuti di celebrita', fissati in un fotogramma acido. La serigrafia non perdona.",
+    "posterize":        "Il colore e' stato ridotto all'essenziale. La serigrafia non perdona.",
+    "psychedelic":      "L'hue ha ruotato oltre il visibile. La realta' e' soggettiva.",
+    "retro_palette":    "Sedici colori bastano per ricordare tutto. Il pixel e' tornato all'origine.",
+    "rothko":           "Grandi campi di colore che respirano piano. Nessun dettaglio, solo soglia.",
+    "rutt_etra":        "Lo scanner ha riscritto la riga secondo la luce. Il segnale e' diventato forma.",
+    "scanline_burn":    "Il tubo e' bruciato. Il CRT ricorda ancora.",
+    "solarize":         "La luce si e' invertita. La camera oscura ha tradito l'originale.",
+    "stippling":        "Il punto e' la minima unita' di verita'. Milioni di punti, una sola immagine.",
+    "temporal_bands":   "Ogni riga ricorda un istante diverso. Il tempo non e' piu' uno solo.",
+    "thermal":          "Il calore ha riscritto i colori. La temperatura e' la nuova forma.",
+    "tunnel_zoom":      "L'immagine e' collassata verso l'interno. Il tunnel non ha fondo.",
+    "van_gogh_swirl":   "Il cielo si muove anche quando l'immagine e' ferma. Vortici, non pennellate.",
+    "vhs":              "Il nastro ha consumato i colori. La memoria e' distorta.",
+    "wave_interference": "La griglia ha imparato la luce. Ogni riga porta la memoria del volto.",
+    "wave_warp":        "La materia e' diventata liquida. La forma e' un'illusione.",
+}
+
+EFFECT_QUOTES_EN = {
+    "analogic":         "The signal lost sync. The antenna no longer answers.",
+    "ascii_art":        "The image has become text. The character has replaced color.",
+    "chain":            "Every layer corrupts the one beneath. Glitch stacks on glitch.",
+    "channel_swap":     "The channels traded places. Color no longer recognizes itself.",
+    "chromatic":        "The prism split the light. The colors never return.",
+    "crosshatch":       "Hatching has replaced color. The engraving does not lie.",
+    "datamosh":         "The frame got stuck. Time no longer flows.",
+    "destruction_art":  "The image has been cut apart. Collage is the only truth.",
+    "displacement_map": "The pixel moved, following itself. Space is curved.",
+    "distruttivo":      "The blocks have shifted. Structure no longer exists.",
+    "drip":             "Gravity chose the colors. The pixel obeyed the fall.",
+    "duotone":          "Only two colors. Synthesis is the highest form.",
+    "halftone":         "Printing dissolved the image. The dot is all that remains.",
+    "image_feedback":   "The screen looked at itself in the mirror. Infinity began.",
+    "klimt_mosaico":    "Gold doesn't decorate the surface, it replaces it. Every tessera is a fragment of eternity.",
+    "lichtenstein_comic": "The dot is the smallest unit of printed emotion. Whaam.",
+    "mirror_kal":       "The mirrors multiplied. Symmetry became religion.",
+    "moire":            "The grids collided. The pattern was born from conflict.",
+    "mondrian":         "Black lines, fields of pure color. Order is geometry, not decoration.",
+    "munch_onde":       "The sky screams in concentric circles. Color doesn't describe, it shouts.",
+    "neon_glow":        "The edges lit up. Darkness makes the light shine.",
+    "noise":            "The signal collapsed. Noise took control.",
+    "oil_paint":        "The brush redrew reality. Texture won over pixel.",
+    "op_art_circles":   "The circles hypnotized the shape. The eye finds no rest.",
+    "pixel_sort":       "Light chose its own order. The pixel obeyed.",
+    "polar":            "Space folded in on itself. The center no longer exists.",
+    "pop_art_warhol":   "Fifteen minutes of fame, fixed in an acid frame. The screen print never forgives.",
+    "posterize":        "Color has been reduced to its essence. The screen print never forgives.",
+    "psychedelic":      "Hue rotated past the visible. Reality is subjective.",
+    "retro_palette":    "Sixteen colors are enough to remember everything. The pixel returned to its origin.",
+    "rothko":           "Large fields of color breathing slowly. No detail, only threshold.",
+    "rutt_etra":        "The scanner rewrote the line according to the light. The signal became form.",
+    "scanline_burn":    "The tube is burnt. The CRT still remembers.",
+    "solarize":         "The light inverted itself. The darkroom betrayed the original.",
+    "stippling":        "The dot is the smallest unit of truth. A million dots, one image.",
+    "temporal_bands":   "Every row remembers a different instant. Time is no longer singular.",
+    "thermal":          "Heat rewrote the colors. Temperature is the new form.",
+    "tunnel_zoom":      "The image collapsed inward. The tunnel has no bottom.",
+    "van_gogh_swirl":   "The sky moves even while the image stands still. Vortices, not brushstrokes.",
+    "vhs":              "The tape consumed the colors. Memory is distorted.",
+    "wave_interference": "The grid learned the light. Every line carries the memory of a face.",
+    "wave_warp":        "Matter has become liquid. Form is an illusion.",
+}
+
+EFFECT_ENGINES = {
+    "analogic":         "analog_sync_engine",
+    "ascii_art":        "glyph_luminance_engine",
+    "chain":            "fused_chain_engine",
+    "channel_swap":     "channel_matrix_engine",
+    "chromatic":        "radial_aberration_core",
+    "crosshatch":       "hatch_render_engine",
+    "datamosh":         "frame_decay_engine",
+    "destruction_art":  "strip_collage_engine",
+    "displacement_map": "self_displacement_engine",
+    "distruttivo":      "block_fragment_engine",
+    "drip":             "directional_drip_sort_engine",
+    "duotone":          "dual_color_engine",
+    "halftone":         "halftone_dot_engine",
+    "image_feedback":   "recursive_zoom_engine",
+    "klimt_mosaico":    "voronoi_tessera_gold_engine",
+    "lichtenstein_comic": "bendday_dotscreen_edge_engine",
+    "mirror_kal":       "radial_symmetry_engine",
+    "moire":            "grid_interference_engine",
+    "mondrian":         "recursive_bsp_destijl_engine",
+    "munch_onde":       "concentric_flowfield_engine",
+    "neon_glow":        "edge_neon_engine",
+    "noise":            "entropy_noise_core",
+    "oil_paint":        "kuwahara_paint_engine",
+    "op_art_circles":   "concentric_wave_engine",
+    "pixel_sort":       "luminance_sort_engine",
+    "polar":            "polar_coords_engine",
+    "pop_art_warhol":   "silkscreen_grid_engine",
+    "posterize":        "color_quantize_engine",
+    "psychedelic":      "hue_rotation_core",
+    "retro_palette":    "c64_palette_quantize_engine",
+    "rothko":           "band_segmentation_feather_engine",
+    "rutt_etra":        "scan_luminance_engine",
+    "scanline_burn":    "crt_burn_engine",
+    "solarize":         "highlight_invert_engine",
+    "stippling":        "pointillism_engine",
+    "temporal_bands":   "temporal_band_slicer_engine",
+    "thermal":          "false_color_engine",
+    "tunnel_zoom":      "tunnel_zoom_engine",
+    "van_gogh_swirl":   "structure_tensor_vortex_engine",
+    "vhs":              "magnetic_tape_engine",
+    "wave_interference": "phase_grating_interference_engine",
+    "wave_warp":        "sinusoidal_warp_engine",
+}
+
+
+def make_report(effect_key, effect_label, img_size, param_vals, param_labels, ts, seed=None,
+                telemetry=None):
+    """Report testuale in UTF-8. Con `telemetry` (glitchlab.telemetry.RenderTelemetry)
+    il TECHNICAL LOG SHEET riporta anche risoluzione del render, cache, tempi
+    per fase e picco di memoria."""
+    w, h = img_size
+    mpx = w * h / 1_000_000
+    date_str, time_str = ts.split(" ")
+    engine = EFFECT_ENGINES.get(effect_key, "unknown_engine")
+    quote_it = EFFECT_QUOTES.get(effect_key, "Il glitch e' la verita'.")
+    quote_en = EFFECT_QUOTES_EN.get(effect_key, "The glitch is the truth.")
+    # "chain" = catena di effetti (glitchlab.chain)
+    process_it, process_en = (("Corruzione Multi Strato", "Multi-Layer Corruption") if effect_key == "chain"
+                              else ("Corruzione Singolo Strato", "Single-Layer Corruption"))
+    avg_pct = int(sum(param_vals) / len(param_vals) / 2.0 * 100) if param_vals else 0
+    lines = [
+        f"GLITCHLAB [IMAGE] // {effect_label.upper()} // 01 //",
+        f":: MOTORE / ENGINE: {engine} [v3.0]",
+        f":: PROCESSO / PROCESS: {process_it} — {effect_label.upper()} "
+        f"/ {process_en} — {effect_label.upper()}",
+        "",
+        f'"{quote_it}"',
+        f'"{quote_en}"',
+        "",
+        "> TECHNICAL LOG SHEET:",
+        f"* Asset: {w} x {h} px  ({mpx:.2f} Mpx)",
+        f"* Data / Date: {date_str}  //  {time_str}",
+        f"* Effect Index: {avg_pct}%",
+    ]
+    if seed is not None:
+        lines.append(f"* Seed: {seed}")
+    if telemetry is not None:
+        lines += [f"* {line}" for line in telemetry.lines(full_size=img_size)]
+    lines += [
+        "",
+        f"> {effect_label.upper()} ENGINE — PARAMETRI / PARAMETERS:",
+    ]
+    for label, val in zip(param_labels, param_vals):
+        lines.append(f"* {label:<22}: {val:.2f}")
+    lines += [
+        "",
+        "> Regia e Algoritmo / Direction & Algorithm: Loop507",
+        "",
+        "#glitchart #glitchlab #loop507 #digitaldestruction",
+        "#signalcorruption #experimentalimage #computationalminimalism",
+    ]
+    return "\n".join(lines).encode("utf-8")
@@ -0,0 +1,31 @@
+"""Seed dei generatori casuali degli effetti.
+
+Ogni effetto con una componente casuale accetta il parametro ``seed``: un
+intero, un np.random.SeedSequence o un np.random.Generator gia' pronto.
+Nessun effetto usa lo stato globale di ``random`` / ``np.random``, quindi
+stessi valori e stesso seed danno lo stesso risultato bit per bit, anche
+con piu' effetti in parallelo su thread diversi, e il risultato si puo'
+mettere in cache. Senza seed ogni effetto usa un seed fisso.
+
+Per piu' job (batch, varianti) ``spawn_seeds`` deriva un seed per job da un
+unico seed di partenza via SeedSequence: il seed del job dipende solo dalla
+sua posizione, non dal numero di worker ne' dall'ordine di esecuzione.
+"""
+import numpy as np
+
+DEFAULT_SEED = 0
+
+
+def make_rng(seed=None, default=DEFAULT_SEED):
+    """np.random.Generator per un render: seed None -> seed fisso `default`;
+    un Generator viene usato cosi' com'e' (il suo stato lo gestisce il
+    chiamante)."""
+    return np.random.default_rng(default if seed is None else seed)
+
+
+def spawn_seeds(seed, n):
+    """n seed interi indipendenti derivati da `seed` (None = DEFAULT_SEED) con
+    SeedSequence.spawn. Interi e non Generator: picklabili per i process
+    pool, usabili come chiave di cache e da riportare nel report."""
+    root = np.random.SeedSequence(DEFAULT_SEED if seed is None else seed)
+    return [int(child.generate_state(1, np.uint64)[0]) for child in root.spawn(n)]
@@ -0,0 +1,118 @@
+"""Immagine sorgente in memoria condivisa per il fan-out su piu' processi.
+
+Spedire a ogni worker la stessa foto serializzata (48 MP RGB = ~144 MB per
+job) si mangia quasi tutto il guadagno del parallelismo. SharedImage copia
+la sorgente decodificata (piu' eventuali piani derivati, es. luminanza, e
+il canale alpha) una sola volta in un blocco multiprocessing.shared_memory;
+ai worker arriva solo lo SharedImageHandle (nome + layout, pochi byte), da
+cui `attach` ricava viste NumPy read-only senza copie.
+
+I pixel stanno nel piano "rgbx" (h, w, 4), con un byte vuoto per pixel: e'
+il layout che PIL sa mappare senza copia (imaging.rgbx_image), mentre una
+vista RGB da 3 byte diventerebbe un'immagine solo copiandola intera in ogni
+worker. Un terzo di memoria condivisa in piu', una volta sola, al posto di
+una copia privata della foto per processo.
+
+Il blocco vive finche' vive l'oggetto SharedImage (o fino a close()): nell'app
+e' legato all'upload corrente e viene liberato quando la foto cambia.
+"""
+import weakref
+from collections import OrderedDict, namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# planes: tupla di (nome, offset, shape, dtype.str) — tutto picklabile
+SharedImageHandle = namedtuple("SharedImageHandle", ["name", "planes"])
+
+_ALIGN = 64
+
+
+def _release(shm):
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedImage:
+    """Proprietario del blocco condiviso (lato processo principale)."""
+
+    def __init__(self, img, luminance=False, alpha=None):
+        rgbx = np.asarray(img.convert("RGBX"))
+        rgb = rgbx[..., :3]
+        planes = {"rgbx": rgbx}
+        if luminance:
+            f = rgb.astype(np.float32)
+            planes["luminance"] = f[..., 0] * 0.299 + f[..., 1] * 0.587 + f[..., 2] * 0.114
+        if alpha is not None:
+            planes["alpha"] = np.asarray(alpha.convert("L"))
+
+        layout = []
+        offset = 0
+        for name, arr in planes.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            layout.append((name, offset, arr.shape, arr.dtype.str))
+            offset += arr.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, off, shape, dtype in layout:
+            np.ndarray(shape, dtype, buffer=shm.buf, offset=off)[...] = planes[name]
+
+        self.size = img.size
+        self.nbytes = offset
+        self.handle = SharedImageHandle(shm.name, tuple(layout))
+        self._finalizer = weakref.finalize(self, _release, shm)
+
+    def close(self):
+        """Libera il blocco (idempotente). I worker ancora attaccati tengono
+        in vita la propria mappatura finche' non la rilasciano."""
+        self._finalizer()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+
+# Lato worker: poche mappature tenute aperte fra un job e l'altro (i 41
+# job della stessa foto riusano la stessa); le piu' vecchie vengono chiuse.
+_ATTACHED = OrderedDict()
+_MAX_ATTACHED = 2
+
+
+def _open(name):
+    try:
+        # Python 3.13+: il worker non deve registrare il blocco nel resource
+        # tracker, altrimenti all'uscita lo considererebbe "suo" e lo rimuoverebbe
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _detach(shm, views):
+    views.clear()
+    try:
+        shm.close()
+    except BufferError:
+        # qualche vista e' ancora referenziata: la mappatura verra' chiusa dal GC
+        pass
+
+
+def attach(handle):
+    """Ritorna {nome_piano: ndarray read-only} che puntano direttamente al
+    blocco condiviso, senza copie."""
+    hit = _ATTACHED.get(handle.name)
+    if hit is not None:
+        _ATTACHED.move_to_end(handle.name)
+        return hit[1]
+    shm = _open(handle.name)
+    views = {}
+    for name, off, shape, dtype in handle.planes:
+        view = np.ndarray(shape, dtype, buffer=shm.buf, offset=off)
+        view.flags.writeable = False
+        views[name] = view
+    _ATTACHED[handle.name] = (shm, views)
+    while len(_ATTACHED) > _MAX_ATTACHED:
+        _detach(*_ATTACHED.popitem(last=False)[1])
+    return views
+
@@ -0,0 +1,131 @@
+"""Telemetria dei render: tempi per fase e picco di memoria.
+
+Ogni render dell'app, del pool e del batch compila un RenderTelemetry:
+
+    tel = RenderTelemetry(img.size)
+    with tel.trace_memory():
+        with tel.stage("compute"):
+            result = cached_apply(key, img, vals, digest, telemetry=tel)
+        data = img_to_bytes(result, "webp", telemetry=tel)
+
+Le fasi sono quelle di STAGES (decodifica, calcolo, alpha, anteprima,
+codifica del file); ogni codifica registra anche preset, tempo e byte in
+`encodings` (vedi glitchlab.encoding). Il picco e' quello della memoria
+tracciata da tracemalloc (array NumPy e oggetti Python, non i buffer interni
+di PIL) durante il blocco trace_memory. tracemalloc e'
+globale al processo: con piu' render insieme sul pool a thread il picco
+comprende anche gli altri. GLITCHLAB_TRACE_MEMORY=0 lo disattiva (i tempi
+restano), tracemalloc rallenta un po' gli effetti con loop Python.
+"""
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# fase -> etichetta "italiano/english" per UI e report, nell'ordine di un render
+STAGES = {
+    "decode": "decodifica/decode",
+    "compute": "calcolo/compute",
+    "alpha": "alpha",
+    "preview": "anteprima/preview",
+    "encode": "codifica/encode",
+}
+
+TRACE_MEMORY = os.environ.get("GLITCHLAB_TRACE_MEMORY", "1") != "0"
+
+# render che stanno tracciando: tracemalloc parte col primo e si ferma con
+# l'ultimo (se non era gia' attivo per altri motivi, es. un benchmark)
+_TRACE_LOCK = threading.Lock()
+_TRACE_USERS = 0
+_TRACE_OWNED = False
+
+
+class RenderTelemetry:
+    """Numeri di un render: `seconds` per fase, `peak_bytes` (None se non
+    tracciato), `size` del render (puo' essere il proxy ridotto) e `cached`
+    (True/False se il risultato e' passato dalla cache, None se no);
+    `encodings` = [(preset, secondi, byte)] dei file codificati.
+    Picklabile: torna dai worker a processi dentro il RenderOutput."""
+
+    def __init__(self, size=None):
+        self.size = tuple(size) if size is not None else None
+        self.seconds = {}
+        self.peak_bytes = None
+        self.cached = None
+        self.encodings = []
+
+    @contextmanager
+    def stage(self, name):
+        """Somma al tempo della fase `name` la durata del blocco."""
+        t0 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+
+    @contextmanager
+    def trace_memory(self):
+        """Registra in peak_bytes il picco di memoria tracciata durante il
+        blocco, oltre a quella gia' in uso all'ingresso."""
+        global _TRACE_USERS, _TRACE_OWNED
+        if not TRACE_MEMORY:
+            yield self
+            return
+        with _TRACE_LOCK:
+            if _TRACE_USERS == 0:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _TRACE_OWNED = True
+                tracemalloc.reset_peak()
+            _TRACE_USERS += 1
+            start = tracemalloc.get_traced_memory()[0]
+        try:
+            yield self
+        finally:
+            with _TRACE_LOCK:
+                peak = tracemalloc.get_traced_memory()[1]
+                self.peak_bytes = max(self.peak_bytes or 0, peak - start)
+                _TRACE_USERS -= 1
+                if _TRACE_USERS == 0 and _TRACE_OWNED:
+                    tracemalloc.stop()
+                    _TRACE_OWNED = False
+
+    def add_encoding(self, preset, seconds, nbytes):
+        """Registra una codifica (glitchlab.encoding.encode): il tempo va
+        nella fase "encode"."""
+        self.seconds["encode"] = self.seconds.get("encode", 0.0) + seconds
+        self.encodings.append((preset, seconds, nbytes))
+
+    def total(self):
+        return sum(self.seconds.values())
+
+    def timings(self):
+        """"calcolo/compute 1.23s · codifica/encode 0.40s · totale/total 1.63s"."""
+        parts = [f"{STAGES.get(name, name)} {self.seconds[name]:.2f}s"
+                 for name in sorted(self.seconds, key=lambda n: list(STAGES).index(n)
+                                    if n in STAGES else len(STAGES))]
+        parts.append(f"totale/total {self.total():.2f}s")
+        return " · ".join(parts)
+
+    def lines(self, full_size=None):
+        """Righe "etichetta: valore" per il report e per il pannello della UI.
+        `full_size` = dimensioni della foto: se il render e' su un proxy
+        ridotto lo si segnala."""
+        lines = []
+        if self.size is not None:
+            w, h = self.size
+            scope = ""
+            if full_size is not None:
+                scope = ("  (piena risoluzione / full resolution)" if tuple(full_size) == self.size
+                         else "  (anteprima ridotta / proxy)")
+            lines.append(f"Render: {w} x {h} px{scope}")
+        if self.cached is not None:
+            lines.append("Cache: " + ("si' / hit (risultato gia' calcolato)" if self.cached
+                                      else "no / miss"))
+        lines.append(f"Tempi / Timings: {self.timings()}")
+        for preset, seconds, nbytes in self.encodings:
+            lines.append(f"Codifica / Encoding: {preset} {seconds:.2f}s, {nbytes / 2**20:.2f} MB")
+        if self.peak_bytes is not None:
+            lines.append(f"Picco memoria / Peak memory: {self.peak_bytes / 2**20:.1f} MB (tracemalloc)")
+        return lines
@@ -0,0 +1,241 @@
+"""Rendering a tasselli di foto enormi (scansioni da centinaia di megapixel).
+
+Un render normale tiene in RAM la foto intera piu' qualche copia float32:
+a 300 MP sono decine di GB. Qui sorgente e risultato stanno su disco come
+array .npy mappati in memoria (np.memmap) e l'effetto gira un tassello alla
+volta, quindi la memoria dipende dalla dimensione del tassello, non della
+foto:
+
+    src = open_source("scan.tif", workdir)          # (h, w, 3) uint8 su disco
+    out = np.lib.format.open_memmap("out.npy", "w+", np.uint8, src.shape)
+    render_tiled("duotone", src, out, [0.1, 0.6, 0.8])
+    write_png_rows("out.png", out)                  # glitchlab.encoding
+
+Tre strategie, secondo l'effetto:
+
+- per pixel (POINTWISE): ogni tassello e' un render indipendente. Gli
+  spostamenti dei canali di solarize, posterize e channel_swap (np.roll su
+  tutta la foto) diventano letture "circolari" della sorgente: il canale
+  spostato si calcola sulla regione da cui proviene, con lo spostamento a 0.
+  Il rumore di thermal e posterize usa un seed per tassello (spawn_seeds):
+  stesso aspetto, non gli stessi pixel del render intero;
+- finestra locale (HALO, neon_glow): ogni tassello si legge con un bordo
+  largo quanto il raggio del blur; il massimo dei bordi, globale, si
+  calcola in un primo passaggio (bordi salvati su disco in float32);
+- copia di lavoro (WORK_COPY, oil_paint e lichtenstein_comic): questi
+  effetti lavorano comunque su una copia ridotta della foto (lato lungo
+  1200/1400 px). La riduzione LANCZOS e il ritorno a piena risoluzione si
+  fanno a strisce, una passata del resize alla volta; il resto e' il render
+  normale sulla copia ridotta. Gli intermedi delle passate sono grandi
+  (lato lungo della foto) x (lato della copia di lavoro).
+
+Il risultato coincide bit per bit con il render intero, a parte il rumore
+per tassello di thermal e posterize.
+"""
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from .analysis import analysis_for
+from .imaging import _row_chunks, _work_size
+from .registry import apply_effect, get_effect
+from .seeding import spawn_seeds
+
+# lato del tassello: 2048 x 2048 = 4 MP, picchi di qualche decina di MB
+TILE = 2048
+
+POINTWISE = ("duotone", "thermal", "solarize", "posterize", "psychedelic", "channel_swap")
+HALO = ("neon_glow",)
+# effetto -> lato lungo della sua copia di lavoro (vedi analysis.work)
+WORK_COPY = {"oil_paint": 1200, "lichtenstein_comic": 1400}
+TILED_EFFECTS = POINTWISE + HALO + tuple(WORK_COPY)
+
+# effetti col rumore per pixel: un seed per tassello, altrimenti ogni
+# tassello ripeterebbe lo stesso rumore
+_NOISE_PER_TILE = ("thermal", "posterize")
+# effetto -> (parametro dello spostamento dei canali, modulo con _channel_offsets)
+_CHANNEL_SHIFT = {
+    "solarize": ("channel_split", "solarize"),
+    "posterize": ("color_shift", "posterize"),
+    "channel_swap": ("shift_px", "channel_swap"),
+}
+# righe sorgente per striscia nelle riduzioni/ingrandimenti: ~64 MB
+_STRIP_BYTES = 64 << 20
+
+
+def tiles(h, w, tile=TILE):
+    """Tasselli (y0, y1, x0, x1) che coprono un'immagine h x w, per righe."""
+    for y0 in range(0, h, tile):
+        for x0 in range(0, w, tile):
+            yield y0, min(h, y0 + tile), x0, min(w, x0 + tile)
+
+
+def open_source(path, workdir):
+    """Sorgente come array (h, w, 3) uint8 su disco. Un .npy viene solo
+    mappato (mmap_mode="r"); gli altri formati vengono decodificati una volta
+    da PIL (come load_image, senza il limite di MAX_IMAGE_PIXELS) e copiati a
+    strisce in workdir/source.npy: la decodifica tiene comunque la foto
+    intera in RAM per un momento, il .npy evita anche quella."""
+    if path.lower().endswith(".npy"):
+        arr = np.load(path, mmap_mode="r")
+        if arr.dtype != np.uint8 or arr.ndim != 3 or arr.shape[2] != 3:
+            raise ValueError(f"{path}: serve un array (h, w, 3) uint8, trovato {arr.shape} {arr.dtype}")
+        return arr
+    from .batch import load_image
+
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        img = load_image(path)
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+    w, h = img.size
+    arr = np.lib.format.open_memmap(os.path.join(workdir, "source.npy"), "w+", np.uint8, (h, w, 3))
+    for y0, y1 in _row_chunks(h, w, _STRIP_BYTES // 3):
+        arr[y0:y1] = np.asarray(img.crop((0, y0, w, y1)))
+    arr.flush()
+    return arr
+
+
+def _rolled(src, y0, y1, x0, x1, dy, dx):
+    """np.roll(src, (dy, dx), axis=(0, 1))[y0:y1, x0:x1] senza spostare la
+    foto intera: legge solo i pixel della regione (indici modulo h e w)."""
+    h, w = src.shape[:2]
+    if not dy and not dx:
+        return np.ascontiguousarray(src[y0:y1, x0:x1])
+    rows = np.arange(y0 - dy, y1 - dy) % h
+    cols = np.arange(x0 - dx, x1 - dx) % w
+    return src[np.ix_(rows, cols)]
+
+
+def _shift_param(key, vals):
+    """(indice dello slider di spostamento, offset (dy, dx) per canale) per
+    gli effetti di _CHANNEL_SHIFT, None per gli altri o a spostamento nullo."""
+    import importlib
+    import inspect
+
+    if key not in _CHANNEL_SHIFT:
+        return None
+    name, module = _CHANNEL_SHIFT[key]
+    idx = list(inspect.signature(get_effect(key).fn).parameters).index(name) - 1   # -1: img
+    mod = importlib.import_module(f"glitchlab.effects.{module}")
+    offsets = mod._channel_offsets(vals[idx])
+    if not any(dy or dx for dy, dx in offsets):
+        return None
+    return idx, offsets
+
+
+def _render_pointwise(key, src, out, vals, seed, tile):
+    h, w = src.shape[:2]
+    boxes = list(tiles(h, w, tile))
+    seeds = spawn_seeds(seed, len(boxes)) if key in _NOISE_PER_TILE else [seed] * len(boxes)
+    shift = _shift_param(key, vals)
+    if shift is not None:
+        idx, offsets = shift
+        vals = list(vals)
+        vals[idx] = 0.0
+    for (y0, y1, x0, x1), tile_seed in zip(boxes, seeds):
+        if shift is None:
+            region = np.ascontiguousarray(src[y0:y1, x0:x1])
+            out[y0:y1, x0:x1] = np.asarray(apply_effect(key, region, *vals, seed=tile_seed))
+            continue
+        # un render per spostamento distinto, se ne tengono i canali che lo usano
+        for off in dict.fromkeys(offsets):
+            res = np.asarray(apply_effect(key, _rolled(src, y0, y1, x0, x1, *off), *vals,
+                                          seed=tile_seed))
+            for ch, ch_off in enumerate(offsets):
+                if ch_off == off:
+                    out[y0:y1, x0:x1, ch] = res[..., ch]
+
+
+def _render_neon_glow(src, out, vals, tile, workdir):
+    from .effects.neon_glow import _glow_radius, _neon_compose, _neon_edges
+
+    soglia, ampiezza, colore = vals
+    h, w = src.shape[:2]
+    gw = _glow_radius(ampiezza)
+    # copre il supporto del GaussianBlur di PIL (tre box blur di raggio ~gw)
+    halo = 3 * gw + 4
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        edges = np.lib.format.open_memmap(os.path.join(tmp, "edges.npy"), "w+", np.float32, (h, w))
+        edges_max = np.float32(0)
+        for y0, y1, x0, x1 in tiles(h, w, tile):
+            ty0, ty1, tx0, tx1 = max(0, y0 - halo), min(h, y1 + halo), max(0, x0 - halo), min(w, x1 + halo)
+            region = Image.fromarray(np.ascontiguousarray(src[ty0:ty1, tx0:tx1]))
+            core = _neon_edges(analysis_for(region), 1.0, gw)[y0 - ty0:y1 - ty0, x0 - tx0:x1 - tx0]
+            edges[y0:y1, x0:x1] = core
+            edges_max = max(edges_max, core.max())
+        for y0, y1, x0, x1 in tiles(h, w, tile):
+            out[y0:y1, x0:x1] = _neon_compose(np.asarray(src[y0:y1, x0:x1]),
+                                              np.array(edges[y0:y1, x0:x1]), edges_max, soglia, colore)
+        del edges
+
+
+def _downscale_streamed(src, size):
+    """Image.fromarray(src).resize(size, LANCZOS) di un array (h, w, 3) su
+    disco, senza caricarlo. PIL ridimensiona in due passate separate, prima
+    le righe (su uint8) poi le colonne: la passata orizzontale si fa a
+    strisce di righe (ogni riga e' indipendente) in un intermedio (h, sw),
+    quella verticale sull'intermedio intero. Stessi coefficienti e stessi
+    arrotondamenti del resize in un colpo solo, quindi stessi bit."""
+    h, w = src.shape[:2]
+    sw, sh = size
+    inter = np.empty((h, sw, 3), dtype=np.uint8)
+    for y0, y1 in _row_chunks(h, w, _STRIP_BYTES // 3):
+        inter[y0:y1] = np.asarray(Image.fromarray(np.ascontiguousarray(src[y0:y1]))
+                                  .resize((sw, y1 - y0), Image.LANCZOS))
+    return Image.fromarray(inter).resize((sw, sh), Image.LANCZOS)
+
+
+def _upscale_streamed(small, out):
+    """Scrive in `out` (h, w, 3) small.resize((w, h), LANCZOS) a pezzi: la
+    passata orizzontale sull'immagine piccola intera (intermedio (sh, w)),
+    quella verticale a strisce di colonne (ogni colonna e' indipendente).
+    Stessi bit del resize in un colpo solo, come _downscale_streamed."""
+    h, w = out.shape[:2]
+    sh = small.size[1]
+    inter = np.asarray(small.resize((w, sh), Image.LANCZOS))
+    step = max(1, _STRIP_BYTES // (3 * max(h, sh)))
+    for x0 in range(0, w, step):
+        x1 = min(w, x0 + step)
+        cols = Image.fromarray(np.ascontiguousarray(inter[:, x0:x1]))
+        out[:, x0:x1] = np.asarray(cols.resize((x1 - x0, h), Image.LANCZOS))
+
+
+def _render_work_copy(key, src, out, vals, seed):
+    h, w = src.shape[:2]
+    size = _work_size((w, h), WORK_COPY[key])
+    if size == (w, h):
+        out[:] = np.asarray(apply_effect(key, np.asarray(src), *vals, seed=seed))
+        return
+    # full_size: l'effetto sa che la foto vera e' w x h, ma con la copia di
+    # lavoro gia' alla sua dimensione non riduce altro (px_scale = 1) e
+    # ritorna il risultato a dimensione ridotta
+    small = apply_effect(key, _downscale_streamed(src, size), *vals, seed=seed, full_size=(w, h))
+    _upscale_streamed(small.convert("RGB"), out)
+
+
+def render_tiled(key, src, out, vals=None, seed=None, tile=TILE, workdir=None):
+    """Applica l'effetto `key` (uno di TILED_EFFECTS) alla sorgente `src`
+    (h, w, 3) uint8, tipicamente un memmap, scrivendo in `out` della stessa
+    forma (es. np.lib.format.open_memmap). `vals` = valori slider (default
+    quelli dell'effetto), `seed` come in apply_effect, `workdir` = dove
+    mettere i file temporanei (default la cartella temporanea di sistema).
+    Gli errori dell'effetto arrivano come EffectError."""
+    if key not in TILED_EFFECTS:
+        raise ValueError(f"{key!r} non supporta il rendering a tasselli "
+                         f"(supportati: {', '.join(TILED_EFFECTS)})")
+    if vals is None:
+        vals = [s[3] for s in get_effect(key).sliders]
+    if out.shape != src.shape:
+        raise ValueError(f"forma di out {out.shape} diversa dalla sorgente {src.shape}")
+    if key in WORK_COPY:
+        _render_work_copy(key, src, out, vals, seed)
+    elif key in HALO:
+        _render_neon_glow(src, out, vals, tile, workdir)
+    else:
+        _render_pointwise(key, src, out, vals, seed, tile)
+    if isinstance(out, np.memmap):
+        out.flush()